@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import UserInfo, GaitResult, BodyResult, SessionInfo, SchoolInfo, UserHist
+from .custom.image_jobs import requeue_image_jobs
+from .models import UserInfo, GaitResult, BodyResult, SessionInfo, SchoolInfo, UserHist, ImageUploadJob, \
+    S3ObjectDeletion, BodyResultRollup, ReportExportJob, MemberImportJob
 
 
 @admin.register(BodyResult)
@@ -44,5 +46,20 @@ class UserInfoAdmin(admin.ModelAdmin):
     update_display_name.short_description = "Update display names for all users"
 
 
+@admin.register(ImageUploadJob)
+class ImageUploadJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'body_result_id', 'pose_type', 'status', 'attempts', 'next_attempt_dt', 'error_message')
+    list_filter = ('status',)
+    actions = ['requeue_jobs']
+
+    def requeue_jobs(self, request, queryset):
+        # 스풀 파일이 남아 있는 failed 작업만 다시 등록 (이미지 형식 오류로 실패한 작업은 제외)
+        requeued = requeue_image_jobs(queryset)
+        self.message_user(request, f"{requeued}개 작업을 다시 등록했습니다.")
+
+    requeue_jobs.short_description = "Requeue failed image upload jobs"
+
+
 # Register your models here.
-admin.site.register([GaitResult, SessionInfo, SchoolInfo, UserHist])
+admin.site.register([GaitResult, SessionInfo, SchoolInfo, UserHist, S3ObjectDeletion, BodyResultRollup,
+                     ReportExportJob, MemberImportJob])
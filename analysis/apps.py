@@ -1,16 +1,18 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 class AnalysisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'analysis'
 
     def ready(self):
+        from . import signals  # noqa: F401 (시그널 receiver 등록)
 
         # 세션 소멸 - 스케줄러 실행
         from analysis.custom.tasks import scheduler
-        # 스케줄러가 이미 실행 중인지 확인 후 실행
+        # 스케줄러가 이미 실행 중인지 확인 후 실행 (작업 큐 워커 프로세스는 SCHEDULER_DEFAULT=false 로 실행하지 않음)
         # print("스케줄러 실행")
-        if not scheduler.running:
+        if settings.SCHEDULER_DEFAULT and not scheduler.running:
             scheduler.start()
 
         # DAU, WAU, MAU 계산 - 스케줄러 실행 (서버 실행 시 1회 실행) 추 후 mobile create_body_result API 호출 시마다 실행됨
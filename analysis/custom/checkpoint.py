@@ -0,0 +1,19 @@
+import os
+from pathlib import Path
+
+"""
+chunk 단위 재계산 명령(rescore_gait, backfill_normal_summary)의 진행 위치(마지막 처리 id) 파일
+"""
+
+
+def read_checkpoint(path):
+    try:
+        return int(Path(path).read_text().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def write_checkpoint(path, last_id):
+    tmp_path = f'{path}.tmp'
+    Path(tmp_path).write_text(str(last_id))
+    os.replace(tmp_path, path)  # 중단되어도 이전 checkpoint 가 깨지지 않도록 rename 으로 교체
@@ -0,0 +1,89 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from analysis.models import CodeInfo
+
+"""
+CodeInfo 프로세스 내 레지스트리
+- 전체 CodeInfo 를 1회 쿼리로 읽어 code_id / group_id 별로 보관 (점수 계산, 정상범위 판정, 코드 정보 조회 API 에서 사용)
+- CodeInfo 저장/삭제 시그널(analysis.signals)에서 invalidate() 호출
+  -> 현재 프로세스는 즉시 비우고, 캐시의 버전 key 를 커밋 후 갱신하여 다른 프로세스도 다음 조회 시 다시 읽음
+- 버전 key 가 프로세스 간 공유되지 않는 캐시(LocMem 등)인 경우를 위해 CODE_INFO_REGISTRY_MAX_AGE 초가 지나면 다시 읽음
+- queryset.update() 등 시그널이 발생하지 않는 변경 후에는 invalidate() 를 직접 호출
+- 반환되는 CodeInfo 객체는 여러 요청이 공유하므로 수정하지 않음
+"""
+
+CODE_INFO_VERSION_CACHE_KEY = 'code_info_version'
+
+
+class CodeInfoRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None  # (version, loaded_at, by_code_id, by_group_id)
+
+    @staticmethod
+    def _current_version():
+        version = cache.get(CODE_INFO_VERSION_CACHE_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(CODE_INFO_VERSION_CACHE_KEY, version, timeout=None):  # 다른 프로세스가 먼저 기록한 경우
+                version = cache.get(CODE_INFO_VERSION_CACHE_KEY, version)
+        return version
+
+    def _get_snapshot(self):
+        version = self._current_version()
+        snapshot = self._snapshot
+        if (snapshot is not None and snapshot[0] == version
+                and time.monotonic() - snapshot[1] < settings.CODE_INFO_REGISTRY_MAX_AGE):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot[0] != version or \
+                    time.monotonic() - snapshot[1] >= settings.CODE_INFO_REGISTRY_MAX_AGE:
+                snapshot = self._snapshot = self._load(version)
+        return snapshot
+
+    @staticmethod
+    def _load(version):
+        by_code_id = {}
+        by_group_id = {}
+        for code_info in CodeInfo.objects.order_by('id'):
+            by_code_id.setdefault(code_info.code_id, code_info)
+            by_group_id.setdefault(code_info.group_id, []).append(code_info)
+        return version, time.monotonic(), by_code_id, by_group_id
+
+    def get(self, code_id):
+        """code_id 에 해당하는 CodeInfo (없으면 None)"""
+        return self._get_snapshot()[2].get(code_id)
+
+    def get_group(self, group_id, order_by_seq_no=False):
+        """group_id 에 해당하는 CodeInfo 목록 (기본 id 순, order_by_seq_no=True 이면 seq_no 순 / NULL 은 마지막)"""
+        code_infos = list(self._get_snapshot()[3].get(group_id, []))
+        if order_by_seq_no:
+            code_infos.sort(key=lambda code_info: (code_info.seq_no is None, code_info.seq_no or 0))
+        return code_infos
+
+    def get_groups(self, group_ids):
+        """여러 group_id 의 CodeInfo 목록 (id 순)"""
+        by_group_id = self._get_snapshot()[3]
+        return sorted((code_info for group_id in set(group_ids) for code_info in by_group_id.get(group_id, [])),
+                      key=lambda code_info: code_info.id)
+
+    def reset(self):
+        """이 프로세스의 스냅샷만 삭제 (다음 조회 시 다시 읽음, 다른 프로세스에는 알리지 않음)"""
+        with self._lock:
+            self._snapshot = None
+
+    def invalidate(self):
+        self._snapshot = None
+        # 커밋 전에 다른 프로세스가 이전 값을 다시 읽지 않도록 버전은 커밋 후 갱신
+        transaction.on_commit(lambda: cache.set(CODE_INFO_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None))
+
+
+code_info_registry = CodeInfoRegistry()
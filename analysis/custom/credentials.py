@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.crypto import constant_time_compare
+
+"""
+비밀번호 해시 서비스
+- PBKDF2 해시/검증은 CPU 를 오래 쓰고 GIL 을 잡으므로 PASSWORD_HASH_WORKERS 를 설정하면 프로세스 풀에서 실행
+  (기본값 0: 호출한 스레드에서 계산, 풀 프로세스가 비정상 종료되면 풀을 새로 만들고 이번 요청은 직접 계산)
+- 초기 비밀번호(DEFAULT_PASSWORD) 해시
+  - 일괄 등록(엑셀 업로드 / 작업 큐): new_default_password_hash() 로 업로드(작업)마다 salt 1개를 만들어 모든 행에 재사용
+  - 계정 1개 생성(모바일 로그인 자동 가입): default_password_hash() 로 계산한 해시를 DEFAULT_PASSWORD_HASH_TTL 동안만 재사용
+    (같은 salt 를 공유하는 계정 범위를 짧은 시간 안에 가입한 계정으로 제한)
+- 초기 비밀번호 여부는 로그인 비밀번호 검증이 성공한 뒤 입력값과 DEFAULT_PASSWORD 를 비교 (해시 재계산 없음)
+- 풀은 spawn 으로 생성 (스레드가 있는 프로세스를 fork 하지 않음), fork 된 자식 프로세스는 부모의 풀을 쓰지 않도록 초기화
+  풀 프로세스는 settings(PASSWORD_HASHERS)만 사용하므로 django.setup() 을 하지 않음 (스케줄러가 실행되지 않도록)
+"""
+
+
+class PasswordHashService:
+    def __init__(self):
+        self._reset_state()
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._default_hash = None  # (해시, 만료 시각(monotonic))
+
+    def reset(self):
+        """풀 종료 / 공용 초기 비밀번호 해시 삭제 (설정 또는 DEFAULT_PASSWORD 변경 시)"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._default_hash = None
+        if executor is not None:
+            executor.shutdown()
+
+    def _after_fork_in_child(self):
+        self._reset_state()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=settings.PASSWORD_HASH_WORKERS,
+                        mp_context=multiprocessing.get_context('spawn'),
+                    )
+        return self._executor
+
+    def _run(self, fn, *args):
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            return fn(*args)
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            return fn(*args)
+
+    def hash_password(self, raw_password):
+        return self._run(hashers.make_password, raw_password)
+
+    def verify_password(self, raw_password, encoded):
+        # 해시 업그레이드(setter)는 사용하지 않으므로 검증 결과만 반환
+        return self._run(hashers.check_password, raw_password, encoded)
+
+    def new_default_password_hash(self):
+        """일괄 등록 1회(업로드 / 작업)에 사용할 초기 비밀번호 해시 (새 salt)"""
+        return self.hash_password(os.environ['DEFAULT_PASSWORD'])
+
+    def default_password_hash(self):
+        """공용 초기 비밀번호 해시 (DEFAULT_PASSWORD_HASH_TTL 이 지나면 새 salt 로 다시 계산)"""
+        cached = self._default_hash
+        if cached is None or time.monotonic() >= cached[1]:
+            default_hash = self.new_default_password_hash()
+            with self._lock:
+                cached = self._default_hash
+                if cached is None or time.monotonic() >= cached[1]:
+                    cached = self._default_hash = (
+                        default_hash, time.monotonic() + settings.DEFAULT_PASSWORD_HASH_TTL
+                    )
+        return cached[0]
+
+    @staticmethod
+    def is_default_password(raw_password):
+        """verify_password 로 검증된 입력값이 초기 비밀번호인지 확인"""
+        return constant_time_compare(raw_password, os.environ['DEFAULT_PASSWORD'])
+
+
+password_hasher = PasswordHashService()
+
+os.register_at_fork(after_in_child=password_hasher._after_fork_in_child)
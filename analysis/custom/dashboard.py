@@ -0,0 +1,120 @@
+from datetime import datetime as dt
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from analysis.models import BODY_RESULT_COMPLETED, BodyResult, BodyResultRollup, UserInfo
+
+"""
+메인 화면(대시보드) 기관별 집계
+- 기관(학교/기관) 단위로 회원 집계 1회(학년/반 또는 부서별 GROUP BY) + 기관 통계(BodyResultRollup) 합산 1회로 계산
+- 결과는 DASHBOARD_CACHE_TTL 초 동안 캐시, BodyResult / UserInfo 저장/삭제 시그널에서 해당 기관 캐시 삭제
+  (프로세스 로컬 캐시인 경우 다른 프로세스에는 TTL 이후 반영, 시그널이 없는 queryset.update() 변경도 TTL 이후 반영)
+"""
+
+
+def _cache_key(user_type, institution_id):
+    return f'dashboard:{user_type}:{institution_id}'
+
+
+def _year_start(now):
+    return now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rollup_stats(rollups, now):
+    """완료된(이미지가 있는) 검사 결과의 총 건수 / 이번 달 건수 / 주의 대상(정상범위 7/11 이하) 건수"""
+    # 검사 결과 전체가 아닌 기관 통계 row(연/월/학년-반 또는 부서 단위)만 합산
+    return rollups.aggregate(
+        total_results=Coalesce(Sum('result_count'), 0),
+        current_month_results=Coalesce(Sum('result_count', filter=Q(year=now.year, month=now.month)), 0),
+        low_normal_results=Coalesce(Sum('low_normal_count'), 0),
+    )
+
+
+def _completed_user_ids(body_results):
+    """완료된(이미지가 있는) 검사 결과가 있는 회원 id 서브쿼리 (NOT IN 은 해시 서브플랜으로 1회만 실행)"""
+    return body_results.filter(BODY_RESULT_COMPLETED).values('user_id')
+
+
+def compute_school_stats(school_id, now):
+    # 학년/반별 회원 수 (전체 / 당해 연도 / 당해 연도 미검사)
+    body_results = BodyResult.objects.filter(user__school_id=school_id)
+    completed_this_year = _completed_user_ids(body_results.filter(created_dt__gte=_year_start(now)))
+    groups = UserInfo.objects.filter(school_id=school_id).values('student_grade', 'student_class').annotate(
+        member_count=Count('id'),
+        student_count=Count('id', filter=Q(year=now.year)),
+        pending_count=Count('id', filter=Q(year=now.year) & ~Q(id__in=completed_this_year)),
+    ).order_by('student_grade', 'student_class')
+
+    group_structure = {}
+    members = pending_tests = 0
+    for group in groups:
+        members += group['member_count']
+        pending_tests += group['pending_count']
+        if group['student_grade'] and group['student_class'] and group['student_count']:  # None 값 제외
+            grade = str(group['student_grade'])
+            group_structure.setdefault(grade, {})[str(group['student_class'])] = group['student_count']
+
+    return {
+        'total_members': members,
+        'pending_tests': pending_tests,
+        'group_structure': group_structure,
+        **_rollup_stats(BodyResultRollup.objects.filter(school_id=school_id), now),
+    }
+
+
+def compute_organization_stats(organization_id, now):
+    # 부서별 회원 수 (전체 / 검사 결과가 없는 회원)
+    body_results = BodyResult.objects.filter(user__organization_id=organization_id)
+    groups = UserInfo.objects.filter(organization_id=organization_id).values('department').annotate(
+        member_count=Count('id'),
+        pending_count=Count('id', filter=~Q(id__in=_completed_user_ids(body_results))),
+    ).order_by('department')
+
+    group_structure = {}
+    members = pending_tests = 0
+    for group in groups:
+        members += group['member_count']
+        pending_tests += group['pending_count']
+        if group['department'] is not None:  # 부서에 속해있지 않은 회원 제외
+            group_structure[group['department']] = group['member_count']
+
+    return {
+        'total_members': members,
+        'pending_tests': pending_tests,
+        'group_structure': group_structure,
+        **_rollup_stats(BodyResultRollup.objects.filter(organization_id=organization_id), now),
+    }
+
+
+def get_dashboard_stats(user):
+    """관리자(user)의 기관 대시보드 집계 (캐시 우선)"""
+    if user.user_type == 'S':
+        key = _cache_key('S', user.school_id)
+        compute = lambda now: compute_school_stats(user.school_id, now)
+    else:
+        key = _cache_key('O', user.organization_id)
+        compute = lambda now: compute_organization_stats(user.organization_id, now)
+
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute(dt.now())
+        cache.set(key, stats, timeout=settings.DASHBOARD_CACHE_TTL)
+    return stats
+
+
+def invalidate_dashboard_stats(school_id=None, organization_id=None):
+    keys = []
+    if school_id is not None:
+        keys.append(_cache_key('S', school_id))
+    if organization_id is not None:
+        keys.append(_cache_key('O', organization_id))
+    if not keys:
+        return
+
+    cache.delete_many(keys)
+    # 커밋 전에 다른 요청이 이전 데이터로 다시 캐시한 경우를 위해 커밋 후 한 번 더 삭제
+    transaction.on_commit(lambda: cache.delete_many(keys))
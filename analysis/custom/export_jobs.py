@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import time
+from datetime import timedelta
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from analysis.custom.job_worker import run_job_worker
+from analysis.custom.report_export import build_report_file, get_code_columns, get_report_rosters, \
+    iter_report_members
+from analysis.custom.s3_deletion import enqueue_s3_deletions
+from analysis.custom.s3_io import s3_io
+from analysis.helpers import get_s3_client
+from analysis.models import ReportExportJob
+
+"""
+결과 조회 엑셀 다운로드 백그라운드 작업 큐
+- report_download 요청의 행 수가 REPORT_EXPORT_SYNC_MAX_ROWS 를 넘으면 ReportExportJob 만 등록하고 진행 화면으로 이동
+- 같은 기관/연도/그룹/데이터 버전 작업이 이미 있으면(대기/진행/완료) 그 작업을 그대로 사용 (반복 클릭 시 파일 1개)
+  완료된 작업은 남은 보관 시간이 presigned URL 유효 시간(AWS_PRESIGNED_EXPIRATION)보다 길 때만 재사용
+- run_export_worker 워커가 작업을 가져가(select_for_update skip_locked) 엑셀 생성 -> S3(exports/<id>/<dedupe_key>.xlsx) 업로드
+  생성 중에는 processed_rows 로 진행률 기록, 실패 시 REPORT_EXPORT_MAX_ATTEMPTS 까지 재시도
+- 보관 시간(REPORT_EXPORT_RETENTION_HOURS)이 지난 파일은 스케줄러에서 S3 삭제 대기열에 넣고 expired 로 변경
+"""
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def export_dedupe_key(user, selected_year, selected_group, data_version):
+    institution = f'S:{user.school_id}' if user.user_type == 'S' else f'O:{user.organization_id}'
+    return hashlib.sha256(f'{institution}|{selected_year}|{selected_group}|{data_version}'.encode()).hexdigest()
+
+
+def enqueue_report_export(user, selected_year, selected_group, file_name, total_rows, data_version):
+    """같은 내용의 작업(대기/진행/완료)이 있으면 그 작업을, 없으면 새로 등록한 작업을 반환"""
+    dedupe_key = export_dedupe_key(user, selected_year, selected_group, data_version)
+    queued_jobs = ReportExportJob.objects.filter(dedupe_key=dedupe_key, status__in=ReportExportJob.QUEUED_STATUSES)
+    # 다운로드 URL 을 받은 뒤 파일이 만료(삭제)되지 않도록 남은 보관 시간이 URL 유효 시간보다 긴 완료 작업만 재사용
+    reusable_after = (timezone.now() - timedelta(hours=settings.REPORT_EXPORT_RETENTION_HOURS)
+                      + timedelta(seconds=settings.AWS_PRESIGNED_EXPIRATION))
+    job = (queued_jobs.first()
+           or ReportExportJob.objects.filter(dedupe_key=dedupe_key, status='done', updated_dt__gt=reusable_after)
+           .order_by('-id').first())
+    if job is not None:
+        return job
+
+    try:
+        with transaction.atomic():
+            return ReportExportJob.objects.create(
+                requested_by=user,
+                school_id=user.school_id if user.user_type == 'S' else None,
+                organization_id=user.organization_id if user.user_type == 'O' else None,
+                selected_year=selected_year,
+                selected_group=selected_group,
+                data_version=data_version,
+                dedupe_key=dedupe_key,
+                file_name=file_name,
+                total_rows=total_rows,
+            )
+    except IntegrityError:  # 동시에 같은 작업을 등록한 경우 (unique_queued_report_export)
+        return queued_jobs.get()
+
+
+def claim_export_jobs(limit=1):
+    """대기 중인 작업(또는 lock 시간이 초과된 작업)을 최대 limit 개 가져와 processing 으로 변경"""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.REPORT_EXPORT_LOCK_TIMEOUT)
+
+    with transaction.atomic():
+        jobs = list(
+            ReportExportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status='pending') | Q(status='processing', locked_dt__lt=stale_before))
+            .order_by('id')[:limit]
+        )
+        if not jobs:
+            return []
+
+        ReportExportJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status='processing', locked_dt=now, processed_rows=0, attempts=F('attempts') + 1
+        )
+
+    for job in jobs:
+        job.status = 'processing'
+        job.locked_dt = now
+        job.processed_rows = 0
+        job.attempts += 1
+    return jobs
+
+
+def _progress_recorder(job):
+    """진행률 저장 (REPORT_EXPORT_PROGRESS_INTERVAL 초에 한 번, lock 시간도 함께 갱신)"""
+    last_saved = time.monotonic()
+
+    def record(processed_rows):
+        nonlocal last_saved
+        if time.monotonic() - last_saved < settings.REPORT_EXPORT_PROGRESS_INTERVAL:
+            return
+        last_saved = time.monotonic()
+        ReportExportJob.objects.filter(id=job.id, status='processing').update(
+            processed_rows=processed_rows, locked_dt=timezone.now()
+        )
+
+    return record
+
+
+def process_export_job(job):
+    """작업 1건 처리: 회원 목록 조회 -> 엑셀 생성 -> S3 업로드 -> key 저장"""
+    try:
+        if job.requested_by_id is None:
+            raise ValueError('요청한 관리자 계정이 삭제됨')
+        member_columns, fields, rosters = get_report_rosters(job.requested_by, job.selected_year,
+                                                             job.selected_group)
+        file_key = f'exports/{job.id}/{job.dedupe_key[:16]}.xlsx'
+        with build_report_file(member_columns, iter_report_members(rosters, fields),
+                               code_columns=get_code_columns(), progress=_progress_recorder(job)) as report_file:
+            s3_io.upload_fileobj(report_file, file_key, XLSX_CONTENT_TYPE)
+    except Exception as e:
+        retry = not isinstance(e, ValueError) and job.attempts < settings.REPORT_EXPORT_MAX_ATTEMPTS
+        logger.warning(f"Report export job {job.id} error (attempt {job.attempts}, retry={retry}): {e}")
+        job.status = 'pending' if retry else 'failed'
+        job.error_message = str(e)[:500]
+        job.locked_dt = None
+        job.save(update_fields=['status', 'error_message', 'locked_dt', 'updated_dt'])
+        return False
+
+    job.status = 'done'
+    job.file_key = file_key
+    job.processed_rows = job.total_rows
+    job.error_message = None
+    job.save(update_fields=['status', 'file_key', 'processed_rows', 'error_message', 'updated_dt'])
+    return True
+
+
+def get_export_download_url(job):
+    """완료된 작업의 presigned URL (다운로드 파일명은 Content-Disposition 으로 지정)"""
+    return get_s3_client().generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
+            'Key': job.file_key,
+            'ResponseContentDisposition': f"attachment; filename*=UTF-8''{quote(job.file_name)}",
+        },
+        ExpiresIn=settings.AWS_PRESIGNED_EXPIRATION
+    )
+
+
+def run_export_worker(batch_size=1, poll_interval=1.0, once=False):
+    """작업 큐 처리 루프 (once=True 이면 대기 중인 작업을 모두 처리한 뒤 종료)"""
+    return run_job_worker(claim_export_jobs, process_export_job, batch_size=batch_size, poll_interval=poll_interval,
+                          once=once)
+
+
+def expire_export_jobs(now=None):
+    """보관 시간이 지난 완료 파일을 S3 삭제 대기열에 넣고 expired 로 변경 후 처리 건수 반환"""
+    now = now or timezone.now()
+    expire_before = now - timedelta(hours=settings.REPORT_EXPORT_RETENTION_HOURS)
+    with transaction.atomic():
+        jobs = list(
+            ReportExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status='done', updated_dt__lt=expire_before)
+            .only('id', 'file_key')
+        )
+        if not jobs:
+            return 0
+        enqueue_s3_deletions([job.file_key for job in jobs if job.file_key])
+        ReportExportJob.objects.filter(id__in=[job.id for job in jobs]).update(status='expired')
+    return len(jobs)
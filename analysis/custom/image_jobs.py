@@ -0,0 +1,205 @@
+import logging
+import os
+import shutil
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from analysis.helpers import create_image_variants, generate_body_image_key, get_image_all_keys, is_file_like, \
+    upload_image_to_s3, verify_image
+from analysis.custom.job_worker import run_job_worker
+from analysis.custom.rollup import add_body_result
+from analysis.custom.s3_deletion import enqueue_s3_deletions
+from analysis.models import BodyResult, ImageUploadJob
+
+"""
+체형 결과 이미지 비동기 업로드 작업 큐
+- create_body_result 요청에서는 이미지(base64 또는 multipart 파일)를 로컬 스풀 파일로 기록하고 ImageUploadJob 만 등록 (S3 I/O 없음)
+- run_image_worker 워커가 작업을 가져가(select_for_update skip_locked) 검증 -> PNG 변환 -> S3 업로드 -> key 저장
+  (BODY_IMAGE_VARIANTS_ON_UPLOAD 이면 WebP 파생 이미지도 함께 생성)
+- 이미지 형식 오류는 재시도 없이 failed, 그 외(S3 오류 등)는 IMAGE_JOB_MAX_ATTEMPTS 까지 재시도
+  재시도는 next_attempt_dt 이후에만 가져감 (IMAGE_JOB_RETRY_DELAY 부터 2배씩, IMAGE_JOB_RETRY_MAX_DELAY 까지)
+- 재시도를 모두 실패한 작업은 스풀 파일을 남겨두고, 원인 해결 후 관리자 화면(재시도 action)에서 requeue_image_jobs 로 다시 등록
+- 처리 중 BodyResult 가 삭제되면(작업도 CASCADE 삭제) 업로드한 객체는 S3 삭제 대기열에 기록하고 스풀 파일 삭제
+- BodyResult.image_status 로 클라이언트가 진행 상태 조회 (pending -> done / failed)
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def spool_image(payload, pose_type):
+    """
+    요청으로 받은 이미지를 스풀 디렉토리에 기록 후 파일 경로 반환
+    - base64 문자열: .b64 로 저장
+    - 업로드 파일(multipart): 디코딩 없이 청크 단위로 복사하여 .bin 으로 저장
+    """
+    spool_dir = Path(settings.IMAGE_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+
+    suffix = '.bin' if is_file_like(payload) else '.b64'
+    path = spool_dir / f'{uuid.uuid4().hex}-{pose_type}{suffix}'
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        if is_file_like(payload):
+            payload.seek(0)
+            shutil.copyfileobj(payload, f)
+        else:
+            f.write(payload.encode() if isinstance(payload, str) else payload)
+    os.replace(tmp_path, path)  # 워커가 쓰기 중인 파일을 읽지 않도록 rename 으로 완성된 파일만 노출
+    return str(path)
+
+
+def enqueue_image_jobs(body_result, images):
+    """
+    images: {'front': base64 또는 업로드 파일, 'side': base64 또는 업로드 파일}
+    호출한 트랜잭션이 커밋된 이후에 워커가 작업을 가져감
+    """
+    jobs = [
+        ImageUploadJob(body_result=body_result, pose_type=pose_type, spool_path=spool_image(payload, pose_type))
+        for pose_type, payload in images.items()
+    ]
+    ImageUploadJob.objects.bulk_create(jobs)
+
+    body_result.image_status = 'pending'
+    body_result.save(update_fields=['image_status'])
+    return jobs
+
+
+def claim_image_jobs(limit=10):
+    """대기 중인 작업(또는 lock 시간이 초과된 작업)을 최대 limit 개 가져와 processing 으로 변경"""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.IMAGE_JOB_LOCK_TIMEOUT)
+
+    ready = Q(next_attempt_dt__isnull=True) | Q(next_attempt_dt__lte=now)
+
+    with transaction.atomic():
+        jobs = list(
+            ImageUploadJob.objects.select_for_update(skip_locked=True)
+            .select_related('body_result')
+            .filter(Q(status='pending') & ready | Q(status='processing', locked_dt__lt=stale_before))
+            .order_by('id')[:limit]
+        )
+        if not jobs:
+            return []
+
+        ImageUploadJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status='processing', locked_dt=now, attempts=F('attempts') + 1
+        )
+
+    for job in jobs:
+        job.status = 'processing'
+        job.locked_dt = now
+        job.attempts += 1
+    return jobs
+
+
+def refresh_image_status(body_result_id):
+    """작업 상태를 모아 BodyResult.image_status 갱신 (하나라도 failed 면 failed, 모두 done 이면 done)"""
+    statuses = set(ImageUploadJob.objects.filter(body_result_id=body_result_id).values_list('status', flat=True))
+    if 'failed' in statuses:
+        image_status = 'failed'
+    elif statuses == {'done'}:
+        image_status = 'done'
+    else:
+        image_status = 'pending'
+    BodyResult.objects.filter(id=body_result_id).update(image_status=image_status)
+    return image_status
+
+
+def _remove_spool_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _retry_delay(attempts):
+    """attempts 번째 시도가 실패한 뒤 다음 시도까지 대기 시간(초)"""
+    return min(settings.IMAGE_JOB_RETRY_DELAY * 2 ** (attempts - 1), settings.IMAGE_JOB_RETRY_MAX_DELAY)
+
+
+def _fail_job(job, error_message, retry, keep_spool=True):
+    job.status = 'pending' if retry else 'failed'
+    job.error_message = error_message[:500]
+    job.locked_dt = None
+    job.next_attempt_dt = timezone.now() + timedelta(seconds=_retry_delay(job.attempts)) if retry else None
+    # 처리 중 BodyResult 가 삭제되어 작업도 없어진 경우 save(update_fields) 는 예외가 나므로 update 로 확인
+    updated = ImageUploadJob.objects.filter(id=job.id).update(
+        status=job.status, error_message=job.error_message, locked_dt=None, next_attempt_dt=job.next_attempt_dt,
+        updated_dt=timezone.now()
+    )
+    if not updated:
+        _remove_spool_file(job.spool_path)
+        return
+    if not retry:
+        if not keep_spool:
+            _remove_spool_file(job.spool_path)
+        refresh_image_status(job.body_result_id)
+
+
+def requeue_image_jobs(jobs):
+    """실패한 작업 중 스풀 파일이 남아 있는 작업을 다시 대기 상태로 등록 후 등록한 작업 수 반환"""
+    job_ids = [job.id for job in jobs if job.status == 'failed' and os.path.exists(job.spool_path)]
+    with transaction.atomic():
+        ImageUploadJob.objects.filter(id__in=job_ids, status='failed').update(
+            status='pending', attempts=0, next_attempt_dt=None, error_message=None
+        )
+        BodyResult.objects.filter(image_jobs__id__in=job_ids).update(image_status='pending')
+    return len(job_ids)
+
+
+def _create_variants(job, file_key, image_data):
+    # 파생 이미지 생성 실패는 업로드 실패로 보지 않음 (조회 시 원본 사용, generate_image_variants 로 재생성)
+    try:
+        create_image_variants(file_key, image_data)
+    except Exception as e:
+        logger.warning(f"Image job {job.id} variant generation failed: {e}")
+
+
+def process_image_job(job):
+    """작업 1건 처리: 스풀 파일 읽기 -> 검증 -> S3 업로드 -> key 저장"""
+    try:
+        with open(job.spool_path, 'rb') as f:
+            # .b64 는 base64 문자열, 그 외(.bin)는 원본 이미지 파일을 그대로 스트리밍
+            payload = f.read() if job.spool_path.endswith('.b64') else f
+            verified = verify_image(payload)
+            file_key = upload_image_to_s3(verified, file_keys=generate_body_image_key(job.body_result, job.pose_type))
+            if settings.BODY_IMAGE_VARIANTS_ON_UPLOAD:
+                _create_variants(job, file_key, verified)
+    except ValueError as ve:  # 이미지 형식 오류 -> 재시도해도 동일하므로 바로 실패 처리
+        logger.warning(f"Image job {job.id} failed: {ve}")
+        _fail_job(job, f"Invalid image format: {ve}", retry=False, keep_spool=False)
+        return False
+    except Exception as e:  # S3 / 파일 I/O 오류 -> 재시도
+        retry = job.attempts < settings.IMAGE_JOB_MAX_ATTEMPTS
+        logger.warning(f"Image job {job.id} error (attempt {job.attempts}, retry={retry}): {e}")
+        _fail_job(job, str(e), retry=retry)
+        return False
+
+    with transaction.atomic():
+        updated = BodyResult.objects.filter(id=job.body_result_id).update(**{f'image_{job.pose_type}_key': file_key})
+        if updated:
+            job.status = 'done'
+            job.error_message = None
+            job.next_attempt_dt = None
+            job.save(update_fields=['status', 'error_message', 'next_attempt_dt', 'updated_dt'])
+            refresh_image_status(job.body_result_id)
+            # 앞/옆 이미지가 모두 저장되면 기관 통계에 반영 (queryset.update 는 시그널이 없으므로 직접 호출)
+            add_body_result(job.body_result_id)
+        else:  # 처리 중 삭제된 결과 -> 방금 업로드한 객체는 삭제 시점에 key 가 없어 삭제 대기열에 없음
+            logger.warning(f"Image job {job.id}: body result {job.body_result_id} was deleted, removing upload")
+            enqueue_s3_deletions(get_image_all_keys(file_key))
+
+    _remove_spool_file(job.spool_path)
+    return bool(updated)
+
+
+def run_image_worker(batch_size=10, poll_interval=1.0, once=False):
+    """작업 큐 처리 루프 (once=True 이면 대기 중인 작업을 모두 처리한 뒤 종료)"""
+    return run_job_worker(claim_image_jobs, process_image_job, batch_size=batch_size, poll_interval=poll_interval,
+                          once=once)
@@ -0,0 +1,134 @@
+import json
+import logging
+import os
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from analysis.custom.credentials import password_hasher
+from analysis.custom.job_worker import run_job_worker
+from analysis.custom.member_import import import_members
+from analysis.models import MemberImportJob
+
+"""
+회원 등록(엑셀 업로드) 백그라운드 작업 큐
+- member_register 저장 요청의 행 수가 MEMBER_IMPORT_SYNC_MAX_ROWS 를 넘으면 검증된 행을 스풀 파일(JSON)로 기록하고
+  MemberImportJob 만 등록 (요청에서는 DB 저장 없음), 페이지는 member_import_status 를 조회하여 진행률 표시
+- run_import_worker 워커가 작업을 가져가(select_for_update skip_locked) MEMBER_IMPORT_CHUNK_SIZE 행씩 저장
+  chunk 마다 [회원 저장 + processed_rows / 회원 수 갱신] 을 한 트랜잭션으로 커밋하므로 UserInfo 잠금은 chunk 동안만 유지
+- 실패하거나 워커가 중단되면 커밋된 chunk 다음 행부터 이어서 처리 (MEMBER_IMPORT_MAX_ATTEMPTS 까지)
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def spool_rows(users):
+    """검증된 행을 스풀 디렉토리에 JSON 으로 기록 후 파일 경로 반환"""
+    spool_dir = Path(settings.MEMBER_IMPORT_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+
+    path = spool_dir / f'{uuid.uuid4().hex}.json'
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(users, f, ensure_ascii=False)
+    os.replace(tmp_path, path)  # 워커가 쓰기 중인 파일을 읽지 않도록 rename 으로 완성된 파일만 노출
+    return str(path)
+
+
+def enqueue_member_import(admin, users):
+    return MemberImportJob.objects.create(
+        requested_by=admin,
+        school_id=admin.school_id if admin.user_type == 'S' else None,
+        organization_id=admin.organization_id if admin.user_type == 'O' else None,
+        spool_path=spool_rows(users),
+        total_rows=len(users),
+    )
+
+
+def claim_import_jobs(limit=1):
+    """대기 중인 작업(또는 lock 시간이 초과된 작업)을 최대 limit 개 가져와 processing 으로 변경 (processed_rows 유지)"""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.MEMBER_IMPORT_LOCK_TIMEOUT)
+
+    with transaction.atomic():
+        jobs = list(
+            MemberImportJob.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('requested_by__school', 'requested_by__organization')
+            .filter(Q(status='pending') | Q(status='processing', locked_dt__lt=stale_before))
+            .order_by('id')[:limit]
+        )
+        if not jobs:
+            return []
+
+        MemberImportJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            status='processing', locked_dt=now, attempts=F('attempts') + 1
+        )
+
+    for job in jobs:
+        job.status = 'processing'
+        job.locked_dt = now
+        job.attempts += 1
+    return jobs
+
+
+def _remove_spool_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _import_chunk(job, admin, users, password):
+    """chunk 1개 저장과 진행 위치 갱신을 한 트랜잭션으로 커밋"""
+    with transaction.atomic():
+        existing_member, new_member = import_members(admin, users, now=job.created_dt, password=password)
+        job.processed_rows += len(users)
+        job.existing_member += existing_member
+        job.new_member += new_member
+        job.locked_dt = timezone.now()
+        job.save(update_fields=['processed_rows', 'existing_member', 'new_member', 'locked_dt', 'updated_dt'])
+
+
+def process_import_job(job):
+    """작업 1건 처리: 스풀 파일 읽기 -> processed_rows 부터 chunk 단위 저장"""
+    try:
+        if job.requested_by_id is None:
+            raise ValueError('요청한 관리자 계정이 삭제됨')
+        with open(job.spool_path, encoding='utf-8') as f:
+            users = json.load(f)
+
+        password = password_hasher.new_default_password_hash()  # 작업마다 한 번만 해시
+        chunk_size = settings.MEMBER_IMPORT_CHUNK_SIZE
+        while job.processed_rows < len(users):
+            chunk = users[job.processed_rows:job.processed_rows + chunk_size]
+            _import_chunk(job, job.requested_by, chunk, password)
+    except Exception as e:  # 실패한 chunk 는 롤백되고 커밋된 chunk 다음부터 재시도
+        job.refresh_from_db(fields=['processed_rows', 'existing_member', 'new_member'])
+        retry = (not isinstance(e, (ValueError, FileNotFoundError))
+                 and job.attempts < settings.MEMBER_IMPORT_MAX_ATTEMPTS)
+        logger.warning(f"Member import job {job.id} error at row {job.processed_rows} "
+                       f"(attempt {job.attempts}, retry={retry}): {e}")
+        job.status = 'pending' if retry else 'failed'
+        job.error_message = str(e)[:500]
+        job.locked_dt = None
+        job.save(update_fields=['status', 'error_message', 'locked_dt', 'updated_dt'])
+        if not retry:
+            _remove_spool_file(job.spool_path)
+        return False
+
+    job.status = 'done'
+    job.error_message = None
+    job.save(update_fields=['status', 'error_message', 'updated_dt'])
+    _remove_spool_file(job.spool_path)
+    return True
+
+
+def run_import_worker(batch_size=1, poll_interval=1.0, once=False):
+    """작업 큐 처리 루프 (once=True 이면 대기 중인 작업을 모두 처리한 뒤 종료)"""
+    return run_job_worker(claim_import_jobs, process_import_job, batch_size=batch_size, poll_interval=poll_interval,
+                          once=once)
@@ -0,0 +1,74 @@
+import logging
+import multiprocessing
+import time
+
+from django.db import connections
+
+"""
+작업 큐(이미지 업로드 / 엑셀 다운로드 / 회원 등록) 공용 워커 루프
+- 루프마다 끊어졌거나 오래된 DB 연결을 정리 (요청 밖이라 Django 가 닫지 않음, DB 재시작 / failover 후 재연결)
+- 작업 1건 처리 중 예외(DB 오류 등)는 로그만 남기고 다음 작업 처리 (lock 시간이 지나면 다른 워커가 다시 가져감)
+- 작업 조회 실패는 poll_interval 후 재시도 (once=True 이면 예외 전달)
+- run_worker_processes: 워커 프로세스를 여러 개 실행하고 비정상 종료된 프로세스는 다시 시작
+"""
+
+logger = logging.getLogger(__name__)
+
+WORKER_RESPAWN_INTERVAL = 5.0  # 단위: 초, 워커 프로세스 종료 여부 확인 주기
+
+
+def close_old_connections():
+    # 트랜잭션 안(TestCase 등)에서는 연결을 닫지 않음 (워커 루프 자체는 트랜잭션 밖에서 실행)
+    for conn in connections.all(initialized_only=True):
+        if not conn.in_atomic_block:
+            conn.close_if_unusable_or_obsolete()
+
+
+def run_job_worker(claim_jobs, process_job, batch_size=1, poll_interval=1.0, once=False):
+    """
+    claim_jobs(limit) 로 가져온 작업을 process_job(job) 으로 처리하는 루프
+    once=True 이면 대기 중인 작업을 모두 처리한 뒤 처리한 작업 수 반환
+    """
+    processed = 0
+    while True:
+        close_old_connections()
+        try:
+            jobs = claim_jobs(limit=batch_size)
+        except Exception:
+            if once:
+                raise
+            logger.exception(f"Failed to claim jobs ({claim_jobs.__module__})")
+            time.sleep(poll_interval)
+            continue
+
+        for job in jobs:
+            try:
+                process_job(job)
+            except Exception:
+                logger.exception(f"Unhandled error while processing {job.__class__.__name__} {job.id}")
+                close_old_connections()
+            processed += 1
+
+        if not jobs:
+            if once:
+                return processed
+            time.sleep(poll_interval)
+
+
+def run_worker_processes(target, args, processes):
+    """워커 프로세스를 processes 개 실행하고, 종료된 프로세스는 다시 시작 (반환하지 않음)"""
+    # fork 된 프로세스가 부모의 DB 커넥션을 공유하지 않도록 먼저 닫음
+    connections.close_all()
+
+    def start():
+        process = multiprocessing.Process(target=target, args=args, daemon=True)
+        process.start()
+        return process
+
+    running = [start() for _ in range(processes)]
+    while True:
+        time.sleep(WORKER_RESPAWN_INTERVAL)
+        for i, process in enumerate(running):
+            if not process.is_alive():
+                logger.error(f"Worker process {process.pid} exited (exitcode={process.exitcode}), restarting")
+                running[i] = start()
@@ -0,0 +1,106 @@
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+from botocore.exceptions import ClientError
+
+"""
+로컬 파일시스템 기반 S3 대체 클라이언트
+- AWS_S3_LOCAL_ROOT 설정 시 get_s3_client()가 boto3 클라이언트 대신 반환
+- 오프라인 테스트 / 개발 환경에서 사용 (boto3 S3 클라이언트에서 사용하는 메서드만 구현)
+- 버킷은 root 하위 디렉토리, 객체 key는 버킷 하위 파일 경로로 저장
+"""
+
+
+class LocalS3Client:
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, bucket, key):
+        return self.root / bucket / key
+
+    @staticmethod
+    def _not_found(operation_name):
+        return ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, operation_name)
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Callback=None, Config=None):
+        path = self._path(Bucket, Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(Fileobj, f)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        path = self._path(Bucket, Key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            if isinstance(Body, (bytes, bytearray, memoryview)):
+                f.write(Body)
+            else:
+                shutil.copyfileobj(Body, f)
+        return {}
+
+    def get_object(self, Bucket, Key):
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise self._not_found('GetObject')
+        return {'Body': open(path, 'rb'), 'ContentLength': path.stat().st_size}
+
+    def head_object(self, Bucket, Key):
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise self._not_found('HeadObject')
+        return {'ContentLength': path.stat().st_size}
+
+    def copy_object(self, Bucket, Key, CopySource, **kwargs):
+        src = self._path(CopySource['Bucket'], CopySource['Key'])
+        if not src.is_file():
+            raise self._not_found('CopyObject')
+        dst = self._path(Bucket, Key)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dst)
+        return {}
+
+    def delete_objects(self, Bucket, Delete):
+        deleted = []
+        for obj in Delete.get('Objects', []):
+            path = self._path(Bucket, obj['Key'])
+            if path.is_file():
+                path.unlink()
+            deleted.append({'Key': obj['Key']})  # S3와 동일하게 없는 key도 삭제 성공으로 처리
+        return {'Deleted': deleted, 'Errors': []}
+
+    def list_objects_v2(self, Bucket, Prefix='', MaxKeys=1000, ContinuationToken=None, StartAfter=None):
+        bucket_root = self.root / Bucket
+        keys = []
+        if bucket_root.is_dir():
+            for dirpath, _, filenames in os.walk(bucket_root):
+                for filename in filenames:
+                    key = Path(dirpath, filename).relative_to(bucket_root).as_posix()
+                    if key.startswith(Prefix):
+                        keys.append(key)
+        keys.sort()
+
+        # S3와 동일하게 key 사전순 정렬 후 ContinuationToken(마지막 key) 이후부터 반환
+        start_after = ContinuationToken or StartAfter
+        if start_after:
+            keys = [key for key in keys if key > start_after]
+
+        page = keys[:MaxKeys]
+        response = {
+            'Contents': [self._object_info(Bucket, key) for key in page],
+            'KeyCount': len(page),
+            'IsTruncated': len(keys) > MaxKeys,
+        }
+        if response['IsTruncated']:
+            response['NextContinuationToken'] = page[-1]
+        return response
+
+    def _object_info(self, bucket, key):
+        stat = self._path(bucket, key).stat()
+        return {'Key': key, 'Size': stat.st_size,
+                'LastModified': datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)}
+
+    def generate_presigned_url(self, ClientMethod, Params=None, ExpiresIn=3600):
+        path = self._path(Params['Bucket'], Params['Key']).resolve()
+        return f"{path.as_uri()}?Expires={ExpiresIn}"
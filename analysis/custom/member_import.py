@@ -0,0 +1,209 @@
+from datetime import datetime as dt
+
+import pandas as pd
+from django.db import transaction
+
+from analysis.custom.credentials import password_hasher
+from analysis.custom.dashboard import invalidate_dashboard_stats
+from analysis.custom.report_groups import invalidate_year_group_map
+from analysis.helpers import extract_digits
+from analysis.models import UserHist, UserInfo
+
+"""
+회원 등록(엑셀 업로드) 검증 / 일괄 저장
+- parse_member_frame: 엑셀 DataFrame 을 열 단위(pandas 문자열/숫자 연산)로 정리하고 오류 행을 행 번호와 함께 반환
+- 업로드한 전화번호의 기존 회원을 한 번에 조회한 뒤 신규(bulk_create) / 기존 회원으로 나누어 저장
+  기존 회원은 모두 같은 값(기관/비밀번호/연도)을 UPDATE 한 번으로, 바뀐 학년/반/번호/이름 등만 bulk_update
+- 작년도 기존 회원의 이력(UserHist)은 같은 내용의 이력이 없는 경우만 bulk_create
+- 초기 비밀번호(DEFAULT_PASSWORD)는 업로드마다 한 번만 해시 (행마다 PBKDF2 를 계산하지 않음, credentials 프로세스 풀에서 계산)
+- bulk 작업은 시그널이 없으므로 대시보드 / 결과 조회 선택 목록 캐시는 직접 삭제
+"""
+
+SCHOOL_MEMBER_COLUMNS = ['학년', '반', '번호', '이름', '전화번호']
+ORGANIZATION_MEMBER_COLUMNS = ['부서명', '이름', '전화번호']
+NUMBER_COLUMNS = ['학년', '반', '번호']
+PHONE_NUMBER_PATTERN = r'0\d{8,10}'  # 숫자만 남긴 전화번호 (지역번호 / 휴대폰)
+PHONE_LOOKUP_BATCH_SIZE = 2000  # 기존 회원 조회 / 갱신 시 IN 절 최대 개수
+SCHOOL_HIST_FIELDS = ['school_id', 'student_grade', 'student_class', 'student_number', 'student_name', 'year']
+ORGANIZATION_HIST_FIELDS = ['organization_id', 'department', 'student_name', 'year']
+
+
+def normalize_phone_number(value):
+    phone_number = extract_digits(str(value).replace('-', ''))
+    if phone_number.startswith('10'):  # 10 으로 시작하는 경우 0 추가(int로 입력이 들어오면 맨 앞에 0이 빠지기 때문)
+        phone_number = '0' + phone_number
+    return phone_number
+
+
+def parse_member_frame(df, user_type):
+    """
+    엑셀 DataFrame -> (저장할 회원 dict 목록, 행별 오류 목록)
+    - 학년/반/번호는 0 이상의 정수 문자열로, 이름/부서명은 앞뒤 공백 제거, 전화번호는 숫자만 남기고 앞의 0 복원
+    - 오류가 있는 행은 저장 목록에서 제외하고 [{'row': 엑셀 행 번호, 'errors': [메시지, ...]}] 로 반환 (빈 행은 무시)
+    """
+    columns = SCHOOL_MEMBER_COLUMNS if user_type == 'S' else ORGANIZATION_MEMBER_COLUMNS
+    if not all(col in df.columns for col in columns):
+        user_type_str = '교직원용' if user_type == 'S' else '일반 기관용'
+        raise ValueError(f"올바른 템플릿이 아닙니다. {user_type_str} 템플릿을 다운로드 받아서 다시 시도해주세요.")
+
+    frame = df[columns]
+    frame = frame[frame.notna().any(axis=1)]
+
+    values = {}
+    problems = {}  # 오류 메시지 -> 해당 행 mask
+    for column in columns:
+        if column in NUMBER_COLUMNS:
+            numbers = pd.to_numeric(frame[column], errors='coerce')
+            valid = numbers.notna() & (numbers % 1 == 0) & (numbers >= 0)
+            missing = frame[column].isna()
+            values[column] = numbers.where(valid, 0).astype('int64').astype(str)
+            problems[f'{column} 누락'] = missing
+            problems[f'{column}은(는) 숫자여야 합니다'] = ~missing & ~valid
+            continue
+
+        # StringDtype 대신 object 열 사용 (마지막에 dict 로 바꿀 때 값마다 박싱하지 않도록)
+        text = frame[column].astype(str).where(frame[column].notna(), '').str.strip()
+        missing = text == ''
+        problems[f'{column} 누락'] = missing
+        if column == '전화번호':
+            # 숫자로 읽힌 셀(1000010001.0 등)의 소수점 제거 후 숫자만 남김
+            digits = text.str.replace(r'\.0$|\D', '', regex=True)
+            # 10 으로 시작하는 경우 0 추가(int로 입력이 들어오면 맨 앞에 0이 빠지기 때문)
+            text = digits.mask(digits.str.startswith('10'), '0' + digits)
+            problems['전화번호 형식 오류'] = ~missing & ~text.str.fullmatch(PHONE_NUMBER_PATTERN)
+        values[column] = text
+
+    flags = pd.DataFrame(problems).astype(bool)
+    has_error = flags.any(axis=1)
+    messages = flags.columns.to_numpy()
+    errors = [
+        {'row': int(index) + 2, 'errors': messages[row_flags].tolist()}  # 헤더가 1행
+        for index, row_flags in zip(flags.index[has_error], flags[has_error].to_numpy())
+    ]
+    keep = ~has_error.to_numpy()
+    users = [dict(zip(columns, row)) for row in zip(*(values[column].to_numpy()[keep] for column in columns))]
+    return users, errors
+
+
+def _member_values(admin, user_data, phone_number):
+    """엑셀 행 -> 회원마다 다른 UserInfo 필드 값"""
+    if admin.user_type == 'S':
+        return {
+            'username': phone_number,
+            'student_grade': int(user_data['학년']),
+            'student_class': int(user_data['반']),
+            'student_number': int(user_data['번호']),
+            'student_name': user_data['이름'],
+            'user_display_name': f"{admin.school.school_name} {user_data['학년']}학년 {user_data['반']}반 "
+                                 f"{user_data['번호']}번 {user_data['이름']}",
+        }
+    return {
+        'username': phone_number,
+        'department': user_data['부서명'],
+        'student_name': user_data['이름'],
+        'user_display_name': f"{admin.organization.organization_name} {user_data['이름']}",
+    }
+
+
+def _shared_values(admin, password, year):
+    """업로드한 모든 회원에게 같은 UserInfo 필드 값 (기관 / 초기 비밀번호 / 등록 연도)"""
+    shared = {'password': password, 'user_type': admin.user_type, 'year': year}
+    if admin.user_type == 'S':
+        return {**shared, 'school': admin.school, 'organization': None, 'department': None}
+    return {**shared, 'organization': admin.organization, 'school': None}
+
+
+def _fetch_existing_users(phone_numbers):
+    """전화번호 -> 기존 회원 (같은 전화번호가 여러 명이면 먼저 등록된 회원)"""
+    existing_users = {}
+    for start in range(0, len(phone_numbers), PHONE_LOOKUP_BATCH_SIZE):
+        batch = phone_numbers[start:start + PHONE_LOOKUP_BATCH_SIZE]
+        for user in UserInfo.objects.filter(phone_number__in=batch).order_by('id'):
+            existing_users.setdefault(user.phone_number, user)
+    return existing_users
+
+
+def _new_histories(admin, users, year):
+    """작년도 회원(가입 연도 또는 등록 연도가 올해가 아닌 회원) 중 같은 내용의 이력이 없는 회원의 UserHist 목록"""
+    hist_fields = SCHOOL_HIST_FIELDS if admin.user_type == 'S' else ORGANIZATION_HIST_FIELDS
+    past_users = [user for user in users if user.created_dt.year != year or user.year != year]
+    if not past_users:
+        return []
+
+    def snapshot(obj):
+        return tuple(getattr(obj, field) for field in hist_fields)
+
+    existing = {
+        (hist['user_id'], *(hist[field] for field in hist_fields))
+        for hist in UserHist.objects.filter(user_id__in=[user.id for user in past_users]).values('user_id',
+                                                                                                 *hist_fields)
+    }
+    histories = []
+    for user in past_users:
+        if (user.id, *snapshot(user)) not in existing:
+            histories.append(UserHist(user=user, **dict(zip(hist_fields, snapshot(user)))))
+    return histories
+
+
+def import_members(admin, users, now=None, password=None):
+    """
+    관리자(admin) 기관에 엑셀 회원 목록 저장
+    users: 전처리된 엑셀 행 dict 목록 (학교: 학년/반/번호/이름/전화번호, 기관: 부서명/이름/전화번호)
+    password: 초기 비밀번호 해시 (나누어 저장하는 경우 한 번 계산한 값을 전달, 없으면 계산)
+    반환: (기존 회원 수, 신규 회원 수) - 같은 전화번호가 여러 행이면 두 번째 행부터 기존 회원으로 셈
+    """
+    year = (now or dt.now()).year
+    password = password or password_hasher.new_default_password_hash()
+
+    # 전화번호별 마지막 행 값으로 저장 (행 순서대로 저장하던 것과 동일한 결과)
+    rows = {}
+    for user_data in users:
+        rows[normalize_phone_number(user_data['전화번호'])] = user_data
+    phone_numbers = list(rows)
+    existing_users = _fetch_existing_users(phone_numbers)
+
+    existing_member = new_member = 0
+    seen = set(existing_users)
+    for user_data in users:
+        phone_number = normalize_phone_number(user_data['전화번호'])
+        if phone_number in seen:
+            existing_member += 1
+        else:
+            new_member += 1
+            seen.add(phone_number)
+
+    # 변경 전 기관 (다른 기관에서 옮겨오는 회원 포함) 캐시도 함께 삭제
+    institutions = {(user.school_id, user.organization_id) for user in existing_users.values()}
+    institutions.add((admin.school_id, admin.organization_id))
+
+    shared = _shared_values(admin, password, year)
+    with transaction.atomic():
+        histories = _new_histories(admin, list(existing_users.values()), year)
+
+        to_create, changed = [], []
+        member_fields = None
+        for phone_number in phone_numbers:
+            values = _member_values(admin, rows[phone_number], phone_number)
+            member_fields = list(values)
+            user = existing_users.get(phone_number)
+            if user is None:
+                to_create.append(UserInfo(phone_number=phone_number, **shared, **values))
+            elif any(getattr(user, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(user, field, value)
+                changed.append(user)
+
+        UserHist.objects.bulk_create(histories, batch_size=1000)
+        # 모두 같은 값은 UPDATE 한 번으로, 회원마다 다른 값은 바뀐 회원만 bulk_update (CASE WHEN 대상 최소화)
+        existing_ids = [user.id for user in existing_users.values()]
+        for start in range(0, len(existing_ids), PHONE_LOOKUP_BATCH_SIZE):
+            UserInfo.objects.filter(id__in=existing_ids[start:start + PHONE_LOOKUP_BATCH_SIZE]).update(**shared)
+        if changed:
+            UserInfo.objects.bulk_update(changed, member_fields, batch_size=500)
+        UserInfo.objects.bulk_create(to_create, batch_size=1000)
+
+        for school_id, organization_id in institutions:
+            invalidate_dashboard_stats(school_id=school_id, organization_id=organization_id)
+            invalidate_year_group_map(school_id)
+
+    return existing_member, new_member
@@ -31,6 +31,17 @@ monthly_active_users = Gauge(
     'Monthly Active Users for BodyResult creation'
 )
 
+# S3 I/O (프로세스 공용 S3 I/O 서비스)
+s3_inflight_transfers = Gauge(
+    's3_inflight_transfers',
+    'Number of S3 uploads in progress'
+)
+
+s3_io_queue_depth = Gauge(
+    's3_io_queue_depth',
+    'Number of S3 I/O tasks waiting for a worker thread'
+)
+
 # DAU, WAU, MAU 계산 함수
 def calculate_active_users():
     from ..models import BodyResult
@@ -0,0 +1,58 @@
+from django.db import transaction
+
+from analysis.custom.rollup import rebuild_rollups
+from analysis.custom.scoring import BODY_NORMAL_FIELDS, summarize_body_normal_batch
+from analysis.models import BodyResult
+
+"""
+BodyResult 정상범위 요약(normal_count, caution_mask) 갱신
+- CodeInfo 정상범위(normal_min_value / normal_max_value) 또는 판정 항목이 바뀌면 저장된 요약을 비움
+  (CodeInfo 저장과 같은 트랜잭션, 요약이 없는 결과는 조회 / 엑셀 생성 시 현재 기준으로 계산)
+- 스케줄러가 refresh_missing_normal_summaries 로 요약이 없는 결과를 chunk 단위로 다시 채우고,
+  모두 채워지면 기관 통계(BodyResultRollup)를 재계산
+  (select_for_update(skip_locked) 로 chunk 를 가져오므로 여러 프로세스가 동시에 실행해도 같은 row 를 처리하지 않음)
+- 전체 재계산 / 진행 위치 기록 / 변경 건수 확인은 backfill_normal_summary 명령 사용
+"""
+
+SUMMARY_ROW_FIELDS = ['id', 'normal_count', 'caution_mask', *BODY_NORMAL_FIELDS]
+# 정상범위 요약 결과에 영향을 주는 CodeInfo 필드 (scoring.check_body_normal_batch)
+CODE_INFO_RANGE_FIELDS = ['code_id', 'normal_min_value', 'normal_max_value']
+
+
+def summarize_changed(rows):
+    """rows: SUMMARY_ROW_FIELDS 순서의 값 목록 -> 요약이 바뀐 BodyResult 목록 (저장하지 않음)"""
+    ids, old_counts, old_masks, *columns = zip(*rows)
+    normal_counts, caution_masks = summarize_body_normal_batch(dict(zip(BODY_NORMAL_FIELDS, columns)))
+    return [
+        BodyResult(id=body_result_id, normal_count=int(normal_count), caution_mask=int(caution_mask))
+        for body_result_id, old_count, old_mask, normal_count, caution_mask
+        in zip(ids, old_counts, old_masks, normal_counts, caution_masks)
+        if (old_count, old_mask) != (normal_count, caution_mask)
+    ]
+
+
+def invalidate_normal_summaries():
+    """저장된 요약을 모두 비움 (다음 스케줄러 실행 시 현재 CodeInfo 기준으로 다시 계산)"""
+    return BodyResult.objects.filter(normal_count__isnull=False).update(normal_count=None, caution_mask=None)
+
+
+def refresh_missing_normal_summaries(chunk_size=5000):
+    """요약이 없는 결과를 계산하여 저장 후 처리 건수 반환 (남은 결과가 없으면 기관 통계 재계산)"""
+    refreshed_count = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                BodyResult.objects.select_for_update(skip_locked=True)
+                .filter(normal_count__isnull=True).order_by('id')
+                .values_list(*SUMMARY_ROW_FIELDS)[:chunk_size]
+            )
+            if not rows:
+                break
+            BodyResult.objects.bulk_update(summarize_changed(rows), ['normal_count', 'caution_mask'],
+                                           batch_size=1000)
+        refreshed_count += len(rows)
+
+    # 통계의 주의 대상 / 항목별 주의 건수도 이전 기준이므로 모든 요약이 채워진 뒤 한 번 재계산
+    if refreshed_count and not BodyResult.objects.filter(normal_count__isnull=True).exists():
+        rebuild_rollups()
+    return refreshed_count
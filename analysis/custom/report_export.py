@@ -0,0 +1,244 @@
+import hashlib
+import re
+import tempfile
+from datetime import datetime as dt
+from itertools import islice
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from analysis.custom.code_info import code_info_registry
+from analysis.custom.scoring import BODY_NORMAL_FIELDS, LOW_NORMAL_COUNT, summarize_body_normal_batch
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+from analysis.models import BODY_RESULT_COMPLETED, BodyResult, UserHist, UserInfo
+
+"""
+결과 조회 엑셀 다운로드 (report_download)
+- 회원 목록을 DB iterator 로 chunk 단위로 읽고, chunk 마다 최근 검사 결과를 id 로 한 번에 조회
+- openpyxl write-only 모드로 행을 바로 기록 (행 단위로 임시 파일에 쓰므로 전체 행을 메모리에 올리지 않음)
+  통계 시트 값은 데이터 행을 쓰면서 함께 집계
+- xlsx 는 zip 이므로 마지막에 한 번에 만들어지며, 임시 파일을 FileResponse 로 나누어 전송
+  (REPORT_EXPORT_SYNC_MAX_ROWS 를 넘는 경우 export_jobs 워커에서 같은 함수로 생성)
+"""
+
+DATA_SHEET = '데이터'
+SUMMARY_SHEET = '통계'
+RESULT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+RESULT_FIELDS = ['id', 'created_dt', 'normal_count', 'caution_mask', *BODY_NORMAL_FIELDS]
+
+HIGHLIGHT_FILL = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")  # 주의 대상 정상범위 셀
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+HEADER_BORDER = Border(*(Side(style='thin'),) * 4)
+
+
+SCHOOL_MEMBER_COLUMNS = ['학년', '반', '번호', '이름']
+SCHOOL_MEMBER_FIELDS = ['student_grade', 'student_class', 'student_number', 'student_name']
+ORGANIZATION_MEMBER_COLUMNS = ['부서명', '이름']
+ORGANIZATION_MEMBER_FIELDS = ['department', 'student_name']
+
+
+def _with_latest_result_id(queryset, user_ref, selected_year=None):
+    # 최근 완료된(이미지가 있는) 검사 결과 id (학교는 선택된 년도, 기관은 모든 년도)
+    body_results = BodyResult.objects.filter(BODY_RESULT_COMPLETED, user_id=OuterRef(user_ref))
+    if selected_year is not None:
+        body_results = body_results.filter(created_dt__year=selected_year)
+    return queryset.annotate(latest_result_id=Subquery(body_results.order_by('-created_dt').values('id')[:1]))
+
+
+def get_report_rosters(user, selected_year, selected_group):
+    """
+    관리자(user)의 선택 연도/그룹 회원 목록
+    반환: (회원 표시 컬럼명, 회원 표시 필드, [latest_result_id 가 annotate 된 queryset (엑셀 행 순서)])
+    """
+    if user.user_type == 'S':  # 학교 사용자
+        match = re.search(r"(\d+)학년 (\d+)반", selected_group)
+        if selected_year == str(dt.now().year) and match:  # 현재 년도 조회
+            users = UserInfo.objects.filter(
+                school__school_name=user.school.school_name,
+                student_grade=match.group(1),
+                student_class=match.group(2),
+                year=selected_year
+            )
+            rosters = [_with_latest_result_id(users, 'id', selected_year).order_by('student_number')]
+        else:  # 이전 년도 조회
+            # UserHist에서 데이터 조회
+            user_hists = UserHist.objects.filter(
+                school__id=user.school.id,
+                student_grade=match.group(1),
+                student_class=match.group(2),
+                year=selected_year
+            )
+
+            # UserInfo에서 UserHist에 없는 데이터만 조회
+            unique_user_infos = UserInfo.objects.filter(
+                school__id=user.school.id,
+                student_grade=match.group(1),
+                student_class=match.group(2),
+                year=selected_year
+            ).exclude(id__in=user_hists.values('user_id'))
+
+            # 최종 사용자 목록 (UserHist -> UserInfo 순)
+            rosters = [
+                _with_latest_result_id(user_hists, 'user_id', selected_year).order_by('student_number'),
+                _with_latest_result_id(unique_user_infos, 'id', selected_year).order_by('student_number'),
+            ]
+        return SCHOOL_MEMBER_COLUMNS, SCHOOL_MEMBER_FIELDS, rosters
+
+    # 기관 사용자
+    users = UserInfo.objects.filter(
+        organization_id=user.organization_id,
+        department=selected_group
+    )
+    return ORGANIZATION_MEMBER_COLUMNS, ORGANIZATION_MEMBER_FIELDS, [
+        _with_latest_result_id(users, 'id').order_by('student_name')
+    ]
+
+
+def iter_report_members(rosters, fields):
+    """(회원 표시 값, 최근 검사 결과 id) - iterator() 로 chunk 단위 조회 (전체 회원을 메모리에 올리지 않음)"""
+    for queryset in rosters:
+        for *values, result_id in queryset.values_list(*fields, 'latest_result_id').iterator(chunk_size=2000):
+            yield values, result_id
+
+
+def report_file_name(user, selected_year, selected_group):
+    if user.user_type == 'S':
+        return f"{selected_year}_{user.school.school_name}_{selected_group}.xlsx"
+    return f"{selected_year}_{user.organization.organization_name}_{selected_group}.xlsx"
+
+
+def get_report_version(rosters, code_columns):
+    """
+    엑셀 내용이 바뀌었는지 판단하기 위한 (전체 행 수, 데이터 버전)
+    회원 목록별 집계 1회 (회원 수 / 회원 id 합 / 최근 검사 결과 id 합) + 표시 측정 항목으로 계산
+    (검사 결과 추가/삭제, 회원 추가/삭제/이동 시 바뀌며 회원 이름만 수정한 경우는 보관 기간 이후 반영)
+    """
+    parts = [','.join(field for _, field, _ in code_columns)]
+    total_rows = 0
+    for queryset in rosters:
+        stats = queryset.order_by().aggregate(
+            row_count=Count('id'), id_sum=Sum('id'), result_id_sum=Sum('latest_result_id')
+        )
+        total_rows += stats['row_count']
+        parts.append(f"{stats['row_count']}:{stats['id_sum']}:{stats['result_id_sum']}")
+    return total_rows, hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32]
+
+
+def get_code_columns():
+    """엑셀에 표시할 측정 항목 [(BODY_NORMAL_FIELDS index, 필드, code_name)] (CodeInfo 가 등록된 항목만)"""
+    code_columns = []
+    for i, field in enumerate(BODY_NORMAL_FIELDS):
+        code_info = code_info_registry.get(field)
+        if code_info is not None:
+            code_columns.append((i, field, code_info.code_name))
+    return code_columns
+
+
+def _fetch_results(result_ids):
+    """최근 검사 결과 id 목록 -> {id: 결과 dict} (정상범위 요약이 없는 기존 데이터는 일괄 계산)"""
+    results = {row['id']: row for row in BodyResult.objects.filter(id__in=result_ids).values(*RESULT_FIELDS)}
+    missing = [row for row in results.values() if row['normal_count'] is None]
+    if missing:
+        normal_counts, caution_masks = summarize_body_normal_batch(
+            {field: [row[field] for row in missing] for field in BODY_NORMAL_FIELDS}
+        )
+        for row, normal_count, caution_mask in zip(missing, normal_counts, caution_masks):
+            row['normal_count'], row['caution_mask'] = int(normal_count), int(caution_mask)
+    return results
+
+
+def iter_report_rows(members, code_columns, chunk_size=2000, progress=None):
+    """
+    members: (회원 표시 값 tuple, 최근 검사 결과 id 또는 None) iterable
+    progress: chunk 를 처리할 때마다 지금까지 처리한 행 수로 호출 (백그라운드 작업 진행률)
+    반환: (엑셀 행 값 list, 정상범위 항목 수 또는 None) generator
+    """
+    members = iter(members)
+    processed = 0
+    while True:
+        chunk = list(islice(members, chunk_size))
+        if not chunk:
+            return
+        results = _fetch_results([result_id for _, result_id in chunk if result_id is not None])
+        for values, result_id in chunk:
+            result = results.get(result_id)
+            if result is None:
+                yield [*values, None, 'X', None, *[None] * len(code_columns)], None
+                continue
+            statuses = [
+                '주의' if result[field] is not None and result['caution_mask'] >> i & 1 else None
+                for i, field, _ in code_columns
+            ]
+            yield [*values, result['created_dt'].strftime(RESULT_DATE_FORMAT), 'O',
+                   f"{result['normal_count']}/{len(BODY_NORMAL_FIELDS)}", *statuses], result['normal_count']
+        processed += len(chunk)
+        if progress is not None:
+            progress(processed)
+
+
+def write_report_workbook(file, member_columns, rows, code_columns):
+    """
+    통계 시트 + 데이터 시트 엑셀을 file 에 기록
+    member_columns: 회원 표시 컬럼명 (학교: 학년/반/번호/이름, 기관: 부서명/이름)
+    rows: iter_report_rows 결과
+    """
+    code_names = [code_name for _, _, code_name in code_columns]
+    columns = [*member_columns, '검사일', '검사결과', '정상범위', *code_names]
+    first_code_column = len(member_columns) + 4
+    normal_range_index = columns.index('정상범위')
+
+    workbook = Workbook(write_only=True)
+    summary_sheet = workbook.create_sheet(SUMMARY_SHEET)  # 첫 번째 시트
+    worksheet = workbook.create_sheet(DATA_SHEET)
+
+    # write-only 모드에서는 열 폭을 행을 쓰기 전에 지정
+    worksheet.column_dimensions[get_column_letter(columns.index('검사일') + 1)].width = len('0000-00-00 00:00:00') + 2
+    for col_idx in range(first_code_column, len(columns) + 1):  # 측정 항목
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = 15
+
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font, cell.alignment, cell.border = HEADER_FONT, HEADER_ALIGNMENT, HEADER_BORDER
+        header.append(cell)
+    worksheet.append(header)
+
+    total_count = examined_count = 0
+    warning_counts = [0] * len(code_names)
+    for values, normal_count in rows:
+        total_count += 1
+        if normal_count is not None:
+            examined_count += 1
+            for idx, status in enumerate(values[first_code_column - 1:]):
+                warning_counts[idx] += status == '주의'
+            if normal_count <= LOW_NORMAL_COUNT:  # 주의를 시각적으로 나타내기 위함
+                cell = WriteOnlyCell(worksheet, value=values[normal_range_index])
+                cell.fill = HIGHLIGHT_FILL
+                values[normal_range_index] = cell
+        worksheet.append(values)
+    worksheet.auto_filter.ref = f"A1:{get_column_letter(len(columns))}{total_count + 1}"
+
+    summary_sheet.column_dimensions['A'].width = 25
+    summary_sheet.column_dimensions['B'].width = 15
+    summary_sheet.append(['항목', '인원수'])
+    summary_sheet.append(['총 인원수', total_count])
+    summary_sheet.append(['검사를 받은 인원수', examined_count])
+    for code_name, count in zip(code_names, warning_counts):
+        summary_sheet.append([f'{code_name} 주의 인원수', count])
+
+    workbook.save(file)
+
+
+def build_report_file(member_columns, members, chunk_size=2000, code_columns=None, progress=None):
+    """엑셀을 임시 파일에 기록하고 처음 위치로 되돌린 파일 객체 반환 (닫으면 삭제)"""
+    if code_columns is None:
+        code_columns = get_code_columns()
+    file = tempfile.TemporaryFile()
+    rows = iter_report_rows(members, code_columns, chunk_size, progress)
+    write_report_workbook(file, member_columns, rows, code_columns)
+    file.seek(0)
+    return file
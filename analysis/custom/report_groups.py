@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from analysis.models import UserHist, UserInfo
+
+"""
+결과 조회(report) 화면의 학교별 연도/그룹 선택 목록 ({'연도': ['1학년 1반', ...]})
+- UserHist(이전 연도 반 정보) + UserInfo(현재 반 정보)의 (연도, 학년, 반)을 DB 에서 중복 제거(UNION)하여 조회 1회
+  (UserHist 는 (school, year, student_grade, student_class) 인덱스 사용)
+- 결과는 REPORT_GROUP_CACHE_TTL 초 동안 캐시, 회원 등록(UserInfo / UserHist 저장/삭제) 시그널에서 해당 학교 캐시 삭제
+"""
+
+GROUP_FIELDS = ('year', 'student_grade', 'student_class')
+
+
+def _cache_key(school_id):
+    return f'report:year_group_map:{school_id}'
+
+
+def compute_year_group_map(school_id):
+    rows = UserHist.objects.filter(school_id=school_id).values_list(*GROUP_FIELDS).union(
+        UserInfo.objects.filter(school_id=school_id).values_list(*GROUP_FIELDS)
+    ).order_by(*GROUP_FIELDS)
+
+    year_group_map = {}
+    for year, student_grade, student_class in rows:
+        # union 으로 (연도, 학년, 반)은 중복 제거됨
+        year_group_map.setdefault(str(year), []).append(f"{student_grade}학년 {student_class}반")
+    return year_group_map
+
+
+def get_year_group_map(school_id):
+    key = _cache_key(school_id)
+    year_group_map = cache.get(key)
+    if year_group_map is None:
+        year_group_map = compute_year_group_map(school_id)
+        cache.set(key, year_group_map, timeout=settings.REPORT_GROUP_CACHE_TTL)
+    return year_group_map
+
+
+def invalidate_year_group_map(school_id):
+    if school_id is None:
+        return
+    key = _cache_key(school_id)
+    cache.delete(key)
+    # 커밋 전에 다른 요청이 이전 데이터로 다시 캐시한 경우를 위해 커밋 후 한 번 더 삭제
+    transaction.on_commit(lambda: cache.delete(key))
@@ -0,0 +1,161 @@
+from datetime import datetime as dt
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+
+from analysis.custom.dashboard import invalidate_dashboard_stats
+from analysis.custom.scoring import BODY_NORMAL_FIELDS, LOW_NORMAL_COUNT
+from analysis.models import BODY_RESULT_COMPLETED, BodyResult, BodyResultRollup
+
+"""
+기관 단위 체형 결과 통계 (BodyResultRollup)
+- 학교 회원: (학교, 연, 월, 학년, 반), 기관 회원: (기관, 연, 월, 부서) 단위로 완료된(이미지가 있는) 검사 결과를 집계
+- 검사 결과가 완료되는 시점(이미지 key 저장)에 add_body_result 로 해당 집계 row 에 더하고 BodyResult.rollup 에 기록,
+  삭제 시 remove_body_result 로 기록된 row 에서 뺌 (회원의 학년/반/부서가 바뀌어도 더했던 row 에서 빼므로 어긋나지 않음)
+- 시그널이 없는 일괄 변경(backfill_body_image_keys, backfill_normal_summary 등) 후에는 rebuild_body_result_rollup 명령으로 재계산
+"""
+
+def bucket_fields(body_result, user):
+    """검사 결과가 속하는 집계 단위 (기관이 없는 회원이면 None)"""
+    created_dt = body_result.created_dt
+    if user.user_type == 'S' and user.school_id:
+        return {
+            'school_id': user.school_id, 'year': created_dt.year, 'month': created_dt.month,
+            'student_grade': body_result.student_grade, 'student_class': body_result.student_class,
+        }
+    if user.user_type == 'O' and user.organization_id:
+        return {
+            'organization_id': user.organization_id, 'year': created_dt.year, 'month': created_dt.month,
+            'department': user.department,
+        }
+    return None
+
+
+def bucket_key(fields):
+    if fields.get('school_id') is not None:
+        return (f"S:{fields['school_id']}:{fields['year']}:{fields['month']}:"
+                f"{fields['student_grade']}:{fields['student_class']}")
+    return f"O:{fields['organization_id']}:{fields['year']}:{fields['month']}:{fields['department']}"
+
+
+def _caution_flags(caution_mask):
+    return [(caution_mask or 0) >> i & 1 for i in range(len(BODY_NORMAL_FIELDS))]
+
+
+def _apply(rollup, body_result, sign, first_or_last_of_user):
+    caution_counts = rollup.caution_counts or [0] * len(BODY_NORMAL_FIELDS)
+    rollup.result_count += sign
+    rollup.tested_user_count += sign if first_or_last_of_user else 0
+    if body_result.normal_count is not None and body_result.normal_count <= LOW_NORMAL_COUNT:
+        rollup.low_normal_count += sign
+    rollup.caution_counts = [count + sign * flag
+                             for count, flag in zip(caution_counts, _caution_flags(body_result.caution_mask))]
+    rollup.save(update_fields=['result_count', 'tested_user_count', 'low_normal_count', 'caution_counts',
+                               'updated_dt'])
+
+
+def add_body_result(body_result_id):
+    """
+    완료된 검사 결과를 집계에 더함 (이미 더했거나 아직 완료되지 않았으면 아무것도 하지 않음)
+    BodyResult row 를 잠그고 확인하므로 앞/옆 이미지 작업이 동시에 끝나도 한 번만 더해짐
+    반환: 더한 BodyResultRollup id (더하지 않은 경우 None)
+    """
+    with transaction.atomic():
+        body_result = BodyResult.objects.select_for_update(of=('self',)).select_related('user').filter(
+            BODY_RESULT_COMPLETED, id=body_result_id, rollup__isnull=True
+        ).first()
+        if body_result is None:
+            return None
+        fields = bucket_fields(body_result, body_result.user)
+        if fields is None:
+            return None
+
+        rollup, _ = BodyResultRollup.objects.select_for_update().get_or_create(
+            bucket_key=bucket_key(fields), defaults={**fields, 'caution_counts': [0] * len(BODY_NORMAL_FIELDS)}
+        )
+        first_of_user = not BodyResult.objects.filter(rollup=rollup, user_id=body_result.user_id).exists()
+        _apply(rollup, body_result, 1, first_of_user)
+        BodyResult.objects.filter(id=body_result.id).update(rollup=rollup)
+        invalidate_dashboard_stats(school_id=rollup.school_id, organization_id=rollup.organization_id)
+    return rollup.id
+
+
+def remove_body_result(body_result):
+    """삭제된 검사 결과를 더했던 집계 row 에서 뺌 (post_delete 에서 호출, 삭제 트랜잭션 안에서 실행)"""
+    if body_result.rollup_id is None:
+        return
+    rollup = BodyResultRollup.objects.select_for_update().filter(id=body_result.rollup_id).first()
+    if rollup is None:  # 기관 삭제(CASCADE)로 집계 row 가 먼저 삭제된 경우
+        return
+    last_of_user = not BodyResult.objects.filter(rollup=rollup, user_id=body_result.user_id).exclude(
+        id=body_result.id
+    ).exists()
+    _apply(rollup, body_result, -1, last_of_user)
+
+
+def _bucket_filter(fields):
+    """집계 단위 -> BodyResult 필터 (연/월은 created_dt 범위, None 값은 isnull)"""
+    year, month = fields['year'], fields['month']
+    filters = {
+        'created_dt__gte': dt(year, month, 1),
+        'created_dt__lt': dt(year + month // 12, month % 12 + 1, 1),
+    }
+    if fields.get('school_id') is not None:
+        filters.update({'user__user_type': 'S', 'user__school_id': fields['school_id']})
+        lookups = {'student_grade': fields['student_grade'], 'student_class': fields['student_class']}
+    else:
+        filters.update({'user__user_type': 'O', 'user__organization_id': fields['organization_id']})
+        lookups = {'user__department': fields['department']}
+    for name, value in lookups.items():
+        if value is None:
+            filters[f'{name}__isnull'] = True
+        else:
+            filters[name] = value
+    return filters
+
+
+def rebuild_rollups():
+    """
+    전체 집계를 BodyResult 에서 다시 계산 (기관/연/월/학년-반(부서) 별 GROUP BY 2회 + 집계 row 마다 UPDATE 1회)
+    반환: 생성한 집계 row 수
+    """
+    caution_sums = {
+        f'caution_{i}': Coalesce(Sum(F('caution_mask').bitrightshift(i).bitand(1)), 0)
+        for i in range(len(BODY_NORMAL_FIELDS))
+    }
+    completed = BodyResult.objects.filter(BODY_RESULT_COMPLETED).annotate(
+        year=ExtractYear('created_dt'), month=ExtractMonth('created_dt')
+    )
+    group_queries = [
+        (completed.filter(user__user_type='S', user__school__isnull=False),
+         {'user__school_id': 'school_id', 'student_grade': 'student_grade', 'student_class': 'student_class'}),
+        (completed.filter(user__user_type='O', user__organization__isnull=False),
+         {'user__organization_id': 'organization_id', 'user__department': 'department'}),
+    ]
+
+    with transaction.atomic():
+        BodyResult.objects.filter(rollup__isnull=False).update(rollup=None)
+        BodyResultRollup.objects.all().delete()
+
+        created_count = 0
+        for queryset, group_fields in group_queries:
+            groups = queryset.values(*group_fields, 'year', 'month').annotate(
+                result_count=Count('id'),
+                tested_user_count=Count('user_id', distinct=True),
+                low_normal_count=Count('id', filter=Q(normal_count__lte=LOW_NORMAL_COUNT)),
+                **caution_sums,
+            ).order_by()
+            for group in groups:
+                fields = {name: group[column] for column, name in group_fields.items()}
+                fields.update(year=group['year'], month=group['month'])
+                rollup = BodyResultRollup.objects.create(
+                    bucket_key=bucket_key(fields), **fields,
+                    result_count=group['result_count'],
+                    tested_user_count=group['tested_user_count'],
+                    low_normal_count=group['low_normal_count'],
+                    caution_counts=[group[f'caution_{i}'] for i in range(len(BODY_NORMAL_FIELDS))],
+                )
+                BodyResult.objects.filter(BODY_RESULT_COMPLETED, **_bucket_filter(fields)).update(rollup=rollup)
+                created_count += 1
+    return created_count
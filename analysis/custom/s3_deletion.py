@@ -0,0 +1,71 @@
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from analysis.helpers import get_s3_client, mark_s3_objects
+from analysis.models import S3ObjectDeletion
+
+"""
+S3 객체 삭제 대기열 처리
+- enqueue_s3_deletions: DB 삭제와 같은 트랜잭션에서 삭제할 key 기록 (S3 호출 없음)
+- reap_s3_deletions: 대기 중인 key 를 delete_objects 로 최대 1000개(S3 API 제한)씩 일괄 삭제
+  (스케줄러 주기 실행 / reap_s3_deletions 명령으로 수동 실행)
+  배치마다 select_for_update(skip_locked) 로 가져오므로 여러 프로세스가 동시에 실행해도 같은 key 를 처리하지 않음
+"""
+
+logger = logging.getLogger(__name__)
+
+S3_DELETE_BATCH_SIZE = 1000  # delete_objects 1회 요청당 최대 key 수
+
+
+def enqueue_s3_deletions(keys):
+    S3ObjectDeletion.objects.bulk_create([S3ObjectDeletion(key=key) for key in keys])
+
+
+def reap_s3_deletions(batch_size=S3_DELETE_BATCH_SIZE):
+    """대기 중인 key 를 batch_size 개씩 삭제 후 (삭제 수, 실패 수) 반환 - 실패한 key 는 다음 실행 시 재시도"""
+    s3 = get_s3_client()
+    batch_size = min(batch_size, S3_DELETE_BATCH_SIZE)
+    queryset = S3ObjectDeletion.objects.select_for_update(skip_locked=True).filter(
+        attempts__lt=settings.S3_DELETION_MAX_ATTEMPTS
+    ).only('id', 'key', 'attempts').order_by('id')
+
+    deleted_count = 0
+    failed_count = 0
+    last_id = 0
+    while True:
+        # 배치 처리가 끝날 때까지 row lock 유지 (다른 프로세스는 다음 배치를 가져감)
+        with transaction.atomic():
+            pending = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not pending:
+                break
+            last_id = pending[-1].id
+
+            keys = list(dict.fromkeys(deletion.key for deletion in pending))  # 중복 key 제거 (순서 유지)
+            try:
+                response = s3.delete_objects(
+                    Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+                    Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+                )
+            except Exception as e:  # 요청 자체가 실패한 경우 (네트워크 등) -> 다음 실행 시 재시도
+                logger.error(f"S3 delete_objects failed: {e}")
+                break
+
+            errors = {error['Key']: error.get('Message') or error.get('Code')
+                      for error in response.get('Errors', [])}
+            succeeded = [deletion.id for deletion in pending if deletion.key not in errors]
+            S3ObjectDeletion.objects.filter(id__in=succeeded).delete()
+            mark_s3_objects([key for key in keys if key not in errors], exists=False)
+
+            failed = [deletion for deletion in pending if deletion.key in errors]
+            for deletion in failed:
+                deletion.attempts += 1
+                deletion.error_message = (errors[deletion.key] or '')[:500]
+            if failed:
+                S3ObjectDeletion.objects.bulk_update(failed, ['attempts', 'error_message'])
+
+        deleted_count += len(succeeded)
+        failed_count += len(failed)
+
+    return deleted_count, failed_count
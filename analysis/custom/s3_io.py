@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import botocore
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from django.conf import settings
+from django.db import connections
+
+from analysis.custom.metrics import s3_inflight_transfers, s3_io_queue_depth
+
+"""
+프로세스 단위 S3 I/O 서비스
+- boto3 클라이언트 / TransferManager / 작업 executor 를 프로세스당 1개만 생성 (lock 으로 최초 1회 초기화)
+- 요청마다 ThreadPoolExecutor 를 만들지 않고 submit() 으로 공용 executor(S3_IO_MAX_WORKERS) 사용
+- urllib3 연결 풀 크기 = TransferManager 동시 전송 수(max_concurrency) + executor 작업 수
+- S3 작업이 S3 객체 인덱스(DB)를 기록하므로 executor 스레드는 작업마다 자기 DB 연결을 닫음 (run_closing_connections)
+- gunicorn 등 fork 된 자식 프로세스에서는 부모의 클라이언트/스레드를 쓰지 않도록 초기화 (os.register_at_fork)
+"""
+
+# TransferConfig 설정 (TransferManager 는 프로세스 공용이므로 프로세스 전체의 최대 동시 전송 수)
+transfer_config = TransferConfig(
+    max_concurrency=settings.S3_TRANSFER_MAX_CONCURRENCY,  # 최대 동시 연결 수
+    use_threads=True
+)
+
+
+def run_closing_connections(fn, *args, **kwargs):
+    """작업 스레드에서 fn 실행 후 그 스레드의 DB 연결 정리 (요청 / 워커 루프 밖이라 Django 가 닫지 않음)"""
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+class S3IOService:
+    def __init__(self):
+        self._reset_state()
+
+    def _reset_state(self):
+        self._lock = threading.Lock()
+        self._client = None
+        self._transfer_manager = None
+        self._executor = None
+
+    def reset(self):
+        """클라이언트 재생성 (설정 변경 시) - 진행 중인 전송은 완료 후 종료"""
+        with self._lock:
+            transfer_manager = self._transfer_manager
+            self._client = None
+            self._transfer_manager = None
+        if transfer_manager is not None:
+            transfer_manager.shutdown()
+
+    def _after_fork_in_child(self):
+        # 부모 프로세스의 스레드는 자식에 없고 연결(소켓)은 공유되면 안 되므로 참조만 버리고 새로 생성
+        self._reset_state()
+
+    def get_client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    @staticmethod
+    def _create_client():
+        if settings.AWS_S3_LOCAL_ROOT:  # 로컬 파일시스템 S3 (오프라인 테스트/개발용)
+            from analysis.custom.local_s3 import LocalS3Client
+            return LocalS3Client(settings.AWS_S3_LOCAL_ROOT)
+
+        # Config 객체를 client 생성 시 직접 전달
+        boto_config = botocore.config.Config(
+            max_pool_connections=transfer_config.max_concurrency + settings.S3_IO_MAX_WORKERS,  # urllib3 최대 연결 풀
+            connect_timeout=5,
+            read_timeout=5,
+            retries={'max_attempts': 3}
+        )
+        return boto3.client(
+            's3',
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_S3_REGION_NAME,
+            config=boto_config  # 설정 적용
+        )
+
+    def _get_transfer_manager(self, client):
+        if self._transfer_manager is None:
+            with self._lock:
+                if self._transfer_manager is None:
+                    self._transfer_manager = create_transfer_manager(client, transfer_config)
+        return self._transfer_manager
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=settings.S3_IO_MAX_WORKERS,
+                                                        thread_name_prefix='s3-io')
+        return self._executor
+
+    def upload_fileobj(self, fileobj, key, content_type):
+        """공용 TransferManager 로 업로드 (완료될 때까지 대기)"""
+        client = self.get_client()
+        s3_inflight_transfers.inc()
+        try:
+            if isinstance(client, botocore.client.BaseClient):
+                self._get_transfer_manager(client).upload(
+                    fileobj, settings.AWS_STORAGE_BUCKET_NAME, key, extra_args={'ContentType': content_type}
+                ).result()
+            else:  # 로컬 S3 는 TransferManager 미지원
+                client.upload_fileobj(Fileobj=fileobj, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key,
+                                      ExtraArgs={'ContentType': content_type})
+        finally:
+            s3_inflight_transfers.dec()
+
+    def submit(self, fn, *args, **kwargs):
+        """S3 작업을 공용 executor 에서 실행 (대기 중인 작업 수는 s3_io_queue_depth 로 노출)"""
+        s3_io_queue_depth.inc()
+
+        def run():
+            s3_io_queue_depth.dec()
+            return run_closing_connections(fn, *args, **kwargs)
+
+        try:
+            return self._get_executor().submit(run)
+        except Exception:
+            s3_io_queue_depth.dec()
+            raise
+
+
+s3_io = S3IOService()
+os.register_at_fork(after_in_child=s3_io._after_fork_in_child)
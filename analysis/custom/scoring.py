@@ -0,0 +1,167 @@
+import numpy as np
+
+from analysis.custom.code_info import code_info_registry
+
+"""
+GaitResult 점수 / BodyResult 정상범위 판정 일괄 계산 (NumPy)
+- 입력: 필드별 값 배열 {field: [값, ...]} (None 은 측정값 없음으로 처리)
+- CodeInfo 기준값은 레지스트리에서 필드(code_id) 순서대로 읽어 (rows, fields) 행렬에 한 번에 적용
+- GaitResult.calculate_score / calculate_normal_ratio (1건) 도 이 함수로 계산하므로 결과가 동일
+
+기존 계산 방식과 동일하게 유지하는 부분
+- positive 방향 첫 구간의 상한은 caution_max (caution_min 이 아님)
+- 모든 필드의 가중치는 1 (velocity / stride_len 가중치 2 는 적용되지 않음)
+- 정상범위는 normal_min <= 값 <= normal_max (경계 포함)
+기준값이 잘못된 경우(0으로 나누기, 어느 구간에도 속하지 않는 값 등) 기존 구현은 예외가 발생했으나 여기서는 점수 없음(None)
+"""
+
+GAIT_SCORE_FIELDS = [
+    'velocity',
+    'stride_len_l',
+    'stride_len_r',
+    'swing_perc_l',
+    'swing_perc_r',
+    'stance_perc_l',
+    'stance_perc_r',
+    'd_supp_perc_l',
+    'd_supp_perc_r',
+]
+
+BODY_NORMAL_FIELDS = [
+    'face_level_angle',
+    'shoulder_level_angle',
+    'hip_level_angle',
+    'leg_length_ratio',
+    'left_leg_alignment_angle',
+    'right_leg_alignment_angle',
+    'left_back_knee_angle',
+    'right_back_knee_angle',
+    'forward_head_angle',
+    'scoliosis_shoulder_ratio',
+    'scoliosis_hip_ratio',
+]
+
+# 정상범위 항목 수가 이 값 이하(7/11 이하)이면 주의 대상 (엑셀 강조, 대시보드 집계)
+LOW_NORMAL_COUNT = 7
+
+THRESHOLD_FIELDS = ['min_value', 'max_value', 'normal_min_value', 'normal_max_value',
+                    'caution_min_value', 'caution_max_value']
+
+
+def to_matrix(columns, fields):
+    """{field: 값 목록} -> (rows, fields) float 행렬 (None -> nan)"""
+    return np.column_stack([np.asarray(columns[field], dtype=float) for field in fields])
+
+
+def to_optional(value):  # 배열 원소 -> float (nan 은 None)
+    return None if np.isnan(value) else float(value)
+
+
+def get_thresholds(code_ids):
+    """code_id 순서대로 기준값 배열 {'min_value': (fields,), ..., 'direction': [...], 'code_name': [...]} 반환"""
+    code_infos = [code_info_registry.get(code_id) for code_id in code_ids]
+    thresholds = {
+        name: np.array([np.nan if code_info is None or getattr(code_info, name) is None
+                        else getattr(code_info, name) for code_info in code_infos], dtype=float)
+        for name in THRESHOLD_FIELDS
+    }
+    thresholds['direction'] = np.array([code_info.direction if code_info else None for code_info in code_infos])
+    thresholds['code_name'] = [code_info.code_name if code_info else None for code_info in code_infos]
+    return thresholds
+
+
+def _ratio(numerator, denominator):  # 0으로 나누는 경우 nan
+    return np.divide(numerator, denominator, out=np.full(np.broadcast(numerator, denominator).shape, np.nan),
+                     where=denominator != 0)
+
+
+def normalized_scores(values, thresholds):
+    """(rows, fields) 값 행렬의 필드별 정규화 점수 (0~1, 계산 불가 시 nan)"""
+    values = np.asarray(values, dtype=float)
+    min_value, max_value = thresholds['min_value'], thresholds['max_value']
+    normal_min, normal_max = thresholds['normal_min_value'], thresholds['normal_max_value']
+    caution_min, caution_max = thresholds['caution_min_value'], thresholds['caution_max_value']
+    direction = thresholds['direction']
+
+    # Clipping: value가 min_value와 max_value 범위를 벗어나면 값을 제한
+    value = np.where(values < min_value, min_value, np.where(values > max_value, max_value, values))
+
+    with np.errstate(invalid='ignore'):
+        # 클수록 좋은 경우: value가 min_value에 가까우면 0, max_value에 가까우면 1
+        positive = np.select(
+            [(min_value <= value) & (value <= caution_max),
+             (caution_min <= value) & (value <= normal_min),
+             (normal_min <= value) & (value <= max_value)],
+            [_ratio(0.4 * (value - min_value), caution_min - min_value),
+             _ratio(0.3 * (value - caution_min), normal_min - caution_min) + 0.4,
+             _ratio(0.3 * (value - normal_min), max_value - normal_min) + 0.7],
+            default=np.nan
+        )
+        # 작을수록 좋은 경우: value가 max_value에 가까우면 0, min_value에 가까우면 1
+        negative = np.select(
+            [(min_value <= value) & (value <= normal_max),
+             (normal_max <= value) & (value <= caution_max),
+             (caution_max <= value) & (value <= max_value)],
+            [_ratio(-0.3 * (value - min_value), normal_max - min_value) + 1.0,
+             _ratio(-0.3 * (value - normal_max), caution_max - normal_max) + 0.7,
+             _ratio(-0.4 * (value - caution_max), max_value - caution_max) + 0.4],
+            default=np.nan
+        )
+
+    scores = np.where(direction == 'positive', positive, np.where(direction == 'negative', negative, np.nan))
+    # 측정값 또는 정상/주의 기준값이 없으면 점수 없음
+    scorable = ~np.isnan(values) & ~np.isnan(normal_min) & ~np.isnan(normal_max) \
+        & ~np.isnan(caution_min) & ~np.isnan(caution_max)
+    scores = np.where(scorable, scores, np.nan)
+
+    # score가 항상 0과 1 사이의 값이 되도록 보장
+    return np.clip(scores, 0, 1)
+
+
+def score_gait_batch(columns):
+    """
+    GaitResult 점수 일괄 계산
+    columns: {GAIT_SCORE_FIELDS 의 필드: 값 목록}
+    반환: (rows,) 점수 배열 (점수를 계산할 필드가 없으면 nan)
+    """
+    field_scores = normalized_scores(to_matrix(columns, GAIT_SCORE_FIELDS), get_thresholds(GAIT_SCORE_FIELDS))
+
+    # 필드 순서대로 누적 (기존 계산과 같은 순서로 더해 결과 값이 동일)
+    total_sum = np.zeros(field_scores.shape[0])
+    total_weight = np.zeros(field_scores.shape[0])
+    for field_score in field_scores.T:
+        scored = ~np.isnan(field_score)
+        total_sum = np.where(scored, total_sum + field_score, total_sum)
+        total_weight += scored
+
+    score_info = code_info_registry.get('score')
+    score_max_value = np.nan if score_info is None or score_info.max_value is None else score_info.max_value
+    with np.errstate(invalid='ignore'):
+        return np.where(total_weight > 0, total_sum / np.maximum(total_weight, 1) * score_max_value, np.nan)
+
+
+def check_body_normal_batch(columns):
+    """
+    BodyResult 정상범위 일괄 판정
+    columns: {BODY_NORMAL_FIELDS 의 필드: 값 목록}
+    반환: (checked, normal) - 모두 (rows, fields) bool 행렬
+      checked: 측정값과 CodeInfo 가 있어 판정한 항목, normal: 정상범위 내 항목 (나머지 checked 항목은 '주의')
+    """
+    values = to_matrix(columns, BODY_NORMAL_FIELDS)
+    thresholds = get_thresholds(BODY_NORMAL_FIELDS)
+    registered = np.array([code_name is not None for code_name in thresholds['code_name']])
+
+    checked = ~np.isnan(values) & registered
+    with np.errstate(invalid='ignore'):
+        normal = checked & (thresholds['normal_min_value'] <= values) & (values <= thresholds['normal_max_value'])
+    return checked, normal
+
+
+def summarize_body_normal_batch(columns):
+    """
+    BodyResult 에 저장할 정상범위 요약 (normal_count, caution_mask) 일괄 계산 - 모두 (rows,) int 배열
+      normal_count: 정상범위 항목 수, caution_mask: 주의 항목 비트 (BODY_NORMAL_FIELDS 순서, i 번째 비트 = 1 이면 주의)
+    """
+    checked, normal = check_body_normal_batch(columns)
+    bits = 1 << np.arange(len(BODY_NORMAL_FIELDS))
+    return normal.sum(axis=1), ((checked & ~normal) * bits).sum(axis=1)
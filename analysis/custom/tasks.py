@@ -1,5 +1,9 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from analysis.models import SessionInfo
+from analysis.custom.s3_deletion import reap_s3_deletions
+from analysis.custom.export_jobs import expire_export_jobs
+from analysis.custom.normal_summary import refresh_missing_normal_summaries
+from analysis.helpers import purge_s3_object_index
 from django.utils import timezone
 from datetime import timedelta
 import atexit
@@ -62,13 +66,66 @@ def delete_old_sessions():
         logger.error(f"Error while deleting old sessions: {e}")
         # print(f"Error while deleting old sessions: {e}")
 
+def reap_deleted_s3_objects():
+    """
+    삭제된 BodyResult 의 이미지(S3 객체 삭제 대기열)를 일괄 삭제
+    """
+    try:
+        deleted_count, failed_count = reap_s3_deletions()
+        if deleted_count or failed_count:
+            logger.info(f"{deleted_count} S3 objects deleted ({failed_count} failed).")
+    except Exception as e:
+        logger.error(f"Error while deleting S3 objects: {e}")
+
+def expire_report_exports():
+    """
+    보관 시간이 지난 결과 조회 엑셀 파일을 S3 객체 삭제 대기열에 등록
+    """
+    try:
+        expired_count = expire_export_jobs()
+        if expired_count:
+            logger.info(f"{expired_count} report exports expired.")
+    except Exception as e:
+        logger.error(f"Error while expiring report exports: {e}")
+
+def purge_expired_s3_index():
+    """
+    만료된 S3 객체 존재 여부 인덱스 항목 삭제
+    """
+    try:
+        deleted_count = purge_s3_object_index()
+        if deleted_count:
+            logger.info(f"{deleted_count} expired S3 index entries deleted.")
+    except Exception as e:
+        logger.error(f"Error while purging S3 index: {e}")
+
+def refresh_normal_summaries():
+    """
+    CodeInfo 정상범위 변경으로 비워진 BodyResult 정상범위 요약을 다시 계산 (모두 채워지면 기관 통계 재계산)
+    """
+    try:
+        refreshed_count = refresh_missing_normal_summaries()
+        if refreshed_count:
+            logger.info(f"{refreshed_count} body result normal summaries refreshed.")
+    except Exception as e:
+        logger.error(f"Error while refreshing normal summaries: {e}")
+
 # 작업 등록
 scheduler = BackgroundScheduler()
 
 # 매일 00:00에 실행
 # 동일한 작업이 이미 등록되어 있다면 대체
 scheduler.add_job(delete_old_sessions, 'cron', hour=00, minute=00, replace_existing=True)
-scheduler.start()
+# S3_DELETION_INTERVAL_MINUTES 마다 S3 객체 삭제 대기열 처리
+scheduler.add_job(reap_deleted_s3_objects, 'interval', minutes=settings.S3_DELETION_INTERVAL_MINUTES,
+                  replace_existing=True)
+# 매시간 보관 시간이 지난 엑셀 다운로드 파일 정리
+scheduler.add_job(expire_report_exports, 'interval', hours=1, replace_existing=True)
+# 매시간 만료된 S3 객체 존재 여부 인덱스 정리
+scheduler.add_job(purge_expired_s3_index, 'interval', hours=1, replace_existing=True)
+# 10분마다 비워진 정상범위 요약 재계산 (CodeInfo 정상범위 변경 후)
+scheduler.add_job(refresh_normal_summaries, 'interval', minutes=10, replace_existing=True)
+# 실행은 AnalysisConfig.ready() 에서 (SCHEDULER_DEFAULT 인 프로세스만)
 
 # 서버 종료 시 스케줄러 중지 및 로그 출력
 def stop_scheduler():
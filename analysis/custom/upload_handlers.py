@@ -0,0 +1,36 @@
+import tempfile
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+
+"""
+multipart 업로드 파일을 SpooledTemporaryFile 로 받는 업로드 핸들러
+- FILE_UPLOAD_MAX_MEMORY_SIZE 까지만 메모리에 두고 초과분은 임시 파일로 전환
+- 체형 결과 이미지 multipart 업로드 API 에서 사용 (요청 전체를 메모리에 올리지 않음)
+"""
+
+
+class SpooledUploadedFile(UploadedFile):
+    def __init__(self, name, content_type, charset, content_type_extra=None):
+        file = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+                                             dir=settings.FILE_UPLOAD_TEMP_DIR)
+        super().__init__(file, name, content_type, 0, charset, content_type_extra)
+
+
+class SpooledFileUploadHandler(FileUploadHandler):
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = SpooledUploadedFile(self.file_name, self.content_type, self.charset, self.content_type_extra)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
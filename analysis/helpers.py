@@ -6,60 +6,170 @@ from datetime import datetime, timedelta, timezone
 
 import base64
 from io import BytesIO
+import os
 import re
+import struct
+import zlib
 from PIL import Image
-import boto3
 from django.conf import settings
 import requests
-from .models import BodyResult, CodeInfo
+from django.core.cache import cache
+from .models import BodyResult, S3ObjectIndex
+from django.db import transaction
 from django.db.models import Q
-from openpyxl import load_workbook
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import PatternFill
 import pandas as pd
-import io as excel_io
 import botocore
-from boto3.s3.transfer import TransferConfig
-
-# 전역 변수 S3 클라이언트 생성
-s3_client = None
-
-# TransferConfig 설정
-transfer_config = TransferConfig(
-    max_concurrency=20,  # 최대 동시 연결 수
-    use_threads=True
-)
+from analysis.custom.s3_io import s3_io
+from analysis.custom.code_info import code_info_registry
+from analysis.custom.scoring import BODY_NORMAL_FIELDS
 
 
-# boto3 반환 함수
+# boto3 반환 함수 (프로세스 공용 클라이언트)
 def get_s3_client():
-    global s3_client
-    if s3_client is None:
-        # Config 객체를 client 생성 시 직접 전달
-        boto_config = botocore.config.Config(
-            max_pool_connections=20,  # urllib3 최대 연결 풀 설정
-            connect_timeout=5,
-            read_timeout=5,
-            retries={'max_attempts': 3}
-        )
-
-        s3_client = boto3.client(
-            's3',
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION_NAME,
-            config=boto_config  # 설정 적용
-        )
-    return s3_client
+    return s3_io.get_client()
 
 
 def generate_file_key(*args):  # ('front' + created_dt.png)
     return '-'.join(*args)
 
 
+def generate_file_name(file_keys):  # 기존 S3 객체 key (front-<created_dt>.png)
+    return generate_file_key(file_keys) + '.png'
+
+
+def generate_body_image_key(body_result, pose_type):
+    """
+    체형 결과 이미지 S3 key: <yyyy>/<mm>/<user_id>/<body_result_id>-<front|side>.png
+    - BodyResult id 를 포함하므로 같은 시각에 생성된 결과끼리 충돌 X
+    - 날짜/회원 단위 prefix 로 분산 (S3 prefix 별 요청 한도, lifecycle 규칙 적용 단위)
+    """
+    return f'{body_result.created_dt:%Y/%m}/{body_result.user_id}/{body_result.id}-{pose_type}.png'
+
+
+def is_legacy_body_image_key(file_name):  # 기존(created_dt 기반, prefix 없음) key 여부
+    return '/' not in file_name
+
+
+""" S3 객체 존재 여부 인덱스 (presigned URL로 이미지를 다운로드 해서 존재 여부를 확인하지 않기 위함) """
+S3_OBJECT_INDEX_BATCH_SIZE = 1000  # 인덱스 조회 / 기록 시 IN 절 / bulk_create 최대 개수
+
+
+def mark_s3_objects(file_names, exists=True):
+    """업로드/삭제된 S3 객체의 존재 여부를 인덱스(S3ObjectIndex)에 기록 (이미 있는 key 는 갱신)"""
+    timeout = settings.S3_OBJECT_INDEX_TTL if exists else settings.S3_OBJECT_INDEX_MISS_TTL
+    expires_dt = datetime.now() + timedelta(seconds=timeout)
+    # 같은 key 가 한 INSERT 에 두 번 들어가면 ON CONFLICT DO UPDATE 가 실패하므로 중복 제거
+    S3ObjectIndex.objects.bulk_create(
+        [S3ObjectIndex(key=file_name, exists=exists, expires_dt=expires_dt) for file_name in dict.fromkeys(file_names)],
+        batch_size=S3_OBJECT_INDEX_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['key'],
+        update_fields=['exists', 'expires_dt'],
+    )
+
+
+def _get_s3_index(file_names):
+    """인덱스에서 만료되지 않은 항목만 {file_name: bool} 로 반환"""
+    now = datetime.now()
+    indexed = {}
+    for start in range(0, len(file_names), S3_OBJECT_INDEX_BATCH_SIZE):
+        batch = file_names[start:start + S3_OBJECT_INDEX_BATCH_SIZE]
+        indexed.update(S3ObjectIndex.objects.filter(key__in=batch, expires_dt__gt=now).values_list('key', 'exists'))
+    return indexed
+
+
+def s3_objects_exist(file_names):
+    """
+    S3 객체 존재 여부를 {file_name: bool} 형태로 반환
+    인덱스에 없는 객체만 head_object(이미지 다운로드 X)로 확인 후 인덱스에 기록
+    """
+    indexed = _get_s3_index(list(dict.fromkeys(file_names)))
+    result = {}
+    found, missing = [], []
+    for file_name in file_names:
+        if file_name in indexed:
+            result[file_name] = indexed[file_name]
+            continue
+        if file_name in result:
+            continue
+
+        try:
+            get_s3_client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_name)
+            result[file_name] = True
+            found.append(file_name)
+        except botocore.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ['404', 'NoSuchKey', 'NotFound']:
+                raise
+            result[file_name] = False
+            missing.append(file_name)
+
+    if found:
+        mark_s3_objects(found, exists=True)
+    if missing:
+        mark_s3_objects(missing, exists=False)
+    return result
+
+
+def purge_s3_object_index(now=None):
+    """만료된 인덱스 항목을 배치 단위로 삭제 후 삭제 건수 반환 (다른 프로세스가 삭제 중인 항목은 건너뜀)"""
+    now = now or datetime.now()
+    deleted_count = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                S3ObjectIndex.objects.select_for_update(skip_locked=True)
+                .filter(expires_dt__lte=now).values_list('id', flat=True)[:S3_OBJECT_INDEX_BATCH_SIZE]
+            )
+            if not ids:
+                return deleted_count
+            S3ObjectIndex.objects.filter(id__in=ids).delete()
+        deleted_count += len(ids)
+
+
+def s3_object_exists(file_name):
+    return s3_objects_exist([file_name])[file_name]
+
+
+def iter_s3_object_pages(prefix='', page_size=1000):
+    """list_objects_v2 로 버킷을 페이지 단위로 스캔 (페이지별 객체 목록 [{'Key', 'LastModified', ...}] 반환)"""
+    s3 = get_s3_client()
+    params = {'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Prefix': prefix, 'MaxKeys': page_size}
+    while True:
+        response = s3.list_objects_v2(**params)
+        yield response.get('Contents', [])
+
+        if not response.get('IsTruncated'):
+            break
+        params['ContinuationToken'] = response['NextContinuationToken']
+
+
+def backfill_s3_object_index(prefix='', page_size=1000):
+    """list_objects_v2 로 버킷을 페이지 단위로 스캔하여 인덱스를 채움 (반환값: 인덱싱된 객체 수)"""
+    indexed_count = 0
+    for objects in iter_s3_object_pages(prefix=prefix, page_size=page_size):
+        file_names = [obj['Key'] for obj in objects]
+        if file_names:
+            mark_s3_objects(file_names, exists=True)
+            indexed_count += len(file_names)
+    return indexed_count
+
+
+def is_file_like(image_data):  # multipart 업로드 파일 / 스풀 파일 등 read() 가능한 객체
+    return hasattr(image_data, 'read')
+
+
 def verify_image(byte_string):
-    """이미지 검증 함수"""
+    """
+    이미지 검증 함수
+    - base64 문자열: 디코딩한 bytes 반환
+    - 파일 객체(multipart 업로드): 메모리로 읽지 않고 검증 후 처음 위치로 되돌려 그대로 반환
+    """
     try:
+        if is_file_like(byte_string):
+            Image.open(byte_string).verify()
+            byte_string.seek(0)
+            return byte_string
+
         # byte string을 이미지로 변환
         image_data = base64.b64decode(byte_string)
         image = Image.open(BytesIO(image_data))
@@ -69,22 +179,54 @@ def verify_image(byte_string):
         raise ValueError("Image verification failed") from e
 
 
-def upload_image_to_s3(image_data, file_keys):
-    """검증된 이미지를 S3에 업로드하는 함수"""
-    file_name = generate_file_key(file_keys) + '.png'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
 
-    # AWS S3 클라이언트 생성
-    s3 = get_s3_client()
 
-    try:
-        image = Image.open(BytesIO(image_data))  # 검증된 이미지 데이터로 이미지 객체 생성
+def sniff_png(image_data):
+    """
+    PNG 시그니처와 IHDR 헤더만 확인 (디코딩 X)
+    정상적인 PNG 이면 (width, height), 아니면 None 반환
+    """
+    # 시그니처(8) + IHDR 길이(4) + 'IHDR'(4) + IHDR 데이터(13) + CRC(4)
+    if len(image_data) < 33 or image_data[:8] != PNG_SIGNATURE or image_data[12:16] != b'IHDR':
+        return None
+    if struct.unpack('>I', image_data[8:12])[0] != 13:
+        return None
+    if zlib.crc32(image_data[12:29]) != struct.unpack('>I', image_data[29:33])[0]:
+        return None
 
-        # 이미지를 BytesIO에 저장
-        buffer = BytesIO()
-        image.save(buffer, format='PNG')
-        buffer.seek(0)
-    except Exception as e:  # 이미지 처리 중 실패
-        raise ValueError("Image processing failed, please check the image file format.") from e
+    width, height, bit_depth, color_type = struct.unpack('>IIBB', image_data[16:26])
+    if width == 0 or height == 0 or bit_depth not in (1, 2, 4, 8, 16) or color_type not in (0, 2, 3, 4, 6):
+        return None
+    return width, height
+
+
+def upload_image_to_s3(image_data, file_keys):
+    """검증된 이미지를 S3에 업로드하는 함수"""
+    file_name = _to_file_name(file_keys)
+
+    if is_file_like(image_data):
+        header = image_data.read(33)
+        image_data.seek(0)
+    else:
+        header = image_data
+
+    if sniff_png(header):
+        # 이미 PNG 인 경우 디코딩/재인코딩 없이 원본 그대로 업로드
+        # - 파일 객체는 TransferManager 가 청크 단위로 읽어 전송
+        # - bytes 로 생성한 BytesIO 는 쓰기 전까지 원본 버퍼를 공유하므로 복사 X
+        buffer = image_data if is_file_like(image_data) else BytesIO(image_data)
+    else:
+        try:
+            # 검증된 이미지 데이터로 이미지 객체 생성
+            image = Image.open(image_data if is_file_like(image_data) else BytesIO(image_data))
+
+            # PNG 가 아닌 경우에만 PNG 로 변환하여 BytesIO에 저장
+            buffer = BytesIO()
+            image.save(buffer, format='PNG')
+            buffer.seek(0)
+        except Exception as e:  # 이미지 처리 중 실패
+            raise ValueError("Image processing failed, please check the image file format.") from e
 
     # S3 버킷에 이미지 업로드
     try:
@@ -94,37 +236,203 @@ def upload_image_to_s3(image_data, file_keys):
         #     Body=buffer,
         #     ContentType='image/png'
         # )
-        s3.upload_fileobj(
-            Fileobj=buffer,
-            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-            Key=file_name,
-            ExtraArgs={'ContentType': 'image/png'},  # ContentType 설정
-            Config=transfer_config
-        )
+        s3_io.upload_fileobj(buffer, file_name, content_type='image/png')  # 프로세스 공용 TransferManager 로 업로드
     except Exception as e:  # AWS S3 이미지 업로드 실패
         raise Exception("Failed to upload image to S3") from e
 
+    mark_s3_objects([file_name], exists=True)  # 업로드 시점에 존재 여부 인덱스 갱신
+    return file_name
+
+
+def _presigned_url_cache_key(file_name, expiration):
+    return f'presigned_url:{expiration}:{file_name}'
+
+
+def _to_file_name(file_keys):  # S3 객체 key(str) 또는 file_keys(['front', created_dt]) 모두 허용
+    return file_keys if isinstance(file_keys, str) else generate_file_name(file_keys)
 
-def generate_presigned_url(file_keys, expiration=settings.AWS_PRESIGNED_EXPIRATION):
-    file_name = generate_file_key(file_keys) + '.png'
+
+def generate_presigned_urls(file_keys_list, expiration=settings.AWS_PRESIGNED_EXPIRATION):
+    """
+    여러 객체의 presigned URL을 한 번에 반환 (file_keys_list 순서 유지)
+    서명된 URL은 만료 시간의 AWS_PRESIGNED_REUSE_FRACTION 만큼 캐시에서 재사용 -> 재서명 및 DB 갱신 생략
+    """
+    file_names = [_to_file_name(file_keys) for file_keys in file_keys_list]
+    cache_keys = {file_name: _presigned_url_cache_key(file_name, expiration) for file_name in file_names}
+    cached = cache.get_many(list(cache_keys.values()))
 
     # AWS S3 클라이언트 생성
     s3 = get_s3_client()
 
-    # presigned URL 생성
-    try:
-        presigned_url = s3.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
-                'Key': file_name
-            },
-            ExpiresIn=expiration  # URL 만료 시간 (초 단위)
-        )
-        return presigned_url
-    except Exception as e:
-        print(f"Error generating presigned URL: {e}")
+    urls = {}
+    signed = {}
+    for file_name in file_names:
+        if cache_keys[file_name] in cached:
+            urls[file_name] = cached[cache_keys[file_name]]
+            continue
+
+        # presigned URL 생성
+        try:
+            urls[file_name] = s3.generate_presigned_url(
+                'get_object',
+                Params={
+                    'Bucket': settings.AWS_STORAGE_BUCKET_NAME,
+                    'Key': file_name
+                },
+                ExpiresIn=expiration  # URL 만료 시간 (초 단위)
+            )
+            signed[cache_keys[file_name]] = urls[file_name]
+        except Exception as e:
+            print(f"Error generating presigned URL: {e}")
+            urls[file_name] = None
+
+    reuse_timeout = int(expiration * settings.AWS_PRESIGNED_REUSE_FRACTION)
+    if signed and reuse_timeout > 0:
+        cache.set_many(signed, timeout=reuse_timeout)
+
+    return [urls[file_name] for file_name in file_names]
+
+
+def generate_presigned_url(file_keys, expiration=settings.AWS_PRESIGNED_EXPIRATION):
+    return generate_presigned_urls([file_keys], expiration=expiration)[0]
+
+
+def get_legacy_body_image_keys(body_result):  # 기존 created_dt 기반 (front, side) key
+    created_dt = body_result.created_dt.strftime('%Y%m%dT%H%M%S%f')
+    return generate_file_name(['front', created_dt]), generate_file_name(['side', created_dt])
+
+
+def get_body_image_keys(body_result):
+    """
+    BodyResult의 (front, side) S3 객체 key 반환
+    - 저장된 key 를 그대로 사용 (신규 <yyyy>/<mm>/<user_id>/<id>-front.png, 이전 전 front-<created_dt>.png 모두 가능)
+    - key가 저장되지 않은 기존 데이터는 created_dt 기반 key 사용
+    """
+    legacy_front_key, legacy_side_key = get_legacy_body_image_keys(body_result)
+    return body_result.image_front_key or legacy_front_key, body_result.image_side_key or legacy_side_key
+
+
+def copy_s3_object(source_key, target_key):
+    """버킷 내 객체 복사 (서버 측 복사, 다운로드 X)"""
+    s3 = get_s3_client()
+    s3.copy_object(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=target_key,
+        CopySource={'Bucket': settings.AWS_STORAGE_BUCKET_NAME, 'Key': source_key},
+    )
+    mark_s3_objects([target_key], exists=True)
+
+
+def get_variant_key(file_name, variant):
+    """원본 S3 key 에서 파생 이미지 key 생성 (2024/01/5/12-front.png -> 2024/01/5/12-front.thumb.webp)"""
+    root, _ = os.path.splitext(file_name)
+    return f'{root}.{variant}.webp'
+
+
+# 체형 결과 이미지 key 형식 (원본 .png / 파생 이미지 .<이름>.webp)
+# - 신규: <yyyy>/<mm>/<user_id>/<body_result_id>-<front|side>
+# - 기존: <front|side>-<created_dt>
+BODY_IMAGE_KEY_PATTERN = re.compile(
+    r'^(\d{4}/\d{2}/\d+/\d+-(front|side)|(front|side)-\d{8}T\d{12})(\.png|\.\w+\.webp)$'
+)
+
+
+def is_body_image_key(file_name):
+    return BODY_IMAGE_KEY_PATTERN.match(file_name) is not None
+
+
+def get_image_all_keys(file_name):
+    """원본 S3 key 와 파생 이미지 key 목록"""
+    return [file_name] + [get_variant_key(file_name, variant) for variant in settings.BODY_IMAGE_VARIANTS]
+
+
+def get_body_image_all_keys(body_result, include_legacy=False):
+    """
+    BodyResult 에 연결된 모든 S3 객체 key (원본 + 파생 이미지)
+    include_legacy: 신규 key 로 이전된 경우 이전 전 created_dt 기반 key 도 포함 (삭제 시 사용)
+    """
+    file_names = list(get_body_image_keys(body_result))
+    if include_legacy:
+        file_names += [key for key in get_legacy_body_image_keys(body_result) if key not in file_names]
+
+    return [key for file_name in file_names for key in get_image_all_keys(file_name)]
+
+
+def create_image_variants(file_name, image_data=None):
+    """
+    원본 이미지로 BODY_IMAGE_VARIANTS 크기의 WebP 파생 이미지를 만들어 업로드 후 key 목록 반환
+    image_data(bytes 또는 파일 객체)가 없으면 S3 에서 원본을 내려받아 사용
+    """
+    s3 = get_s3_client()
+    if image_data is None:
+        image_data = s3.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_name)['Body'].read()
+    elif is_file_like(image_data):
+        image_data.seek(0)
+
+    image = Image.open(image_data if is_file_like(image_data) else BytesIO(image_data))
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGB')
+
+    # 큰 사이즈부터 순서대로 축소 (작은 파생 이미지는 직전 결과에서 축소하여 리샘플링 비용 절감)
+    variant_keys = []
+    for variant, max_size in sorted(settings.BODY_IMAGE_VARIANTS.items(), key=lambda item: -item[1]):
+        image = image.copy()
+        image.thumbnail((max_size, max_size))  # 비율 유지, 원본보다 크게 하지 않음
+
+        buffer = BytesIO()
+        image.save(buffer, format='WEBP', quality=settings.BODY_IMAGE_VARIANT_QUALITY)
+        buffer.seek(0)
+
+        variant_key = get_variant_key(file_name, variant)
+        s3_io.upload_fileobj(buffer, variant_key, content_type='image/webp')
+        variant_keys.append(variant_key)
+
+    mark_s3_objects(variant_keys, exists=True)
+    return variant_keys
+
+
+def select_image_variant(width):
+    """표시 너비(px)를 덮는 가장 작은 파생 이미지 이름 반환 (없으면 None -> 원본 사용)"""
+    if not width:
         return None
+    for variant, max_size in sorted(settings.BODY_IMAGE_VARIANTS.items(), key=lambda item: item[1]):
+        if max_size >= width:
+            return variant
+    return None
+
+
+def get_body_image_variant_urls(body_result, width):
+    """
+    표시 너비에 맞는 (front, side) 이미지 presigned URL 반환
+    파생 이미지가 아직 없으면(생성 전 / 기존 데이터) 원본 PNG URL 반환
+    """
+    file_names = get_body_image_keys(body_result)
+    variant = select_image_variant(width)
+    if variant is None:
+        return generate_presigned_urls(file_names)
+
+    variant_keys = [get_variant_key(file_name, variant) for file_name in file_names]
+    exists_map = s3_objects_exist(variant_keys)
+    return generate_presigned_urls([
+        variant_key if exists_map[variant_key] else file_name
+        for variant_key, file_name in zip(variant_keys, file_names)
+    ])
+
+
+def get_body_image_urls(body_results):
+    """BodyResult 목록의 이미지 presigned URL을 {id: (front_url, side_url)} 로 반환 (S3에 없는 이미지는 None)"""
+    keys_map = {body_result.id: get_body_image_keys(body_result) for body_result in body_results}
+    file_names = [file_name for keys in keys_map.values() for file_name in keys]
+
+    # S3 객체 존재 여부는 인덱스에서 한 번에 조회 (이미지 다운로드 X)
+    exists_map = s3_objects_exist(file_names)
+    existing = [file_name for file_name in file_names if exists_map[file_name]]
+    url_map = dict(zip(existing, generate_presigned_urls(existing)))
+
+    return {
+        body_result_id: tuple(url_map.get(file_name) for file_name in keys)
+        for body_result_id, keys in keys_map.items()
+    }
 
 
 def parse_userinfo(userinfo_obj):
@@ -207,145 +515,19 @@ def extract_digits(text):
     return re.search(r'\d+', text).group()
 
 
-""" CodeInfo는 캐싱처리 """
-from django.core.cache import cache
-from functools import lru_cache
-
-
-### CodeInfo (DB의 BodyResult 값에 대한 정보) 반환 함수
-@lru_cache(maxsize=None)
-def get_code_info_dict():
-    code_infos = CodeInfo.objects.all()
-    return {
-        code_info.code_id: {
-            'min': code_info.normal_min_value,
-            'max': code_info.normal_max_value,
-            'code_name': code_info.code_name
-        }
-        for code_info in code_infos
-    }
-
-
-### 정상범위 비율 계산 함수
+### 정상범위 비율 계산 함수 (저장된 normal_count / caution_mask 사용, 없으면 일괄 판정 엔진으로 1건 계산)
 def calculate_normal_ratio(body_result):
-    fields_to_check = [
-        'face_level_angle',
-        'shoulder_level_angle',
-        'hip_level_angle',
-        'leg_length_ratio',
-        'left_leg_alignment_angle',
-        'right_leg_alignment_angle',
-        'left_back_knee_angle',
-        'right_back_knee_angle',
-        'forward_head_angle',
-        'scoliosis_shoulder_ratio',
-        'scoliosis_hip_ratio'
-    ]
-
-    code_info_dict = get_code_info_dict()
-    true_count = 0
-    status_results = {}
+    if body_result.normal_count is None:
+        body_result.update_normal_summary()
 
-    for field in fields_to_check:
-        value = getattr(body_result, field)
-        if value is not None and field in code_info_dict:
-            normal_range = code_info_dict[field]
-            is_normal = normal_range['min'] <= value <= normal_range['max']
-            if is_normal:
-                true_count += 1
+    status_results = {}
+    for i, field in enumerate(BODY_NORMAL_FIELDS):
+        code_info = code_info_registry.get(field)
+        if getattr(body_result, field) is not None and code_info is not None:
             # CodeInfo의 code_name을 키로 사용하여 상태 저장
-            status_results[normal_range['code_name']] = '' if is_normal else '주의'
-
-    return f"{true_count}/{len(fields_to_check)}", status_results
-
-
-def create_excel_report(df, user_type, code_names):
-    # 기존 엑셀 파일 생성 코드
-    excel_buffer = excel_io.BytesIO()
-    df.to_excel(excel_buffer, index=False, sheet_name='데이터')
-
-    workbook = load_workbook(excel_buffer)
-    worksheet = workbook['데이터']
-
-    # 기존 스타일링 적용
-    adjust_column_widths(worksheet)
-    worksheet.auto_filter.ref = worksheet.dimensions
-    apply_normal_range_highlighting(worksheet)
-
-    # 통계 시트 추가
-    add_summary_sheet(workbook, df, code_names)
-
-    return workbook
-
-
-# 엑셀 파일의 열 폭 조정 함수
-def adjust_column_widths(worksheet):
-    for column in worksheet.columns:  # '검사일' 열에 대한 폭 조정
-        column_letter = get_column_letter(column[0].column)
-        if worksheet[f"{column_letter}1"].value == "검사일":
-            max_length = max(len(str(cell.value or "")) for cell in column)
-            worksheet.column_dimensions[column_letter].width = max_length + 2
-
-    # worksheet의 A 열이 '부서명' 이면 F-P 열까지의 폭을 15로 설정
-    if worksheet['A1'].value == '부서명':  # 기관 조건
-        for col_idx in range(ord('F') - ord('A') + 1, ord('P') - ord('A') + 2):
-            column_letter = get_column_letter(col_idx)
-            worksheet.column_dimensions[column_letter].width = 15
-        return
-
-        # 학교 조건
-    for col_idx in range(ord('H') - ord('A') + 1, ord('R') - ord('A') + 2):
-        column_letter = get_column_letter(col_idx)
-        worksheet.column_dimensions[column_letter].width = 15
-
-
-# 정상범위가 7/11 이하 일 경우 엑셀의 셀 색상 변경 함수
-def apply_normal_range_highlighting(worksheet):
-    highlight_fill = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
-
-    for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
-        for cell in row:
-            if cell.value and '정상범위' in str(worksheet.cell(row=1, column=cell.column).value):
-                try:
-                    numerator, denominator = map(int, str(cell.value).split("/"))
-                    if numerator / denominator <= 7 / 11:  # 7/11 이하일 경우 색상 변경 -> 주의를 시각적으로 나타내기 위함
-                        cell.fill = highlight_fill
-                except:
-                    pass
-
-
-# 통계 엑셀 시트 생성 함수
-def add_summary_sheet(workbook, df, code_names):
-    # 새로운 시트 생성
-    summary_sheet = workbook.create_sheet("통계", 0)
-
-    # 총 인원수와 검사 받은 인원수 계산
-    total_count = len(df)
-    examined_count = len(df[df['검사결과'] == 'O'])
-
-    # 각 code별 주의 인원수 계산
-    warning_counts = {}
-    for code in code_names:
-        warning_counts[code] = len(df[df[code] == '주의'])
-
-    # 데이터 추가
-    summary_sheet['A1'] = '항목'
-    summary_sheet['B1'] = '인원수'
-
-    summary_sheet['A2'] = '총 인원수'
-    summary_sheet['B2'] = total_count
-
-    summary_sheet['A3'] = '검사를 받은 인원수'
-    summary_sheet['B3'] = examined_count
-
-    # code별 주의 인원수 추가
-    for idx, (code, count) in enumerate(warning_counts.items(), start=4):
-        summary_sheet[f'A{idx}'] = f'{code} 주의 인원수'
-        summary_sheet[f'B{idx}'] = count
+            status_results[code_info.code_name] = '주의' if body_result.caution_mask >> i & 1 else ''
 
-    # 열 너비 조정
-    summary_sheet.column_dimensions['A'].width = 25
-    summary_sheet.column_dimensions['B'].width = 15
+    return f"{body_result.normal_count}/{len(BODY_NORMAL_FIELDS)}", status_results
 
 
 # 함수 실행 시간 측정 함수
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from analysis.helpers import backfill_s3_object_index, generate_file_name, s3_objects_exist
+from analysis.models import BodyResult
+
+
+class Command(BaseCommand):
+    help = 'S3 객체 key가 저장되지 않은 기존 BodyResult에 created_dt 기반 이미지 key를 채웁니다. (S3에 존재하는 이미지만)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000, help='한 번에 갱신할 row 수')
+        parser.add_argument('--skip-index', action='store_true', help='버킷 스캔(인덱스 backfill) 생략')
+
+    def handle(self, *args, **options):
+        if not options['skip_index']:  # 버킷 전체를 먼저 인덱싱 -> row 별 head_object 호출 방지
+            indexed_count = backfill_s3_object_index()
+            self.stdout.write(f'{indexed_count}개 객체 인덱싱 완료')
+
+        chunk_size = options['chunk_size']
+        queryset = BodyResult.objects.filter(
+            Q(image_front_key__isnull=True) | Q(image_side_key__isnull=True)
+        ).only('id', 'created_dt', 'image_front_key', 'image_side_key').order_by('id')
+
+        updated_count = 0
+        last_id = 0
+        while True:
+            body_results = list(queryset.filter(id__gt=last_id)[:chunk_size])
+            if not body_results:
+                break
+            last_id = body_results[-1].id
+
+            legacy_keys = {
+                body_result.id: [generate_file_name([pose_type, body_result.created_dt.strftime('%Y%m%dT%H%M%S%f')])
+                                 for pose_type in ('front', 'side')]
+                for body_result in body_results
+            }
+            exists_map = s3_objects_exist([key for keys in legacy_keys.values() for key in keys])
+
+            to_update = []
+            for body_result in body_results:
+                front_key, side_key = legacy_keys[body_result.id]
+                if body_result.image_front_key is None and exists_map[front_key]:
+                    body_result.image_front_key = front_key
+                    to_update.append(body_result)
+                if body_result.image_side_key is None and exists_map[side_key]:
+                    body_result.image_side_key = side_key
+                    if not to_update or to_update[-1] is not body_result:
+                        to_update.append(body_result)
+
+            if to_update:
+                BodyResult.objects.bulk_update(to_update, ['image_front_key', 'image_side_key'])
+            updated_count += len(to_update)
+
+        self.stdout.write(self.style.SUCCESS(f'{updated_count}개 BodyResult 이미지 key 저장 완료'))
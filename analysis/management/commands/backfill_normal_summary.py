@@ -0,0 +1,70 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from analysis.custom.checkpoint import read_checkpoint, write_checkpoint
+from analysis.custom.normal_summary import SUMMARY_ROW_FIELDS, summarize_changed
+from analysis.models import BodyResult
+
+
+class Command(BaseCommand):
+    help = ('BodyResult 의 정상범위 요약(normal_count, caution_mask)을 현재 CodeInfo 기준으로 계산하여 저장합니다. '
+            '기존 데이터 최초 채우기 / CodeInfo 정상범위 변경 후 재계산에 사용하며, 값이 바뀐 row 만 bulk_update 합니다. '
+            '(관리자 화면 등에서 CodeInfo 를 저장하면 요약을 비우고 스케줄러가 다시 채우므로, '
+            'queryset.update 등 시그널 없이 정상범위를 바꾼 경우에 실행하고 이후 rebuild_body_result_rollup 을 실행합니다) '
+            '--checkpoint 파일을 지정하면 chunk 마다 마지막 id 를 기록하고, 다시 실행 시 그 이후부터 이어서 처리합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='한 번에 계산/저장할 row 수')
+        parser.add_argument('--start-id', type=int, default=0, help='이 id 이후의 BodyResult 부터 처리')
+        parser.add_argument('--only-missing', action='store_true', help='요약이 없는(normal_count 가 null) row 만 처리')
+        parser.add_argument('--checkpoint', help='진행 위치(마지막 처리 id)를 기록할 파일 경로')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 변경될 row 수만 출력')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        checkpoint = options['checkpoint']
+        dry_run = options['dry_run']
+
+        last_id = options['start_id']
+        if checkpoint:
+            last_id = max(last_id, read_checkpoint(checkpoint))
+            if last_id:
+                self.stdout.write(f'id {last_id} 이후부터 이어서 처리')
+
+        queryset = BodyResult.objects.filter(id__gt=last_id)
+        if options['only_missing']:
+            queryset = queryset.filter(normal_count__isnull=True)
+
+        # PostgreSQL 에서 iterator() 는 서버 측 커서로 chunk_size 개씩 가져옴 (전체 row 를 메모리에 올리지 않음)
+        rows = queryset.order_by('id').values_list(*SUMMARY_ROW_FIELDS).iterator(chunk_size=chunk_size)
+
+        processed_count = 0
+        updated_count = 0
+        start = time.perf_counter()
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            changed = summarize_changed(chunk)
+            if changed and not dry_run:
+                BodyResult.objects.bulk_update(changed, ['normal_count', 'caution_mask'], batch_size=1000)
+
+            last_id = chunk[-1][0]
+            processed_count += len(chunk)
+            updated_count += len(changed)
+            if checkpoint and not dry_run:
+                write_checkpoint(checkpoint, last_id)
+
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'id {last_id} 까지 처리 ({processed_count}건, 변경 {updated_count}건, '
+                              f'{processed_count / elapsed:,.0f} rows/s)')
+
+        elapsed = time.perf_counter() - start
+        rate = processed_count / elapsed if elapsed else 0
+        action = '변경 대상' if dry_run else '요약 갱신'
+        self.stdout.write(self.style.SUCCESS(
+            f'{processed_count}개 BodyResult 정상범위 요약 계산 완료 '
+            f'({action} {updated_count}건, {elapsed:.1f}초, {rate:,.0f} rows/s)'
+        ))
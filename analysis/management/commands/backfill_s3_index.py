@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from analysis.helpers import backfill_s3_object_index
+
+
+class Command(BaseCommand):
+    help = 'S3 버킷을 list_objects_v2 로 스캔하여 객체 존재 여부 인덱스를 채웁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='', help='스캔할 객체 key prefix (기본값: 전체)')
+        parser.add_argument('--page-size', type=int, default=1000, help='list_objects_v2 페이지 크기 (최대 1000)')
+
+    def handle(self, *args, **options):
+        indexed_count = backfill_s3_object_index(prefix=options['prefix'], page_size=options['page_size'])
+        self.stdout.write(self.style.SUCCESS(f'{indexed_count}개 객체 인덱싱 완료'))
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from analysis.custom.s3_io import run_closing_connections
+from analysis.helpers import create_image_variants, get_body_image_keys, get_variant_key, s3_objects_exist
+from analysis.models import BodyResult
+
+
+class Command(BaseCommand):
+    help = '파생 이미지(WebP thumb/medium)가 없는 BodyResult 이미지에 대해 원본을 내려받아 파생 이미지를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 번에 조회할 row 수')
+        parser.add_argument('--workers', type=int, default=4, help='동시에 처리할 이미지 수')
+        parser.add_argument('--start-id', type=int, default=0, help='이 id 이후의 BodyResult 부터 처리 (재시작용)')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        queryset = BodyResult.objects.filter(
+            image_front_key__isnull=False, image_side_key__isnull=False
+        ).only('id', 'created_dt', 'image_front_key', 'image_side_key').order_by('id')
+
+        created_count = 0
+        failed_count = 0
+        last_id = options['start_id']
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                body_results = list(queryset.filter(id__gt=last_id)[:chunk_size])
+                if not body_results:
+                    break
+                last_id = body_results[-1].id
+
+                # 파생 이미지가 하나라도 없는 원본만 대상 (존재 여부는 인덱스에서 한 번에 조회)
+                file_names = [file_name for body_result in body_results
+                              for file_name in get_body_image_keys(body_result)]
+                variant_keys = {
+                    file_name: [get_variant_key(file_name, variant) for variant in settings.BODY_IMAGE_VARIANTS]
+                    for file_name in file_names
+                }
+                exists_map = s3_objects_exist([key for keys in variant_keys.values() for key in keys])
+                targets = [file_name for file_name, keys in variant_keys.items()
+                           if not all(exists_map[key] for key in keys)]
+
+                futures = {executor.submit(run_closing_connections, create_image_variants, file_name): file_name
+                           for file_name in targets}
+                for future, file_name in futures.items():
+                    try:
+                        future.result()
+                        created_count += 1
+                    except Exception as e:  # 원본이 없거나 손상된 경우 건너뜀
+                        failed_count += 1
+                        self.stderr.write(f'{file_name}: {e}')
+
+                self.stdout.write(f'id {last_id} 까지 처리 (생성 {created_count}, 실패 {failed_count})')
+
+        self.stdout.write(self.style.SUCCESS(f'{created_count}개 이미지 파생 이미지 생성 완료 (실패 {failed_count})'))
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from analysis.custom.s3_io import run_closing_connections
+from analysis.helpers import copy_s3_object, generate_body_image_key, get_variant_key, is_legacy_body_image_key, \
+    s3_objects_exist
+from analysis.models import BodyResult
+
+
+def migrate_body_images(body_result):
+    """
+    기존 key(front-<created_dt>.png) 이미지를 신규 key 로 복사 후 {컬럼: 신규 key} 반환
+    파생 이미지(WebP)는 존재하는 경우에만 함께 복사, 기존 객체는 삭제하지 않음
+    """
+    updates = {}
+    for pose_type in ('front', 'side'):
+        old_key = getattr(body_result, f'image_{pose_type}_key')
+        if old_key is None or not is_legacy_body_image_key(old_key):
+            continue
+
+        new_key = generate_body_image_key(body_result, pose_type)
+        copy_s3_object(old_key, new_key)
+
+        variants = {get_variant_key(old_key, variant): get_variant_key(new_key, variant)
+                    for variant in settings.BODY_IMAGE_VARIANTS}
+        exists_map = s3_objects_exist(list(variants))
+        for old_variant_key, new_variant_key in variants.items():
+            if exists_map[old_variant_key]:
+                copy_s3_object(old_variant_key, new_variant_key)
+
+        updates[f'image_{pose_type}_key'] = new_key
+    return updates
+
+
+class Command(BaseCommand):
+    help = ('기존 key(front-<created_dt>.png)로 저장된 체형 결과 이미지를 신규 key(<yyyy>/<mm>/<user_id>/<id>-front.png)로 '
+            '복사하고 BodyResult 의 key 를 갱신합니다. 중단 후 다시 실행하면 이전되지 않은 row 부터 이어서 처리합니다. '
+            '(기존 객체는 남겨두며, 전환이 끝난 뒤 reconcile_s3_objects --enqueue 로 정리)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 번에 조회할 row 수')
+        parser.add_argument('--workers', type=int, default=8, help='동시에 복사할 row 수')
+        parser.add_argument('--start-id', type=int, default=0, help='이 id 이후의 BodyResult 부터 처리')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        # '/' 가 없는 key = 기존 key (신규 key 는 항상 <yyyy>/<mm>/... prefix 를 가짐)
+        queryset = BodyResult.objects.filter(
+            Q(image_front_key__isnull=False, image_front_key__startswith='front-') |
+            Q(image_side_key__isnull=False, image_side_key__startswith='side-')
+        ).only('id', 'user_id', 'created_dt', 'image_front_key', 'image_side_key').order_by('id')
+
+        migrated_count = 0
+        failed_count = 0
+        last_id = options['start_id']
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                body_results = list(queryset.filter(id__gt=last_id)[:chunk_size])
+                if not body_results:
+                    break
+                last_id = body_results[-1].id
+
+                # S3 복사는 병렬, DB 갱신은 메인 스레드에서 수행
+                futures = {executor.submit(run_closing_connections, migrate_body_images, body_result): body_result
+                           for body_result in body_results}
+                for future, body_result in futures.items():
+                    try:
+                        updates = future.result()
+                    except Exception as e:  # 원본 객체가 없는 경우 등 -> 건너뛰고 계속 진행
+                        failed_count += 1
+                        self.stderr.write(f'BodyResult {body_result.id}: {e}')
+                        continue
+
+                    # 복사하는 동안 key 가 바뀌지 않은 경우에만 갱신 (동시 삭제/재업로드 보호)
+                    if updates and BodyResult.objects.filter(
+                            id=body_result.id,
+                            image_front_key=body_result.image_front_key,
+                            image_side_key=body_result.image_side_key,
+                    ).update(**updates):
+                        migrated_count += 1
+
+                self.stdout.write(f'id {last_id} 까지 처리 (이전 {migrated_count}, 실패 {failed_count})')
+
+        self.stdout.write(self.style.SUCCESS(f'{migrated_count}개 BodyResult 이미지 key 이전 완료 (실패 {failed_count})'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from analysis.custom.s3_deletion import S3_DELETE_BATCH_SIZE, reap_s3_deletions
+
+
+class Command(BaseCommand):
+    help = 'S3 객체 삭제 대기열의 key 를 delete_objects 로 일괄 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=S3_DELETE_BATCH_SIZE,
+                            help='delete_objects 1회 요청당 key 수 (최대 1000)')
+
+    def handle(self, *args, **options):
+        deleted_count, failed_count = reap_s3_deletions(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{deleted_count}개 객체 삭제 완료 (실패 {failed_count})'))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analysis.custom.rollup import rebuild_rollups
+from analysis.models import BODY_RESULT_COMPLETED, BodyResult, BodyResultRollup
+
+
+class Command(BaseCommand):
+    help = ('기관 단위 체형 결과 통계(BodyResultRollup)를 BodyResult 에서 다시 계산합니다. '
+            '최초 생성, 시그널 없이 일괄 변경한 경우(backfill_body_image_keys, backfill_normal_summary 등) 후에 실행합니다. '
+            '배포 시 restart_django.sh 에서 --if-empty 로 실행합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--if-empty', action='store_true',
+                            help='집계가 하나도 없고 완료된 BodyResult 가 있을 때만 재계산 (배포 시 최초 생성용)')
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and (BodyResultRollup.objects.exists()
+                                    or not BodyResult.objects.filter(BODY_RESULT_COMPLETED).exists()):
+            self.stdout.write('기관 통계가 이미 있거나 집계할 체형 결과가 없어 재계산하지 않습니다.')
+            return
+
+        start = time.perf_counter()
+        created_count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'기관 통계 {created_count}건 재계산 완료 ({time.perf_counter() - start:.1f}초)'
+        ))
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+
+from analysis.custom.s3_deletion import enqueue_s3_deletions
+from analysis.helpers import get_body_image_all_keys, is_body_image_key, iter_s3_object_pages
+from analysis.models import BodyResult, S3ObjectDeletion
+
+
+class Command(BaseCommand):
+    help = 'S3 버킷의 체형 결과 이미지와 BodyResult 를 비교하여 고아 객체(DB에 없는 이미지)와 누락 이미지를 찾습니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--prefix', default='', help='스캔할 객체 key prefix (기본값: 전체)')
+        parser.add_argument('--page-size', type=int, default=1000, help='list_objects_v2 페이지 크기 (최대 1000)')
+        parser.add_argument('--min-age-hours', type=int, default=24,
+                            help='이 시간 이내에 업로드된 객체는 제외 (업로드 진행 중인 이미지 보호)')
+        parser.add_argument('--enqueue', action='store_true', help='고아 객체를 삭제 대기열에 등록')
+        parser.add_argument('--show', type=int, default=20, help='출력할 key 예시 개수')
+
+    def handle(self, *args, **options):
+        # DB 기준으로 존재해야 하는 key (기존 데이터는 created_dt 기반 key 포함)
+        expected_keys = set()
+        stored_keys = []  # key 가 저장된 원본 이미지 -> 버킷에 없으면 누락
+        queryset = BodyResult.objects.only('id', 'created_dt', 'image_front_key', 'image_side_key')
+        for body_result in queryset.iterator(chunk_size=2000):
+            expected_keys.update(get_body_image_all_keys(body_result))
+            stored_keys.extend(key for key in (body_result.image_front_key, body_result.image_side_key) if key)
+
+        pending_keys = set(S3ObjectDeletion.objects.values_list('key', flat=True))
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=options['min_age_hours'])
+
+        bucket_keys = set()
+        orphan_keys = []
+        for objects in iter_s3_object_pages(prefix=options['prefix'], page_size=options['page_size']):
+            for obj in objects:
+                key = obj['Key']
+                if not is_body_image_key(key):  # 체형 결과 이미지가 아닌 객체는 비교 대상에서 제외
+                    continue
+                bucket_keys.add(key)
+                if key not in expected_keys and key not in pending_keys and obj['LastModified'] < cutoff:
+                    orphan_keys.append(key)
+
+        missing_keys = [key for key in stored_keys if key.startswith(options['prefix']) and key not in bucket_keys]
+
+        self.stdout.write(f'버킷 이미지 {len(bucket_keys)}개, DB 참조 key {len(expected_keys)}개')
+        self.stdout.write(f'고아 객체 {len(orphan_keys)}개: {orphan_keys[:options["show"]]}')
+        self.stdout.write(f'누락 이미지 {len(missing_keys)}개: {missing_keys[:options["show"]]}')
+
+        if options['enqueue'] and orphan_keys:
+            enqueue_s3_deletions(orphan_keys)
+            self.stdout.write(self.style.SUCCESS(f'고아 객체 {len(orphan_keys)}개 삭제 대기열 등록 완료'))
@@ -0,0 +1,72 @@
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from analysis.custom.checkpoint import read_checkpoint, write_checkpoint
+from analysis.custom.scoring import GAIT_SCORE_FIELDS, score_gait_batch, to_optional
+from analysis.models import GaitResult
+
+
+class Command(BaseCommand):
+    help = ('CodeInfo 기준값(정상/주의 범위 등) 변경 후 저장된 GaitResult 점수를 현재 기준으로 다시 계산합니다. '
+            'row 를 chunk 단위로 읽어(서버 측 커서) 일괄 계산 후 점수가 바뀐 row 만 bulk_update 합니다. '
+            '--checkpoint 파일을 지정하면 chunk 마다 마지막 id 를 기록하고, 다시 실행 시 그 이후부터 이어서 처리합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help='한 번에 계산/저장할 row 수')
+        parser.add_argument('--start-id', type=int, default=0, help='이 id 이후의 GaitResult 부터 처리')
+        parser.add_argument('--checkpoint', help='진행 위치(마지막 처리 id)를 기록할 파일 경로')
+        parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 변경될 row 수만 출력')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        checkpoint = options['checkpoint']
+        dry_run = options['dry_run']
+
+        last_id = options['start_id']
+        if checkpoint:
+            last_id = max(last_id, read_checkpoint(checkpoint))
+            if last_id:
+                self.stdout.write(f'id {last_id} 이후부터 이어서 처리')
+
+        # PostgreSQL 에서 iterator() 는 서버 측 커서로 chunk_size 개씩 가져옴 (전체 row 를 메모리에 올리지 않음)
+        rows = GaitResult.objects.filter(id__gt=last_id).order_by('id').values_list(
+            'id', 'score', *GAIT_SCORE_FIELDS
+        ).iterator(chunk_size=chunk_size)
+
+        processed_count = 0
+        updated_count = 0
+        start = time.perf_counter()
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            ids, old_scores, *columns = zip(*chunk)
+            scores = score_gait_batch(dict(zip(GAIT_SCORE_FIELDS, columns)))
+
+            changed = [
+                GaitResult(id=gait_result_id, score=new_score)
+                for gait_result_id, old_score, new_score in zip(ids, old_scores, map(to_optional, scores))
+                if old_score != new_score
+            ]
+            if changed and not dry_run:
+                # save() 를 거치지 않으므로 점수를 다시 계산하지 않고 score 컬럼만 갱신
+                GaitResult.objects.bulk_update(changed, ['score'], batch_size=1000)
+
+            last_id = ids[-1]
+            processed_count += len(chunk)
+            updated_count += len(changed)
+            if checkpoint and not dry_run:
+                write_checkpoint(checkpoint, last_id)
+
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'id {last_id} 까지 처리 ({processed_count}건, 변경 {updated_count}건, '
+                              f'{processed_count / elapsed:,.0f} rows/s)')
+
+        elapsed = time.perf_counter() - start
+        rate = processed_count / elapsed if elapsed else 0
+        action = '변경 대상' if dry_run else '점수 갱신'
+        self.stdout.write(self.style.SUCCESS(
+            f'{processed_count}개 GaitResult 재계산 완료 ({action} {updated_count}건, {elapsed:.1f}초, {rate:,.0f} rows/s)'
+        ))
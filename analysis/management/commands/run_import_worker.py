@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from analysis.custom.import_jobs import run_import_worker
+from analysis.custom.job_worker import run_worker_processes
+
+
+def _worker_main(batch_size, poll_interval):
+    run_import_worker(batch_size=batch_size, poll_interval=poll_interval)
+
+
+class Command(BaseCommand):
+    help = '회원 등록(엑셀 업로드) 작업 큐(MemberImportJob)를 처리하는 워커를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='워커 프로세스 수')
+        parser.add_argument('--batch-size', type=int, default=1, help='한 번에 가져올 작업 수')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='대기 작업이 없을 때 대기 시간(초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 처리한 뒤 종료')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        if options['once']:
+            processed = run_import_worker(batch_size=batch_size, once=True)
+            self.stdout.write(self.style.SUCCESS(f'{processed}개 작업 처리 완료'))
+            return
+
+        if options['processes'] <= 1:
+            run_import_worker(batch_size=batch_size, poll_interval=options['poll_interval'])
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'회원 등록 워커 {options["processes"]}개 실행'))
+        # 비정상 종료된 워커 프로세스는 다시 시작
+        run_worker_processes(_worker_main, (batch_size, options['poll_interval']), options['processes'])
@@ -1,6 +1,7 @@
 from email.policy import default
 
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.contrib.postgres.fields import ArrayField
 from django_prometheus.models import ExportModelOperationsMixin
@@ -118,6 +119,11 @@ class UserHist(models.Model):
     year = models.IntegerField(null=True)
     created_dt = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['school', 'year', 'student_grade', 'student_class'])  # 결과 조회 연도/그룹 목록
+        ]
+
 
 class GaitResult(ExportModelOperationsMixin('gait_result'), models.Model):
     user = models.ForeignKey(UserInfo, on_delete=models.CASCADE)
@@ -158,90 +164,27 @@ class GaitResult(ExportModelOperationsMixin('gait_result'), models.Model):
         return f"GaitResult for {self.user.username} at {self.created_dt}"
 
     def get_code_info(self, code_id):
-        """CodeInfo 테이블에서 특정 code_id에 해당하는 normal_min_value, normal_max_value, min_value, max_value, direction을 가져옴"""
-        try:
-            code_info = CodeInfo.objects.get(code_id=code_id)
-            return (code_info.normal_min_value, code_info.normal_max_value,
-                    code_info.min_value, code_info.max_value, code_info.direction)
-        except CodeInfo.DoesNotExist:
-            return None, None, None, None, None
+        """CodeInfo 레지스트리에서 특정 code_id에 해당하는 normal_min_value, normal_max_value, min_value, max_value, direction을 가져옴"""
+        from analysis.custom.code_info import code_info_registry
 
-    def get_code_info(self, code_id):
-        """CodeInfo 테이블에서 특정 code_id에 해당하는 normal_min_value, normal_max_value, min_value, max_value, direction을 가져옴"""
-        try:
-            code_info = CodeInfo.objects.get(code_id=code_id)
-            return (code_info.normal_min_value, code_info.normal_max_value,
-                    code_info.caution_min_value, code_info.caution_max_value,
-                    code_info.min_value, code_info.max_value, code_info.direction)
-        except CodeInfo.DoesNotExist:
+        code_info = code_info_registry.get(code_id)
+        if code_info is None:
             return None, None, None, None, None, None, None
+        return (code_info.normal_min_value, code_info.normal_max_value,
+                code_info.caution_min_value, code_info.caution_max_value,
+                code_info.min_value, code_info.max_value, code_info.direction)
 
     def calculate_normalized_score(self, value, code_id):
         """normal_min_value, normal_max_value, min_value, max_value, direction을 이용해 점수를 계산 (clipping 추가)"""
-        normal_min, normal_max, caution_min, caution_max, min_value, max_value, direction = self.get_code_info(code_id)
-        if value is None or normal_min is None or normal_max is None or caution_min is None or caution_max is None or direction is None:
-            return None
-
-        # Clipping: value가 min_value와 max_value 범위를 벗어나면 값을 제한
-        if value < min_value:
-            value = min_value
-        elif value > max_value:
-            value = max_value
-
-        # direction에 따른 global min/max 점수 계산
-        if direction == 'positive':
-            # 클수록 좋은 경우: value가 min_value에 가까우면 0, max_value에 가까우면 1
-            if min_value <= value <= caution_max:
-                score = 0.4 * (value - min_value) / (caution_min - min_value)
-            elif caution_min <= value <= normal_min:
-                score = 0.3 * (value - caution_min) / (normal_min - caution_min) + 0.4
-            elif normal_min <= value <= max_value:
-                score = 0.3 * (value - normal_min) / (max_value - normal_min) + 0.7
-        elif direction == 'negative':
-            # 작을수록 좋은 경우: value가 max_value에 가까우면 0, min_value에 가까우면 1
-            if min_value <= value <= normal_max:
-                score = -0.3 * (value - min_value) / (normal_max - min_value) + 1.0
-            elif normal_max <= value <= caution_max:
-                score = -0.3 * (value - normal_max) / (caution_max - normal_max) + 0.7
-            elif caution_max <= value <= max_value:
-                score = -0.4 * (value - caution_max) / (max_value - caution_max) + 0.4
-
-        # score가 항상 0과 1 사이의 값이 되도록 보장
-        return max(0, min(score, 1))
+        from analysis.custom.scoring import get_thresholds, normalized_scores, to_optional
+
+        return to_optional(normalized_scores([[value]], get_thresholds([code_id]))[0, 0])
 
     def calculate_score(self):
-        total_sum = 0
-        total_weight = 0
-
-        # 나머지 필드들에 대한 정규화 점수 계산
-        fields_with_codes = [
-            (self.velocity, 'velocity'),
-            (self.stride_len_l, 'stride_len_l'),
-            (self.stride_len_r, 'stride_len_r'),
-            (self.swing_perc_l, 'swing_perc_l'),
-            (self.swing_perc_r, 'swing_perc_r'),
-            (self.stance_perc_l, 'stance_perc_l'),
-            (self.stance_perc_r, 'stance_perc_r'),
-            (self.d_supp_perc_l, 'd_supp_perc_l'),
-            (self.d_supp_perc_r, 'd_supp_perc_r')
-        ]
+        # 필드별 정규화 점수의 평균 * score 최대값 (일괄 계산 엔진으로 1건 계산)
+        from analysis.custom.scoring import GAIT_SCORE_FIELDS, score_gait_batch, to_optional
 
-        for field, code_id in fields_with_codes:
-            field_score = self.calculate_normalized_score(field, code_id)
-            if field_score is not None:
-                if field in ['velocity', 'stride_len_l', 'stride_len_r']:
-                    total_sum += field_score * 2  # 가중치 2
-                    total_weight += 2
-                else:
-                    total_sum += field_score
-                    total_weight += 1
-
-        # score 계산 (가중합 평균)
-        if total_weight > 0:
-            *_, score_max_value, _ = self.get_code_info('score')
-            self.score = total_sum / total_weight * score_max_value
-        else:
-            self.score = None
+        self.score = to_optional(score_gait_batch({field: [getattr(self, field)] for field in GAIT_SCORE_FIELDS})[0])
 
     def save(self, *args, **kwargs):
         # score 계산 후 저장
@@ -249,6 +192,12 @@ class GaitResult(ExportModelOperationsMixin('gait_result'), models.Model):
         super().save(*args, **kwargs)
 
 
+# 완료된(앞/옆 이미지가 모두 있는) 검사 결과 조건
+# image_*_key 가 없는 기존 row(backfill_body_image_keys 실행 전)는 예전에 저장된 image_*_url 로 판단
+BODY_RESULT_COMPLETED = (Q(image_front_key__isnull=False, image_side_key__isnull=False)
+                         | Q(image_front_url__isnull=False, image_side_url__isnull=False))
+
+
 class BodyResult(ExportModelOperationsMixin('body_result'), models.Model):
     user = models.ForeignKey(UserInfo, on_delete=models.CASCADE)
     school = models.ForeignKey(SchoolInfo, on_delete=models.CASCADE)
@@ -267,9 +216,21 @@ class BodyResult(ExportModelOperationsMixin('body_result'), models.Model):
     scoliosis_shoulder_ratio = models.FloatField(null=True)
     scoliosis_hip_ratio = models.FloatField(null=True)
     # S3 미리 서명 URL 갱신 시 컬럼 길이 제한으로 짤려서 들어감
+    # 더 이상 갱신하지 않음 -> URL은 조회 시 image_*_key 로 생성 (BodyResultSerializer)
     image_front_url = models.CharField(max_length=500, null=True)  # 수정
     image_side_url = models.CharField(max_length=500, null=True)  # 수정
+    # S3 객체 key (업로드 완료 시 저장, null 이면 이미지 없음)
+    image_front_key = models.CharField(max_length=200, null=True, blank=True)
+    image_side_key = models.CharField(max_length=200, null=True, blank=True)
+    # 이미지 비동기 업로드 상태 (pending: 대기/처리중, done: 완료, failed: 실패, null: 이미지 없음/기존 데이터)
+    image_status = models.CharField(max_length=10, null=True, blank=True)
     mobile_yn = models.CharField(max_length=1, default='n')  # 체형 결과에서 키오스크와 모바일 구분하기 위함
+    # 정상범위 판정 요약 (저장 시 계산, CodeInfo 기준 변경 / 기존 데이터는 backfill_normal_summary 명령으로 계산)
+    normal_count = models.SmallIntegerField(null=True)  # 정상범위 항목 수 (n/11 의 n)
+    caution_mask = models.IntegerField(null=True)  # 항목별 주의 여부 비트 (scoring.BODY_NORMAL_FIELDS 순서, 1 = 주의)
+    # 집계에 반영된 기관 통계 row (null 이면 미반영 - 이미지 업로드 전 / 기관 없음)
+    rollup = models.ForeignKey('BodyResultRollup', on_delete=models.SET_NULL, null=True, blank=True,
+                               related_name='body_results')
     created_dt = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -277,7 +238,8 @@ class BodyResult(ExportModelOperationsMixin('body_result'), models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=['user', 'created_dt'])
+            models.Index(fields=['user', 'created_dt']),
+            models.Index(fields=['user', 'normal_count']),  # 정상범위 항목 수 기준 필터 (주의 대상 집계)
         ]
         ordering = ['-created_dt']
 
@@ -292,8 +254,51 @@ class BodyResult(ExportModelOperationsMixin('body_result'), models.Model):
                 metrics.body_result_by_org.labels(
                     organization_name=self.user.organization.organization_name
                 ).inc()
+
+        # 측정값이 저장되는 경우에만 정상범위 요약 갱신
+        from analysis.custom.scoring import BODY_NORMAL_FIELDS
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            self.update_normal_summary()
+        elif not set(update_fields).isdisjoint(BODY_NORMAL_FIELDS):
+            self.update_normal_summary()
+            kwargs['update_fields'] = {*update_fields, 'normal_count', 'caution_mask'}
         super().save(*args, **kwargs)
 
+    def update_normal_summary(self):
+        from analysis.custom.scoring import BODY_NORMAL_FIELDS, summarize_body_normal_batch
+
+        normal_count, caution_mask = summarize_body_normal_batch(
+            {field: [getattr(self, field)] for field in BODY_NORMAL_FIELDS}
+        )
+        self.normal_count, self.caution_mask = int(normal_count[0]), int(caution_mask[0])
+
+
+### 기관 단위 체형 결과 통계 (rollup)
+### (학교, 연, 월, 학년, 반) / (기관, 연, 월, 부서) 별 완료된 검사 결과 수, 검사 회원 수, 항목별 주의 건수
+### BodyResult 완료(이미지 key 저장) / 삭제 시 custom/rollup.py 에서 증분 갱신, rebuild_body_result_rollup 명령으로 재계산
+class BodyResultRollup(models.Model):
+    bucket_key = models.CharField(max_length=200, unique=True)  # 집계 단위 식별자 (rollup.bucket_key 참고)
+    school = models.ForeignKey(SchoolInfo, on_delete=models.CASCADE, null=True, blank=True)
+    organization = models.ForeignKey(OrganizationInfo, on_delete=models.CASCADE, null=True, blank=True)
+    year = models.IntegerField()
+    month = models.IntegerField()
+    student_grade = models.IntegerField(null=True, blank=True)
+    student_class = models.IntegerField(null=True, blank=True)
+    department = models.CharField(max_length=100, null=True, blank=True)
+    result_count = models.IntegerField(default=0)  # 완료된 검사 결과 수
+    tested_user_count = models.IntegerField(default=0)  # 검사 결과가 있는 회원 수 (중복 제외)
+    low_normal_count = models.IntegerField(default=0)  # 주의 대상(정상범위 LOW_NORMAL_COUNT 이하) 결과 수
+    caution_counts = ArrayField(models.IntegerField(), default=list)  # 항목별 주의 결과 수 (BODY_NORMAL_FIELDS 순서)
+    updated_dt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['school', 'year', 'month']),
+            models.Index(fields=['organization', 'year', 'month']),
+        ]
+
 
 ### 체형 분석 결과에서 keypoints 들을 저장할 테이블
 ### 모바일에서만 사용함 (null = True)
@@ -316,3 +321,123 @@ class Keypoint(models.Model):
                 name='valid_pose_type'
             )
         ]
+
+
+### 체형 결과 이미지 업로드 작업 큐 (DB 기반)
+### 요청에서는 스풀 파일 기록 + 작업 등록만 하고, run_image_worker 워커가 검증/변환/S3 업로드 처리
+class ImageUploadJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    body_result = models.ForeignKey(BodyResult, on_delete=models.CASCADE, related_name='image_jobs')
+    pose_type = models.CharField(max_length=5, choices=[('front', 'Front'), ('side', 'Side')])
+    spool_path = models.CharField(max_length=500)  # 업로드 전 이미지가 저장된 로컬 스풀 파일 경로
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    error_message = models.CharField(max_length=500, null=True, blank=True)
+    locked_dt = models.DateTimeField(null=True, blank=True)  # 워커가 작업을 가져간 시간
+    next_attempt_dt = models.DateTimeField(null=True, blank=True)  # 재시도 대기 중이면 다음 시도 가능 시간 (지수 백오프)
+    created_dt = models.DateTimeField(auto_now_add=True)
+    updated_dt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'])
+        ]
+
+
+### S3 객체 삭제 대기열 (outbox)
+### BodyResult 삭제 시(직접 삭제 / 회원 삭제 CASCADE) 같은 트랜잭션에서 이미지 key 를 기록하고,
+### reap_s3_deletions 가 delete_objects 로 최대 1000개씩 일괄 삭제
+class S3ObjectDeletion(models.Model):
+    key = models.CharField(max_length=300)
+    attempts = models.IntegerField(default=0)  # 삭제 실패 횟수
+    error_message = models.CharField(max_length=500, null=True, blank=True)
+    created_dt = models.DateTimeField(auto_now_add=True)
+
+
+### S3 객체 존재 여부 인덱스
+### 웹 서버 / 워커 / 관리 명령이 모두 같은 인덱스를 보도록 DB 에 저장 (프로세스 로컬 캐시 X)
+### 만료(expires_dt)된 항목은 조회 시 무시하고 스케줄러가 주기적으로 삭제
+class S3ObjectIndex(models.Model):
+    key = models.CharField(max_length=300, unique=True)
+    exists = models.BooleanField()
+    expires_dt = models.DateTimeField(db_index=True)
+
+
+### 결과 조회 엑셀 다운로드 백그라운드 작업
+### 행 수가 많은 report_download 요청은 작업만 등록하고 run_export_worker 워커가 엑셀을 만들어 S3 에 저장
+### 같은 기관/연도/그룹/데이터 버전(dedupe_key)의 작업은 하나만 유지하여 반복 요청 시 같은 파일을 재사용
+class ReportExportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),  # 보관 기간이 지나 파일 삭제됨
+    ]
+    QUEUED_STATUSES = ['pending', 'processing']
+
+    requested_by = models.ForeignKey(UserInfo, on_delete=models.SET_NULL, null=True, blank=True)
+    school = models.ForeignKey(SchoolInfo, on_delete=models.CASCADE, null=True, blank=True)
+    organization = models.ForeignKey(OrganizationInfo, on_delete=models.CASCADE, null=True, blank=True)
+    selected_year = models.CharField(max_length=10)
+    selected_group = models.CharField(max_length=100)
+    data_version = models.CharField(max_length=64)
+    dedupe_key = models.CharField(max_length=64)  # 기관/연도/그룹/데이터 버전 hash
+    file_name = models.CharField(max_length=200)
+    file_key = models.CharField(max_length=300, null=True, blank=True)  # 완료 후 S3 객체 key
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    error_message = models.CharField(max_length=500, null=True, blank=True)
+    locked_dt = models.DateTimeField(null=True, blank=True)  # 워커가 작업을 가져간(진행률을 갱신한) 시간
+    created_dt = models.DateTimeField(auto_now_add=True)
+    updated_dt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # 완료(done) 작업은 만료 직전이면 재사용하지 않고 새로 등록하므로 대기/진행 중인 작업만 1개로 제한
+            models.UniqueConstraint(fields=['dedupe_key'], name='unique_queued_report_export',
+                                    condition=models.Q(status__in=['pending', 'processing']))
+        ]
+        indexes = [
+            models.Index(fields=['status', 'id'])
+        ]
+
+
+### 회원 등록(엑셀 업로드) 백그라운드 작업
+### 행 수가 많은 업로드는 검증된 행을 스풀 파일로 저장하고 run_import_worker 워커가 chunk 단위 트랜잭션으로 저장
+### processed_rows 는 커밋된 chunk 까지의 행 수이며, 중단된 작업은 이 위치부터 이어서 처리
+class MemberImportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    requested_by = models.ForeignKey(UserInfo, on_delete=models.SET_NULL, null=True, blank=True)
+    school = models.ForeignKey(SchoolInfo, on_delete=models.CASCADE, null=True, blank=True)
+    organization = models.ForeignKey(OrganizationInfo, on_delete=models.CASCADE, null=True, blank=True)
+    spool_path = models.CharField(max_length=500)  # 검증된 행(JSON)이 저장된 로컬 스풀 파일 경로
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.IntegerField(default=0)
+    processed_rows = models.IntegerField(default=0)  # 커밋된 행 수 (재시작 위치)
+    existing_member = models.IntegerField(default=0)
+    new_member = models.IntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    error_message = models.CharField(max_length=500, null=True, blank=True)
+    locked_dt = models.DateTimeField(null=True, blank=True)  # 워커가 작업을 가져간(chunk 를 커밋한) 시간
+    created_dt = models.DateTimeField(auto_now_add=True)
+    updated_dt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'])
+        ]
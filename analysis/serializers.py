@@ -1,5 +1,7 @@
+from django.db import models
 from rest_framework import serializers
 
+from analysis.helpers import get_body_image_urls
 from analysis.models import UserInfo, UserHist, SessionInfo, SchoolInfo, GaitResult, BodyResult, CodeInfo, Keypoint
 
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -46,11 +48,37 @@ class GaitResultSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['id', 'created_dt']
 
+class BodyResultListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # 페이지 단위로 이미지 URL을 한 번에 생성 (존재 여부 인덱스 조회 및 서명을 row 마다 하지 않음)
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        self.context['image_urls'] = get_body_image_urls(items)
+        return super().to_representation(items)
+
+
 class BodyResultSerializer(serializers.ModelSerializer):
+    # DB에 저장하지 않고 직렬화 시점에 S3 객체 key로 presigned URL 생성 (캐시 재사용)
+    image_front_url = serializers.SerializerMethodField()
+    image_side_url = serializers.SerializerMethodField()
+
     class Meta:
         model = BodyResult
         fields = '__all__'
-        read_only_fields = ['id', 'created_dt']
+        # 이미지 업로드 상태 / 기관 통계 연결은 서버(업로드 작업, 시그널)에서만 변경
+        read_only_fields = ['id', 'created_dt', 'image_front_key', 'image_side_key', 'image_status', 'rollup']
+        list_serializer_class = BodyResultListSerializer
+
+    def _get_image_urls(self, obj):
+        image_urls = self.context.get('image_urls')
+        if image_urls is None or obj.id not in image_urls:
+            image_urls = get_body_image_urls([obj])
+        return image_urls[obj.id]
+
+    def get_image_front_url(self, obj):
+        return self._get_image_urls(obj)[0]
+
+    def get_image_side_url(self, obj):
+        return self._get_image_urls(obj)[1]
 
 class GaitResponseSerializer(serializers.Serializer):
     data = GaitResultSerializer(many=True)
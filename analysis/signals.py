@@ -0,0 +1,98 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from analysis.custom.code_info import code_info_registry
+from analysis.custom.dashboard import invalidate_dashboard_stats
+from analysis.custom.normal_summary import CODE_INFO_RANGE_FIELDS, invalidate_normal_summaries
+from analysis.custom.report_groups import invalidate_year_group_map
+from analysis.custom.rollup import add_body_result, remove_body_result
+from analysis.custom.s3_deletion import enqueue_s3_deletions
+from analysis.custom.scoring import BODY_NORMAL_FIELDS
+from analysis.helpers import generate_body_image_key, get_body_image_all_keys, get_image_all_keys
+from analysis.models import BodyResult, CodeInfo, UserHist, UserInfo
+
+# 저장되어도 대시보드 집계에 영향이 없는 UserInfo 필드 (로그인 시각 갱신 등)
+DASHBOARD_IRRELEVANT_USER_FIELDS = {'last_login', 'last_active_dt', 'password'}
+# 결과 조회 연도/그룹 목록에 사용하는 필드
+YEAR_GROUP_FIELDS = {'school', 'school_id', 'year', 'student_grade', 'student_class'}
+
+
+@receiver(post_delete, sender=BodyResult)
+def enqueue_body_image_deletion(sender, instance, **kwargs):
+    # 직접 삭제 / 회원 삭제(CASCADE) 모두 같은 트랜잭션에서 이미지 key 를 삭제 대기열에 기록
+    keys = get_body_image_all_keys(instance, include_legacy=True)
+    if instance.image_status == 'pending':
+        # 업로드 작업 진행 중이면 삭제 직전에 업로드가 끝났을 수 있으므로 (instance 에 key 없음) 신규 key 도 기록
+        keys += [key for pose_type in ('front', 'side') for key in
+                 get_image_all_keys(generate_body_image_key(instance, pose_type)) if key not in keys]
+    enqueue_s3_deletions(keys)
+
+
+@receiver(post_save, sender=CodeInfo)
+@receiver(post_delete, sender=CodeInfo)
+def invalidate_code_info_registry(sender, **kwargs):
+    # 정상범위/점수 기준이 바뀌면 모든 프로세스의 레지스트리를 다시 읽도록 함
+    code_info_registry.invalidate()
+
+
+@receiver(pre_save, sender=CodeInfo)
+def remember_code_info_range(sender, instance, **kwargs):
+    # 저장 후 정상범위 판정 기준이 바뀌었는지 비교하기 위해 저장 전 값 보관
+    instance._saved_range = CodeInfo.objects.filter(pk=instance.pk).values(*CODE_INFO_RANGE_FIELDS).first() \
+        if instance.pk else None
+
+
+@receiver(post_save, sender=CodeInfo)
+@receiver(post_delete, sender=CodeInfo)
+def invalidate_normal_summaries_for_code_info(sender, instance, signal, **kwargs):
+    # 체형 항목의 정상범위가 바뀌면 저장된 요약(normal_count, caution_mask)을 비움 -> 스케줄러가 다시 계산
+    saved_range = getattr(instance, '_saved_range', None)
+    if signal is post_save and saved_range == {field: getattr(instance, field) for field in CODE_INFO_RANGE_FIELDS}:
+        return
+    code_ids = {instance.code_id, saved_range and saved_range['code_id']}
+    if not code_ids.isdisjoint(BODY_NORMAL_FIELDS):
+        invalidate_normal_summaries()
+
+
+@receiver(post_save, sender=BodyResult)
+@receiver(post_delete, sender=BodyResult)
+def invalidate_dashboard_for_body_result(sender, instance, **kwargs):
+    # 검사 결과를 생성한 회원의 기관 대시보드 캐시 삭제 (회원 객체가 이미 로딩된 경우 추가 쿼리 없음)
+    if sender._meta.get_field('user').is_cached(instance):
+        user = instance.user
+    else:
+        user = UserInfo.objects.filter(id=instance.user_id).only('school_id', 'organization_id').first()
+    if user is not None:
+        invalidate_dashboard_stats(school_id=user.school_id, organization_id=user.organization_id)
+
+
+@receiver(post_save, sender=BodyResult)
+def add_body_result_to_rollup(sender, instance, **kwargs):
+    # 이미지 key 가 모두 저장되어 완료된 시점에 기관 통계에 반영 (비동기 업로드는 image_jobs 에서 반영)
+    if instance.rollup_id is None and instance.image_front_key and instance.image_side_key:
+        instance.rollup_id = add_body_result(instance.id)
+
+
+@receiver(post_delete, sender=BodyResult)
+def remove_body_result_from_rollup(sender, instance, **kwargs):
+    remove_body_result(instance)
+
+
+@receiver(post_save, sender=UserInfo)
+@receiver(post_delete, sender=UserInfo)
+def invalidate_dashboard_for_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and set(update_fields) <= DASHBOARD_IRRELEVANT_USER_FIELDS:
+        return
+    invalidate_dashboard_stats(school_id=instance.school_id, organization_id=instance.organization_id)
+
+
+@receiver(post_save, sender=UserInfo)
+@receiver(post_delete, sender=UserInfo)
+@receiver(post_save, sender=UserHist)
+@receiver(post_delete, sender=UserHist)
+def invalidate_report_year_groups(sender, instance, update_fields=None, **kwargs):
+    # 회원 등록(엑셀 업로드) 등으로 학교의 연도/학년/반 구성이 바뀌면 결과 조회 선택 목록 캐시 삭제
+    if update_fields is not None and set(update_fields).isdisjoint(YEAR_GROUP_FIELDS):
+        return
+    invalidate_year_group_map(instance.school_id)
+
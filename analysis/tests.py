@@ -1,19 +1,56 @@
-from django.test import SimpleTestCase, TestCase
+import base64
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from PIL import Image
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, resolve
+from django.utils import timezone
 from django.contrib.auth import views as auth_views
 from .custom.custom_token import CustomTokenObtainPairView, CustomTokenRefreshView
 
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth.hashers import make_password
-from .models import AuthInfo, UserInfo
-from . import views, views_mobile
+from .models import AuthInfo, BodyResult, BodyResultRollup, CodeInfo, GaitResult, ImageUploadJob, MemberImportJob, \
+    OrganizationInfo, ReportExportJob, S3ObjectDeletion, S3ObjectIndex, SchoolInfo, UserHist, UserInfo
+from .custom.code_info import CodeInfoRegistry, code_info_registry
+from .custom.credentials import password_hasher
+from .custom.dashboard import get_dashboard_stats
+from .custom.export_jobs import run_export_worker
+from .custom.image_jobs import requeue_image_jobs, run_image_worker
+from .custom.import_jobs import run_import_worker
+from .custom.job_worker import run_job_worker
+from .custom.member_import import import_members, parse_member_frame
+from .custom.normal_summary import refresh_missing_normal_summaries
+from .custom.report_groups import get_year_group_map
+from .custom.rollup import rebuild_rollups
+from .custom.s3_deletion import reap_s3_deletions
+from .custom.s3_io import s3_io
+from .custom.scoring import GAIT_SCORE_FIELDS, score_gait_batch
+from .custom.metrics import s3_inflight_transfers, s3_io_queue_depth
+from . import helpers, views, views_mobile
 
 base_url = 'http://localhost:8000/'
 mobile_uid = 'qwer'
 phone_number = '01012345678'
 password = '1234'
 kiosk_id = 'jifjaeijfieajfi'
+image_png_base64 = 'iVBORw0KGgoAAAANSUhEUgAAAB4AAAAeCAYAAAA7MK6iAAAAKUlEQVR42u3NMQEAAAgDINc/9IyhBxQgnXYORCwWi8VisVgsFovFf+MF6PxZxcf+kXQAAAAASUVORK5CYII='
 
 
 class UrlsTestCase(SimpleTestCase):
@@ -149,16 +186,18 @@ class GaitResultTests(TestCase):
     def test_get_gait_result_success(self):
         # First, create a gait result
         self.kiosk_client.post(base_url + 'api/analysis/gait/create_result/', self.gait_data, format='json')
+        gait_result_id = GaitResult.objects.get().id
 
         # Case 1 : using jwt Tokens (mobile)
-        response = self.mobile_client.get(base_url + 'api/analysis/gait/get_result/', {'id': 1}, format='json')
+        response = self.mobile_client.get(base_url + 'api/analysis/gait/get_result/', {'id': gait_result_id},
+                                          format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('data', response.data)
         self.assertIsInstance(response.data['data'], list)
 
         # Case 2 : using session_key (kiosk)
         response = self.kiosk_client.get(base_url + 'api/analysis/gait/get_result/',
-                                         {'session_key': self.session_key, 'id': 1}, format='json')
+                                         {'session_key': self.session_key, 'id': gait_result_id}, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('data', response.data)
         self.assertIsInstance(response.data['data'], list)
@@ -173,6 +212,24 @@ class BodyResultTests(TestCase):
     def setUp(self):
         self.kiosk_client = APIClient()
 
+        # 이미지 업로드 작업 스풀 디렉토리는 임시 디렉토리 사용
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        spool_settings = override_settings(IMAGE_SPOOL_DIR=spool_dir)
+        spool_settings.enable()
+        self.addCleanup(spool_settings.disable)
+
+        # 실제 버킷 대신 로컬 파일시스템 S3 사용 (S3ObjectIndexTests 와 동일)
+        self.s3_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.s3_root, ignore_errors=True)
+        s3_settings = override_settings(AWS_S3_LOCAL_ROOT=self.s3_root)
+        s3_settings.enable()
+        self.addCleanup(s3_settings.disable)
+        s3_io.reset()
+        cache.clear()
+        self.addCleanup(s3_io.reset)
+        self.addCleanup(cache.clear)
+
         # Create the required objects
         self.auth_info = AuthInfo.objects.create(uid=mobile_uid, phone_number=phone_number)
         self.user_info = UserInfo.objects.create(
@@ -224,24 +281,185 @@ class BodyResultTests(TestCase):
             'image_side': 'iVBORw0KGgoAAAANSUhEUgAAAB4AAAAeCAYAAAA7MK6iAAAAKUlEQVR42u3NMQEAAAgDINc/9IyhBxQgnXYORCwWi8VisVgsFovFf+MF6PxZxcf+kXQAAAAASUVORK5CYII='
         }
 
+    def get_stored_image(self, key):
+        return helpers.get_s3_client().get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)['Body'].read()
+
     def test_get_body_result_success(self):
         # First, create a body result
         response = self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body_result_id = BodyResult.objects.get().id
 
         # Case 1 : using jwt Tokens (mobile)
-        response = self.mobile_client.get(base_url + 'api/analysis/body/get_result/', {'id': 1}, format='json')
+        response = self.mobile_client.get(base_url + 'api/analysis/body/get_result/', {'id': body_result_id},
+                                          format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('data', response.data)
         self.assertIsInstance(response.data['data'], list)
 
         # Case 2 : using session_key (kiosk)
         response = self.kiosk_client.get(base_url + 'api/analysis/body/get_result/',
-                                         {'session_key': self.session_key, 'id': 1}, format='json')
+                                         {'session_key': self.session_key, 'id': body_result_id}, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('data', response.data)
         self.assertIsInstance(response.data['data'], list)
 
+    def test_get_body_result_does_not_persist_urls(self):
+        response = self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        run_image_worker(once=True)
+
+        response = self.kiosk_client.get(base_url + 'api/analysis/body/get_result/', {'session_key': self.session_key},
+                                         format='json')
+        self.assertIsNotNone(response.data['data'][0]['image_front_url'])
+
+        # 조회 시 URL은 직렬화 시점에 생성되고 DB에는 S3 객체 key만 저장됨
+        body_result = BodyResult.objects.get(id=response.data['data'][0]['id'])
+        self.assertIsNone(body_result.image_front_url)
+        self.assertEqual(body_result.image_front_key, helpers.generate_body_image_key(body_result, 'front'))
+        self.assertEqual(self.get_stored_image(body_result.image_front_key), base64.b64decode(image_png_base64))
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=True)
+    def test_create_body_result_enqueues_image_jobs(self):
+        response = self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['image_status'], 'pending')
+
+        # 요청 시점에는 S3 업로드 없이 작업만 등록됨
+        body_result = BodyResult.objects.get()
+        self.assertIsNone(body_result.image_front_key)
+        self.assertEqual(ImageUploadJob.objects.filter(body_result=body_result, status='pending').count(), 2)
+
+        self.assertEqual(run_image_worker(once=True), 2)
+        body_result.refresh_from_db()
+        self.assertEqual(body_result.image_status, 'done')
+        self.assertEqual(body_result.image_side_key, helpers.generate_body_image_key(body_result, 'side'))
+        self.assertEqual(self.get_stored_image(body_result.image_side_key), base64.b64decode(image_png_base64))
+
+    def test_image_job_invalid_image_fails_without_retry(self):
+        self.body_data['image_side'] = base64.b64encode(b'not an image').decode()
+        self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
+        run_image_worker(once=True)
+
+        body_result = BodyResult.objects.get()
+        self.assertEqual(body_result.image_status, 'failed')
+        self.assertEqual(ImageUploadJob.objects.get(pose_type='side').attempts, 1)
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=True, IMAGE_JOB_MAX_ATTEMPTS=2)
+    def test_image_job_retries_with_backoff_and_keeps_spool_file(self):
+        self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
+        with mock.patch('analysis.custom.image_jobs.upload_image_to_s3', side_effect=OSError('S3 unavailable')):
+            self.assertEqual(run_image_worker(once=True), 2)
+            # 대기 시간(next_attempt_dt)이 지나기 전에는 다시 가져가지 않음
+            self.assertEqual(run_image_worker(once=True), 0)
+            job = ImageUploadJob.objects.get(pose_type='front')
+            self.assertEqual((job.status, job.attempts), ('pending', 1))
+            self.assertGreater(job.next_attempt_dt, timezone.now())
+
+            ImageUploadJob.objects.update(next_attempt_dt=timezone.now())
+            self.assertEqual(run_image_worker(once=True), 2)
+
+        # 재시도를 모두 실패해도 스풀 파일은 남아 있어 다시 등록 가능
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertTrue(os.path.exists(job.spool_path))
+        self.assertEqual(BodyResult.objects.get().image_status, 'failed')
+
+        self.assertEqual(requeue_image_jobs(ImageUploadJob.objects.all()), 2)
+        self.assertEqual(run_image_worker(once=True), 2)
+        body_result = BodyResult.objects.get()
+        self.assertEqual(body_result.image_status, 'done')
+        self.assertFalse(os.path.exists(job.spool_path))
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=True)
+    def test_image_job_for_deleted_result_queues_uploaded_object(self):
+        self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
+        body_result = BodyResult.objects.get()
+        spool_paths = list(ImageUploadJob.objects.values_list('spool_path', flat=True))
+
+        def upload_then_delete(image_data, file_keys):  # 업로드 중 결과가 삭제된 경우
+            file_key = helpers.upload_image_to_s3(image_data, file_keys=file_keys)
+            BodyResult.objects.filter(id=body_result.id).delete()
+            return file_key
+
+        with mock.patch('analysis.custom.image_jobs.upload_image_to_s3', side_effect=upload_then_delete):
+            self.assertEqual(run_image_worker(once=True), 2)
+
+        # 결과 삭제 시점에는 key 가 없었던 업로드 객체도 삭제 대기열에 기록, 스풀 파일 삭제
+        for pose_type in ['front', 'side']:
+            key = helpers.generate_body_image_key(body_result, pose_type)
+            self.assertTrue(S3ObjectDeletion.objects.filter(key=key).exists())
+        self.assertFalse(ImageUploadJob.objects.exists())
+        self.assertFalse(any(os.path.exists(path) for path in spool_paths))
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=True)
+    def test_image_worker_survives_unhandled_error(self):
+        self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', self.body_data, format='json')
+        with mock.patch('analysis.custom.image_jobs.refresh_image_status', side_effect=[DatabaseError('gone'), 'done']):
+            self.assertEqual(run_image_worker(once=True), 2)  # 첫 작업의 오류로 루프가 종료되지 않음
+        self.assertEqual(ImageUploadJob.objects.filter(status='done').count(), 1)
+
+    def get_mobile_body_data(self):
+        keypoints = [{'x': 0.5, 'y': 0.5, 'z': 0.0, 'visibility': 1.0, 'presence': 1.0}] * 33
+        return {
+            'front_data': {'results': self.body_data['body_data'], 'keypoints': keypoints},
+            'side_data': {'results': {}, 'keypoints': keypoints},
+            'image_front': self.body_data['image_front'],
+            'image_side': self.body_data['image_side'],
+        }
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=False)
+    def test_mobile_create_body_result_sync_upload(self):
+        response = self.mobile_client.post(base_url + 'api/mobile/body/create_body_result/',
+                                           self.get_mobile_body_data(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body_result = BodyResult.objects.get(id=response.data['data']['id'])
+        self.assertEqual(body_result.image_front_key, helpers.generate_body_image_key(body_result, 'front'))
+        self.assertEqual(self.get_stored_image(body_result.image_side_key), base64.b64decode(image_png_base64))
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=False)
+    def test_mobile_create_body_result_ignores_server_fields(self):
+        rollup = BodyResultRollup.objects.create(bucket_key='other', year=2024, month=1)
+        data = self.get_mobile_body_data()
+        data['front_data']['results'].update({'image_status': 'done', 'rollup': rollup.id})
+        response = self.mobile_client.post(base_url + 'api/mobile/body/create_body_result/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body_result = BodyResult.objects.get(id=response.data['data']['id'])
+        self.assertIsNone(body_result.image_status)
+        self.assertNotEqual(body_result.rollup_id, rollup.id)
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=False)
+    def test_mobile_create_body_result_sync_upload_failure_removes_result(self):
+        with mock.patch('analysis.views_mobile.upload_image_to_s3', side_effect=OSError('S3 unavailable')):
+            response = self.mobile_client.post(base_url + 'api/mobile/body/create_body_result/',
+                                               self.get_mobile_body_data(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        # 커밋된 결과는 삭제되고, 업로드되었을 수 있는 이미지는 S3 삭제 대기열에 기록
+        self.assertFalse(BodyResult.objects.exists())
+        queued = set(S3ObjectDeletion.objects.values_list('key', flat=True))
+        self.assertEqual(len([key for key in queued if key.endswith(('-front.png', '-side.png'))]), 2)
+
+    @override_settings(IMAGE_UPLOAD_ASYNC=False)
+    def test_create_body_result_multipart(self):
+        png_data = base64.b64decode(image_png_base64)
+        data = {
+            'session_key': self.session_key,
+            'body_data': json.dumps(self.body_data['body_data']),
+            'image_front': SimpleUploadedFile('front.png', png_data, content_type='image/png'),
+            'image_side': SimpleUploadedFile('side.png', png_data, content_type='image/png'),
+        }
+        response = self.kiosk_client.post(base_url + 'api/analysis/body/create_result_multipart/', data,
+                                          format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        body_result = BodyResult.objects.get()
+        self.assertEqual(body_result.face_level_angle, 1.0)
+        self.assertEqual(body_result.image_front_key, helpers.generate_body_image_key(body_result, 'front'))
+        self.assertEqual(self.get_stored_image(body_result.image_front_key), png_data)
+
     def test_create_body_result_missing_session_key(self):
         invalid_data = {'body_data': self.body_data['body_data']}  # No session key provided
         response = self.kiosk_client.post(base_url + 'api/analysis/body/create_result/', invalid_data, format='json')
@@ -277,3 +495,733 @@ class mobileTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class PasswordHashServiceTests(TestCase):
+    @override_settings(PASSWORD_HASH_WORKERS=1)
+    def test_mobile_login_reuses_default_hash_from_process_pool(self):
+        password_hasher.reset()
+        self.addCleanup(password_hasher.reset)
+
+        client = APIClient()
+        for uuid in ['uuid-1', 'uuid-2']:
+            response = client.post('/api/mobile/login-mobile-uuid/', {'uuid': uuid}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # 자동 가입 계정은 프로세스 공용 초기 비밀번호 해시를 재사용 (해시는 풀 프로세스에서 계산)
+        hashes = set(UserInfo.objects.filter(phone_number__in=['uuid-1', 'uuid-2']).values_list('password', flat=True))
+        self.assertEqual(hashes, {password_hasher.default_password_hash()})
+        self.assertIsNotNone(password_hasher._executor)
+
+        UserInfo.objects.create(username='changed', phone_number='changed', password=make_password('changed'))
+        for user_id, raw_password, is_default in [('uuid-1', os.environ['DEFAULT_PASSWORD'], True),
+                                                  ('changed', 'changed', False)]:
+            response = client.post('/api/mobile/login-mobile-id/', {'id': user_id, 'password': raw_password},
+                                   format='json')
+            self.assertEqual(response.json()['data']['is_default_password'], is_default)
+        response = client.post('/api/mobile/login-mobile-id/', {'id': 'uuid-1', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.json()['message'], 'user_not_found')
+
+    @override_settings(DEFAULT_PASSWORD_HASH_TTL=0)
+    def test_default_hash_expires(self):
+        password_hasher.reset()
+        self.addCleanup(password_hasher.reset)
+
+        # TTL 이 지나면 새 salt 로 다시 계산 (같은 해시를 공유하는 계정 범위 제한)
+        first, second = password_hasher.default_password_hash(), password_hasher.default_password_hash()
+        self.assertNotEqual(first, second)
+        self.assertTrue(password_hasher.verify_password(os.environ['DEFAULT_PASSWORD'], second))
+
+
+class S3ObjectIndexTests(TestCase):
+    """로컬 파일시스템 S3(AWS_S3_LOCAL_ROOT)로 객체 존재 여부 인덱스 검증"""
+
+    def setUp(self):
+        self.s3_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(AWS_S3_LOCAL_ROOT=self.s3_root)
+        self.settings_override.enable()
+        s3_io.reset()
+        cache.clear()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        s3_io.reset()
+        cache.clear()
+        shutil.rmtree(self.s3_root)
+
+    def test_upload_populates_index(self):
+        helpers.upload_image_to_s3(base64.b64decode(image_png_base64), ['front', '20240101T000000000000'])
+        self.assertTrue(S3ObjectIndex.objects.get(key='front-20240101T000000000000.png').exists)
+        self.assertTrue(helpers.s3_object_exists('front-20240101T000000000000.png'))
+        self.assertFalse(helpers.s3_object_exists('side-20240101T000000000000.png'))
+
+    def test_png_uploaded_without_reencoding(self):
+        png_data = base64.b64decode(image_png_base64)
+        self.assertEqual(helpers.sniff_png(png_data), (30, 30))
+
+        s3 = helpers.get_s3_client()
+        file_name = helpers.upload_image_to_s3(png_data, ['front', '20240101T000000000000'])
+        stored = s3.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_name)['Body'].read()
+        self.assertEqual(stored, png_data)  # 원본 바이트 그대로 저장
+
+        # PNG 가 아닌 입력은 PNG 로 변환 후 업로드
+        buffer = BytesIO()
+        Image.open(BytesIO(png_data)).convert('RGB').save(buffer, format='JPEG')
+        self.assertIsNone(helpers.sniff_png(buffer.getvalue()))
+        file_name = helpers.upload_image_to_s3(buffer.getvalue(), ['side', '20240101T000000000000'])
+        stored = s3.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=file_name)['Body'].read()
+        self.assertEqual(stored[:8], helpers.PNG_SIGNATURE)
+
+    def test_image_variants_selected_by_width(self):
+        front_key = helpers.upload_image_to_s3(base64.b64decode(image_png_base64), ['front', '20240101T000000000000'])
+        side_key = helpers.upload_image_to_s3(base64.b64decode(image_png_base64), ['side', '20240101T000000000000'])
+        variant_keys = helpers.create_image_variants(front_key)
+        self.assertEqual(variant_keys, ['front-20240101T000000000000.medium.webp',
+                                        'front-20240101T000000000000.thumb.webp'])
+
+        body_result = BodyResult(id=1, image_front_key=front_key, image_side_key=side_key, created_dt=datetime(2024, 1, 1))
+        front_url, side_url = helpers.get_body_image_variant_urls(body_result, 200)
+        self.assertIn('.thumb.webp', front_url)
+        self.assertIn('side-20240101T000000000000.png', side_url)  # 파생 이미지가 없으면 원본
+        self.assertIn('.medium.webp', helpers.get_body_image_variant_urls(body_result, 800)[0])
+        self.assertIn('.png', helpers.get_body_image_variant_urls(body_result, 4000)[0])
+
+    def test_s3_io_uses_shared_executor(self):
+        futures = [s3_io.submit(helpers.upload_image_to_s3, base64.b64decode(image_png_base64), ['front', str(i)])
+                   for i in range(3)]
+        self.assertEqual([future.result() for future in futures], ['front-0.png', 'front-1.png', 'front-2.png'])
+        self.assertIs(s3_io._get_executor(), s3_io._get_executor())
+        self.assertEqual(s3_io_queue_depth._value.get(), 0)
+        self.assertEqual(s3_inflight_transfers._value.get(), 0)
+
+    def test_backfill_from_bucket_listing(self):
+        s3 = helpers.get_s3_client()
+        for i in range(5):
+            s3.put_object(Bucket='test-bucket', Key=f'front-{i}.png', Body=b'png')
+
+        with override_settings(AWS_STORAGE_BUCKET_NAME='test-bucket'):
+            indexed_count = helpers.backfill_s3_object_index(page_size=2)  # 페이지 3개로 나누어 스캔
+            self.assertEqual(helpers.backfill_s3_object_index(), 5)  # 다시 스캔해도 항목은 갱신만 됨
+
+        self.assertEqual(indexed_count, 5)
+        keys = [f'front-{i}.png' for i in range(5)]
+        self.assertEqual(list(S3ObjectIndex.objects.filter(key__in=keys).values_list('exists', flat=True)), [True] * 5)
+
+        # 만료된 항목은 조회 시 무시하고 스케줄러에서 정리
+        S3ObjectIndex.objects.filter(key='front-4.png').update(expires_dt=datetime(2000, 1, 1))
+        self.assertEqual(helpers._get_s3_index(['front-3.png', 'front-4.png']), {'front-3.png': True})
+        helpers.purge_s3_object_index()
+        self.assertEqual(list(S3ObjectIndex.objects.filter(key__in=keys).values_list('key', flat=True).order_by('key')),
+                         keys[:4])
+
+    def test_presigned_urls_reused_until_refresh(self):
+        s3 = helpers.get_s3_client()
+        file_keys_list = [['front', '20240101T000000000000'], ['side', '20240101T000000000000']]
+        with mock.patch.object(s3, 'generate_presigned_url', wraps=s3.generate_presigned_url) as sign:
+            first = helpers.generate_presigned_urls(file_keys_list)
+            second = helpers.generate_presigned_urls(file_keys_list)
+            self.assertEqual(first, second)
+            self.assertEqual(sign.call_count, 2)  # 두 번째 호출은 캐시 재사용
+
+            with override_settings(AWS_PRESIGNED_REUSE_FRACTION=0):  # 재사용 비활성화 시 매번 서명
+                helpers.generate_presigned_urls(file_keys_list, expiration=60)
+                helpers.generate_presigned_urls(file_keys_list, expiration=60)
+            self.assertEqual(sign.call_count, 6)
+
+
+class S3DeletionTests(TestCase):
+    """BodyResult 삭제 시 S3 이미지 삭제 대기열 / 일괄 삭제 검증"""
+
+    def setUp(self):
+        self.s3_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(AWS_S3_LOCAL_ROOT=self.s3_root)
+        self.settings_override.enable()
+        s3_io.reset()
+        cache.clear()
+
+        self.user_info = UserInfo.objects.create(username=phone_number, phone_number=phone_number)
+        school = SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        self.body_result = BodyResult.objects.create(user=self.user_info, school=school)
+        created_dt = self.body_result.created_dt.strftime('%Y%m%dT%H%M%S%f')
+        png_data = base64.b64decode(image_png_base64)
+        self.body_result.image_front_key = helpers.upload_image_to_s3(png_data, ['front', created_dt])
+        self.body_result.image_side_key = helpers.upload_image_to_s3(png_data, ['side', created_dt])
+        self.body_result.save(update_fields=['image_front_key', 'image_side_key'])
+
+    def tearDown(self):
+        self.settings_override.disable()
+        s3_io.reset()
+        cache.clear()
+        shutil.rmtree(self.s3_root)
+
+    def test_cascade_delete_enqueues_and_reaps_images(self):
+        self.user_info.delete()  # 회원 삭제 -> BodyResult CASCADE 삭제
+        self.assertEqual(S3ObjectDeletion.objects.count(), 2 * (1 + len(settings.BODY_IMAGE_VARIANTS)))
+
+        # 여러 프로세스의 스케줄러가 동시에 실행해도 같은 row 를 처리하지 않도록 lock 된 row 는 건너뜀
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(reap_s3_deletions(), (6, 0))
+        self.assertTrue(any('FOR UPDATE SKIP LOCKED' in query['sql'] for query in queries))
+        self.assertFalse(S3ObjectDeletion.objects.exists())
+        self.assertFalse(helpers.s3_object_exists(self.body_result.image_front_key))
+
+    def test_migrate_legacy_keys_to_partitioned_layout(self):
+        legacy_front_key = self.body_result.image_front_key
+        call_command('migrate_body_image_keys', stdout=StringIO())
+
+        self.body_result.refresh_from_db()
+        self.assertEqual(self.body_result.image_front_key,
+                         f'{self.body_result.created_dt:%Y/%m}/{self.user_info.id}/{self.body_result.id}-front.png')
+        self.assertTrue(helpers.s3_object_exists(self.body_result.image_front_key))
+        self.assertTrue(helpers.s3_object_exists(legacy_front_key))  # 기존 객체는 전환 기간 동안 유지
+
+        # 삭제 시 신규 / 기존 key 모두 삭제 대기열에 등록
+        self.body_result.delete()
+        self.assertTrue(S3ObjectDeletion.objects.filter(key=legacy_front_key).exists())
+        self.assertTrue(S3ObjectDeletion.objects.filter(key=self.body_result.image_front_key).exists())
+
+    def test_reconcile_enqueues_orphan_objects(self):
+        s3 = helpers.get_s3_client()
+        s3.put_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key='front-20200101T000000000000.png', Body=b'png')
+
+        call_command('reconcile_s3_objects', '--min-age-hours', '0', '--enqueue', stdout=StringIO())
+        self.assertEqual(list(S3ObjectDeletion.objects.values_list('key', flat=True)),
+                         ['front-20200101T000000000000.png'])
+
+
+class CodeInfoRegistryTests(TestCase):
+    def setUp(self):
+        # 레지스트리 버전 / 스냅샷 초기화 -> 이 테스트의 CodeInfo 로 다시 읽고, 다음 테스트에 스냅샷을 남기지 않음
+        cache.clear()
+        code_info_registry.reset()
+        self.addCleanup(cache.clear)
+        self.addCleanup(code_info_registry.reset)
+        self.school = SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        self.user_info = UserInfo.objects.create(username=phone_number, phone_number=phone_number)
+        codes = ['velocity', 'stride_len_l', 'stride_len_r', 'swing_perc_l', 'swing_perc_r',
+                 'stance_perc_l', 'stance_perc_r', 'd_supp_perc_l', 'd_supp_perc_r']
+        CodeInfo.objects.bulk_create([
+            CodeInfo(group_id='02', code_id=code_id, code_name=code_id, min_value=0, max_value=100,
+                     normal_min_value=50, normal_max_value=100, caution_min_value=20, caution_max_value=20,
+                     direction='positive')
+            for code_id in codes
+        ] + [CodeInfo(group_id='02', code_id='score', code_name='score', min_value=0, max_value=100)])
+
+    def test_gait_score_reads_registry(self):
+        GaitResult(user=self.user_info, school=self.school, velocity=80).save()  # 레지스트리 로딩 (CodeInfo 1회 조회)
+
+        gait_result = GaitResult(user=self.user_info, school=self.school, velocity=80, stride_len_l=80, stride_len_r=80)
+        with self.assertNumQueries(1):  # INSERT 만 실행
+            gait_result.save()
+        self.assertAlmostEqual(gait_result.score, (0.3 * 30 / 50 + 0.7) * 100)
+
+    def test_save_invalidates_other_processes(self):
+        other_process_registry = CodeInfoRegistry()
+        self.assertEqual(other_process_registry.get('velocity').normal_min_value, 50)
+
+        code_info = CodeInfo.objects.get(code_id='velocity')
+        code_info.normal_min_value = 60
+        with self.captureOnCommitCallbacks(execute=True):
+            code_info.save()
+
+        self.assertEqual(code_info_registry.get('velocity').normal_min_value, 60)
+        self.assertEqual(other_process_registry.get('velocity').normal_min_value, 60)
+
+    def test_batch_scores(self):
+        rows = [{'velocity': 10, 'stride_len_l': 35}, {'velocity': None}, {'velocity': 150, 'd_supp_perc_r': -5}]
+        scores = score_gait_batch({field: [row.get(field) for row in rows] for field in GAIT_SCORE_FIELDS})
+
+        # (0.4 * 10 / 20 + 0.3 * 15 / 30 + 0.4) / 2, 측정값 없음, (최대값으로 clip 1.0 + 최소값으로 clip 0) / 2
+        np.testing.assert_allclose(scores, [37.5, np.nan, 50.0])
+        gait_result = GaitResult(**rows[0])
+        gait_result.calculate_score()
+        self.assertEqual(gait_result.score, scores[0])
+
+    def test_normal_ratio_reads_registry(self):
+        CodeInfo.objects.create(group_id='01', code_id='face_level_angle', code_name='얼굴 기울기',
+                                normal_min_value=-2, normal_max_value=2)
+        CodeInfo.objects.create(group_id='01', code_id='hip_level_angle', code_name='골반 기울기',
+                                normal_min_value=-2, normal_max_value=2)
+
+        body_result = BodyResult(face_level_angle=2, hip_level_angle=3.5, shoulder_level_angle=1)
+        self.assertEqual(helpers.calculate_normal_ratio(body_result), ('1/11', {'얼굴 기울기': '', '골반 기울기': '주의'}))
+
+    def test_rescore_gait_after_threshold_change(self):
+        gait_results = [GaitResult.objects.create(user=self.user_info, school=self.school, velocity=velocity)
+                        for velocity in (40, 80, None)]
+        self.assertAlmostEqual(gait_results[0].score, (0.3 * 20 / 30 + 0.4) * 100)
+
+        code_info = CodeInfo.objects.get(code_id='velocity')
+        code_info.normal_min_value = 40
+        code_info.save()
+
+        checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir, ignore_errors=True)
+        checkpoint = f'{checkpoint_dir}/rescore_gait.checkpoint'
+        call_command('rescore_gait', '--chunk-size', '2', '--checkpoint', checkpoint, stdout=StringIO())
+
+        for gait_result in gait_results:
+            gait_result.refresh_from_db()
+        self.assertAlmostEqual(gait_results[0].score, (0.3 * 0 / 60 + 0.7) * 100)
+        self.assertAlmostEqual(gait_results[1].score, (0.3 * 40 / 60 + 0.7) * 100)
+        self.assertIsNone(gait_results[2].score)
+        with open(checkpoint) as f:
+            self.assertEqual(f.read(), str(gait_results[-1].id))
+
+
+class BodyNormalSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.school = SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        self.user_info = UserInfo.objects.create(username=phone_number, phone_number=phone_number)
+        CodeInfo.objects.create(group_id='01', code_id='face_level_angle', code_name='얼굴 기울기',
+                                normal_min_value=-2, normal_max_value=2)
+        CodeInfo.objects.create(group_id='01', code_id='hip_level_angle', code_name='골반 기울기',
+                                normal_min_value=-2, normal_max_value=2)
+
+    def test_summary_computed_on_save(self):
+        body_result = BodyResult.objects.create(user=self.user_info, school=self.school,
+                                                face_level_angle=1, hip_level_angle=3)
+        self.assertEqual((body_result.normal_count, body_result.caution_mask), (1, 1 << 2))
+
+        body_result.hip_level_angle = 0
+        body_result.save(update_fields=['hip_level_angle'])
+        body_result.refresh_from_db()
+        self.assertEqual((body_result.normal_count, body_result.caution_mask), (2, 0))
+        self.assertEqual(helpers.calculate_normal_ratio(body_result), ('2/11', {'얼굴 기울기': '', '골반 기울기': ''}))
+        self.assertTrue(BodyResult.objects.filter(normal_count__gte=2).exists())
+
+    def test_backfill_normal_summary(self):
+        body_result = BodyResult.objects.create(user=self.user_info, school=self.school,
+                                                face_level_angle=1, hip_level_angle=3)
+        BodyResult.objects.filter(id=body_result.id).update(normal_count=None, caution_mask=None)  # 기존 데이터
+
+        call_command('backfill_normal_summary', '--only-missing', stdout=StringIO())
+        body_result.refresh_from_db()
+        self.assertEqual((body_result.normal_count, body_result.caution_mask), (1, 1 << 2))
+
+        # 정상범위 기준 변경 후 재계산
+        CodeInfo.objects.filter(code_id='hip_level_angle').update(normal_max_value=5)
+        code_info_registry.invalidate()
+        checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir, ignore_errors=True)
+        checkpoint = f'{checkpoint_dir}/backfill_normal_summary.checkpoint'
+        out = StringIO()
+        call_command('backfill_normal_summary', '--dry-run', '--checkpoint', checkpoint, stdout=out)
+        self.assertIn('변경 대상 1건', out.getvalue())
+        self.assertFalse(os.path.exists(checkpoint))
+        body_result.refresh_from_db()
+        self.assertEqual(body_result.normal_count, 1)
+
+        call_command('backfill_normal_summary', '--checkpoint', checkpoint, stdout=StringIO())
+        body_result.refresh_from_db()
+        self.assertEqual((body_result.normal_count, body_result.caution_mask), (2, 0))
+        with open(checkpoint) as f:
+            self.assertEqual(f.read(), str(body_result.id))
+
+    def test_code_info_range_change_refreshes_summaries(self):
+        body_result = BodyResult.objects.create(user=self.user_info, school=self.school,
+                                                face_level_angle=1, hip_level_angle=3)
+
+        # 정상범위와 관계없는 필드 변경은 요약 유지
+        code_info = CodeInfo.objects.get(code_id='hip_level_angle')
+        code_info.code_name = '골반 좌우 기울기'
+        code_info.save()
+        body_result.refresh_from_db()
+        self.assertEqual(body_result.normal_count, 1)
+
+        # 정상범위 변경 -> 저장된 요약을 비우고 스케줄러 작업에서 현재 기준으로 다시 계산
+        code_info.normal_max_value = 5
+        with self.captureOnCommitCallbacks(execute=True):
+            code_info.save()
+        body_result.refresh_from_db()
+        self.assertIsNone(body_result.normal_count)
+        self.assertEqual(helpers.calculate_normal_ratio(body_result)[0], '2/11')
+
+        self.assertEqual(refresh_missing_normal_summaries(), 1)
+        body_result.refresh_from_db()
+        self.assertEqual((body_result.normal_count, body_result.caution_mask), (2, 0))
+
+
+class ReportQueryTests(TestCase):
+    def setUp(self):
+        self.past_year = datetime.now().year - 1
+        self.school = SchoolInfo.objects.create(school_name='테스트초', contact_number='N/A')
+        self.admin = UserInfo.objects.create(username='admin', phone_number='admin', user_type='S', school=self.school)
+        self.client.force_login(self.admin)
+        session = self.client.session
+        session['selected_year'] = str(self.past_year)
+        session['selected_group'] = '1학년 1반'
+        session.save()
+
+    def add_students(self, start, count):
+        # 절반은 작년 UserHist, 절반은 작년 UserInfo 로만 등록, 각자 작년 검사 결과 1건
+        for i in range(start, start + count):
+            student = UserInfo.objects.create(username=f'0100000{i:04d}', phone_number=f'0100000{i:04d}',
+                                              user_type='S', school=self.school, student_grade=1, student_class=1,
+                                              student_number=i, year=self.past_year)
+            if i % 2:
+                UserHist.objects.create(user=student, school=self.school, student_grade=1, student_class=1,
+                                        student_number=i, year=self.past_year)
+            body_result = BodyResult.objects.create(user=student, school=self.school,
+                                                    image_front_key=f'f{i}.png', image_side_key=f's{i}.png')
+            BodyResult.objects.filter(id=body_result.id).update(created_dt=datetime(self.past_year, 3, 1))
+
+    def get_report(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('report'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_past_year_report_query_count_is_constant(self):
+        self.add_students(0, 2)
+        response, small_count = self.get_report()
+        self.assertEqual(response.context['valid_count'], 2)
+
+        self.add_students(2, 8)
+        response, large_count = self.get_report()
+        self.assertEqual(response.context['valid_count'], 10)
+        self.assertTrue(all(result['created_dt'] == f'{self.past_year}-03-01 00:00:00'
+                            for result in response.context['user_results']))
+        self.assertEqual(large_count, small_count)
+        self.assertLessEqual(large_count, 10)
+
+    def test_year_group_map_cached_and_invalidated(self):
+        cache.clear()
+        self.add_students(0, 2)  # 작년 1학년 1반 (UserHist / UserInfo 중복)
+        student = UserInfo.objects.get(student_number=1)
+        UserHist.objects.create(user=student, school=self.school, student_grade=2, student_class=3,
+                                year=self.past_year - 1)
+        expected = {str(self.past_year - 1): ['2학년 3반'], str(self.past_year): ['1학년 1반'],
+                    'None': ['None학년 None반']}  # 학년/반이 없는 관리자 (화면에서 제외)
+        self.assertEqual(get_year_group_map(self.school.id), expected)
+        with self.assertNumQueries(0):
+            get_year_group_map(self.school.id)
+
+        # 회원 등록으로 반 구성이 바뀌면 다시 조회
+        with self.captureOnCommitCallbacks(execute=True):
+            student.student_class = 2
+            student.save(update_fields=['student_class'])
+        self.assertEqual(get_year_group_map(self.school.id)[str(self.past_year)], ['1학년 1반', '1학년 2반'])
+
+    def test_report_download_writes_styled_workbook(self):
+        cache.clear()
+        CodeInfo.objects.create(group_id='01', code_id='face_level_angle', code_name='얼굴 기울기',
+                                normal_min_value=0, normal_max_value=1)
+        self.add_students(0, 3)
+        UserInfo.objects.create(username='01000009999', phone_number='01000009999', user_type='S', school=self.school,
+                                student_grade=1, student_class=1, student_number=99, year=self.past_year)
+        BodyResult.objects.filter(user__student_number=0).update(face_level_angle=5, normal_count=0, caution_mask=1)
+        BodyResult.objects.filter(user__student_number__gt=0).update(face_level_angle=0.5, normal_count=8,
+                                                                      caution_mask=0)
+
+        response = self.client.get(reverse('report_download'), {'year': self.past_year, 'group': '1학년 1반'})
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(workbook.sheetnames, ['통계', '데이터'])
+
+        rows = list(workbook['데이터'].iter_rows(values_only=True))
+        self.assertEqual(rows[0], ('학년', '반', '번호', '이름', '검사일', '검사결과', '정상범위', '얼굴 기울기'))
+        # UserHist(1번) -> UserInfo(0, 2, 99번) 순
+        self.assertEqual([(row[2], row[5], row[6], row[7]) for row in rows[1:]],
+                         [(1, 'O', '8/11', None), (0, 'O', '0/11', '주의'), (2, 'O', '8/11', None),
+                          (99, 'X', None, None)])
+        highlighted = [row[6].fill.fgColor.rgb == '00FFB6C1' for row in workbook['데이터'].iter_rows(min_row=2)]
+        self.assertEqual(highlighted, [False, True, False, False])
+        self.assertEqual(list(workbook['통계'].iter_rows(values_only=True)),
+                         [('항목', '인원수'), ('총 인원수', 4), ('검사를 받은 인원수', 3), ('얼굴 기울기 주의 인원수', 1)])
+
+    @override_settings(REPORT_EXPORT_SYNC_MAX_ROWS=2)
+    def test_large_report_download_runs_as_deduplicated_job(self):
+        s3_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, s3_root)
+        self.addCleanup(s3_io.reset)
+        self.add_students(0, 3)
+        params = {'year': self.past_year, 'group': '1학년 1반'}
+
+        # 행 수가 기준을 넘으면 작업 등록 후 진행 화면으로 이동, 같은 요청은 같은 작업 재사용
+        first = self.client.get(reverse('report_download'), params)
+        second = self.client.get(reverse('report_download'), params)
+        job = ReportExportJob.objects.get()
+        self.assertRedirects(first, reverse('report_export_status', args=[job.id]), fetch_redirect_response=False)
+        self.assertEqual(second.url, first.url)
+        self.assertEqual((job.status, job.total_rows), ('pending', 3))
+
+        with override_settings(AWS_S3_LOCAL_ROOT=s3_root):
+            s3_io.reset()
+            self.assertEqual(run_export_worker(once=True), 1)
+            status = self.client.get(first.url, {'format': 'json'}).json()
+        self.assertEqual((status['status'], status['processed_rows'], status['progress']), ('done', 3, 100))
+        self.assertIsNotNone(status['download_url'])
+        job.refresh_from_db()
+        workbook = load_workbook(f'{s3_root}/{settings.AWS_STORAGE_BUCKET_NAME}/{job.file_key}')
+        self.assertEqual(len(list(workbook['데이터'].iter_rows())), 4)
+
+        # 완료된 파일 재사용, 검사 결과가 추가되면 새 작업 등록
+        self.assertEqual(self.client.get(reverse('report_download'), params).url, first.url)
+
+        # 남은 보관 시간이 다운로드 URL 유효 시간보다 짧으면 만료 직전 파일 대신 새 작업 등록
+        near_expiry = (timezone.now() - timedelta(hours=settings.REPORT_EXPORT_RETENTION_HOURS)
+                       + timedelta(seconds=settings.AWS_PRESIGNED_EXPIRATION - 60))
+        ReportExportJob.objects.filter(id=job.id).update(updated_dt=near_expiry)
+        fresh = self.client.get(reverse('report_download'), params)
+        self.assertNotEqual(fresh.url, first.url)
+        ReportExportJob.objects.exclude(id=job.id).delete()
+        ReportExportJob.objects.filter(id=job.id).update(updated_dt=timezone.now())
+
+        self.add_students(3, 1)
+        self.assertNotEqual(self.client.get(reverse('report_download'), params).url, first.url)
+        self.assertEqual(ReportExportJob.objects.count(), 2)
+
+    @override_settings(ORG_REPORT_PAGE_SIZE=2)
+    def test_organization_report_paginates_and_sorts(self):
+        organization = OrganizationInfo.objects.create(organization_name='테스트기관')
+        null_school = SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        admin = UserInfo.objects.create(username='org-admin', phone_number='org-admin', user_type='O',
+                                        organization=organization)
+        for i in range(5):
+            member = UserInfo.objects.create(username=f'0200000000{i}', phone_number=f'0200000000{i}', user_type='O',
+                                             organization=organization, department='개발', student_name=f'회원{i}')
+            if i % 2 == 0:  # 회원0, 회원2, 회원4 만 검사 (정상범위 항목 수 i)
+                BodyResult.objects.create(user=member, school=null_school, image_front_key=f'f{i}.png',
+                                          image_side_key=f's{i}.png')
+                BodyResult.objects.filter(user=member).update(normal_count=i)
+        self.client.force_login(admin)
+        session = self.client.session
+        session['selected_group'] = '개발'
+        session.save()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('report'), {'sort': 'normal_count', 'page': 2})
+        context = response.context
+        self.assertEqual((context['total_users'], context['valid_count'], context['low_normal_count']), (5, 3, 3))
+        # 정상범위 오름차순 (결과 없는 회원은 마지막): 회원0, 회원2 | 회원4, 회원1 | 회원3
+        self.assertEqual([result['user'].student_name for result in context['user_results']], ['회원4', '회원1'])
+        self.assertEqual(context['page_obj'].paginator.num_pages, 3)
+        self.assertLessEqual(len(queries), 10)
+        # 서버 페이지 이동만 표시 (화면 페이지 나누기 버튼 없음), 검사일 정렬 기준 컬럼 표시
+        self.assertContains(response, 'data-server-paginated="true"')
+        self.assertNotContains(response, 'id="prevPage"')
+        self.assertContains(response, '>검사일</a>')
+        self.assertIsNotNone(context['user_results'][0]['created_dt'])
+        self.assertIsNone(context['user_results'][1]['created_dt'])
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        year = datetime.now().year
+        self.school = SchoolInfo.objects.create(school_name='테스트초', contact_number='N/A')
+        self.admin = UserInfo.objects.create(username='admin', phone_number='admin', user_type='S', school=self.school)
+        self.students = [
+            UserInfo.objects.create(username=f'0100000000{i}', phone_number=f'0100000000{i}', user_type='S',
+                                    school=self.school, student_grade=1, student_class=i % 2 + 1, year=year)
+            for i in range(3)
+        ]
+        BodyResult.objects.create(user=self.students[0], school=self.school, face_level_angle=1,
+                                  image_front_key='front.png', image_side_key='side.png')
+
+    def test_school_stats_cached_and_invalidated(self):
+        stats = get_dashboard_stats(self.admin)
+        self.assertEqual(stats['total_members'], 4)  # 관리자 포함
+        self.assertEqual(stats['total_results'], 1)
+        self.assertEqual(stats['current_month_results'], 1)
+        self.assertEqual(stats['pending_tests'], 2)
+        self.assertEqual(stats['group_structure'], {'1': {'1': 2, '2': 1}})
+
+        with self.assertNumQueries(0):
+            get_dashboard_stats(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BodyResult.objects.create(user=self.students[1], school=self.school,
+                                      image_front_key='front2.png', image_side_key='side2.png')
+        stats = get_dashboard_stats(self.admin)
+        self.assertEqual((stats['total_results'], stats['pending_tests']), (2, 1))
+
+    def test_main_view(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('main'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_results'], 1)
+        self.assertEqual(response.context['pending_tests'], 2)
+
+    def test_legacy_result_without_keys_counts_as_completed(self):
+        # backfill_body_image_keys 실행 전의 기존 row 는 image_*_url 만 있음
+        BodyResult.objects.create(user=self.students[1], school=self.school,
+                                  image_front_url='https://bucket/front.png', image_side_url='https://bucket/side.png')
+        cache.clear()
+        self.assertEqual(get_dashboard_stats(self.admin)['pending_tests'], 1)
+
+
+class BodyResultRollupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for code_id in ['face_level_angle', 'hip_level_angle']:
+            CodeInfo.objects.create(group_id='01', code_id=code_id, code_name=code_id,
+                                    normal_min_value=0, normal_max_value=1)
+        self.school = SchoolInfo.objects.create(school_name='테스트초', contact_number='N/A')
+        self.students = [
+            UserInfo.objects.create(username=f'0100000000{i}', phone_number=f'0100000000{i}', user_type='S',
+                                    school=self.school, student_grade=1, student_class=1)
+            for i in range(2)
+        ]
+
+    def create_result(self, user, **kwargs):
+        # face_level_angle, hip_level_angle 주의 (caution_mask = 0b101)
+        return BodyResult.objects.create(user=user, school=self.school, student_grade=1, student_class=1,
+                                         face_level_angle=5, hip_level_angle=5, **kwargs)
+
+    def assertRollup(self, result_count, tested_user_count):
+        rollup = BodyResultRollup.objects.get(school=self.school)
+        self.assertEqual((rollup.result_count, rollup.tested_user_count), (result_count, tested_user_count))
+        return rollup
+
+    def test_rollup_follows_completion_and_delete(self):
+        first = self.create_result(self.students[0], image_front_key='f1.png', image_side_key='s1.png')
+        self.create_result(self.students[0], image_front_key='f2.png', image_side_key='s2.png')
+        pending = self.create_result(self.students[1])
+        rollup = self.assertRollup(2, 1)
+        self.assertEqual(rollup.caution_counts[:3], [2, 0, 2])
+
+        # 이미지 업로드 완료 시 반영 (두 번 저장해도 한 번만 더함)
+        pending.image_front_key, pending.image_side_key = 'f3.png', 's3.png'
+        pending.save(update_fields=['image_front_key', 'image_side_key'])
+        pending.save()
+        self.assertRollup(3, 2)
+
+        first.delete()
+        self.assertRollup(2, 2)
+        pending.delete()
+        rollup = self.assertRollup(1, 1)
+
+        # 재계산 결과가 증분 갱신 결과와 같음
+        self.assertEqual(rebuild_rollups(), 1)
+        rebuilt = self.assertRollup(1, 1)
+        self.assertEqual((rebuilt.low_normal_count, rebuilt.caution_counts), (rollup.low_normal_count,
+                                                                               rollup.caution_counts))
+        self.assertEqual(BodyResult.objects.get().rollup, rebuilt)
+
+    def test_rebuild_command_if_empty(self):
+        self.create_result(self.students[0], image_front_key='f1.png', image_side_key='s1.png')
+        BodyResultRollup.objects.all().delete()  # 통계 테이블 생성 전에 저장된 결과
+
+        call_command('rebuild_body_result_rollup', '--if-empty', stdout=StringIO())
+        self.assertRollup(1, 1)
+
+        # 이미 집계가 있으면 다시 계산하지 않음 (배포마다 실행)
+        BodyResultRollup.objects.update(result_count=5)
+        call_command('rebuild_body_result_rollup', '--if-empty', stdout=StringIO())
+        self.assertRollup(5, 1)
+
+
+class JobWorkerTests(SimpleTestCase):
+    """작업 큐 공용 워커 루프 (이미지 업로드 / 엑셀 다운로드 / 회원 등록)"""
+
+    def test_worker_continues_after_job_error(self):
+        jobs = [mock.Mock(id=1), mock.Mock(id=2)]
+        claim_jobs = mock.Mock(side_effect=[jobs, []])
+        process_job = mock.Mock(side_effect=[DatabaseError('connection lost'), True])
+
+        with self.assertLogs('analysis.custom.job_worker', 'ERROR'):
+            self.assertEqual(run_job_worker(claim_jobs, process_job, once=True), 2)
+        process_job.assert_has_calls([mock.call(jobs[0]), mock.call(jobs[1])])
+
+    def test_worker_retries_failed_claim(self):
+        claim_jobs = mock.Mock(side_effect=[DatabaseError('failover'), [mock.Mock(id=1)], KeyboardInterrupt])
+        with self.assertLogs('analysis.custom.job_worker', 'ERROR'), self.assertRaises(KeyboardInterrupt):
+            run_job_worker(claim_jobs, mock.Mock(), poll_interval=0)
+        self.assertEqual(claim_jobs.call_count, 3)
+
+
+class MemberImportTests(TestCase):
+    def setUp(self):
+        self.year = datetime.now().year
+        self.school = SchoolInfo.objects.create(school_name='테스트초', contact_number='N/A')
+        self.admin = UserInfo.objects.create(username='admin', phone_number='admin', user_type='S', school=self.school)
+        self.client.force_login(self.admin)
+
+    def upload(self, rows):
+        excel = BytesIO()
+        pd.DataFrame(rows, columns=['학년', '반', '번호', '이름', '전화번호']).to_excel(excel, index=False)
+        excel.name = 'members.xlsx'
+        excel.seek(0)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('member_register'), {'file': excel, 'save': 'true'})
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_bulk_import_creates_updates_and_snapshots_history(self):
+        last_year = UserInfo.objects.create(username='01000000001', phone_number='01000000001', user_type='S',
+                                            school=self.school, student_grade=1, student_class=1, student_number=1,
+                                            student_name='작년', year=self.year - 1)
+        rows = [[2, 1, 1, '작년', '010-0000-0001'], [2, 1, 2, '신규', '1000000002'],
+                [2, 1, 3, '신규(수정)', '01000000002'], *[[3, 1, i, f'학생{i}', f'0100001{i:04d}'] for i in range(20)]]
+        result, query_count = self.upload(rows)
+        self.assertLessEqual(query_count, 12)
+        self.assertEqual((result['existing_member'], result['new_member']), (2, 21))
+
+        last_year.refresh_from_db()
+        self.assertEqual((last_year.student_grade, last_year.year), (2, self.year))
+        self.assertEqual(last_year.user_display_name, '테스트초 2학년 1반 1번 작년')
+        self.assertTrue(last_year.check_password(os.environ['DEFAULT_PASSWORD']))
+        self.assertEqual(list(UserHist.objects.values_list('user_id', 'student_grade', 'year')),
+                         [(last_year.id, 1, self.year - 1)])
+        # 같은 전화번호는 마지막 행 값으로 저장
+        self.assertEqual(UserInfo.objects.get(phone_number='01000000002').student_number, 3)
+        self.assertEqual(UserInfo.objects.filter(school=self.school, year=self.year).count(), 22)
+
+        # 다시 올려도 이력은 중복 생성되지 않고, 행 수가 늘어도 쿼리 수는 그대로
+        rows += [[3, 2, i, f'추가{i}', f'0100002{i:04d}'] for i in range(20)]
+        result, second_query_count = self.upload(rows)
+        self.assertEqual((result['existing_member'], result['new_member']), (23, 20))
+        self.assertEqual(UserHist.objects.count(), 1)
+        self.assertLessEqual(second_query_count, query_count)
+
+    def test_preview_normalizes_columns_and_reports_bad_rows(self):
+        df = pd.DataFrame({
+            '학년': [1, 2.0, '3', None, 1, None],
+            '반': [1, 1, 1, 1, 1.5, None],
+            '번호': [1, 2, 3, 4, 5, None],
+            '이름': [' 홍길동 ', '김철수', '이영희', '박민수', None, None],
+            '전화번호': ['010-1234-5678', '1012345679', '010 1234 5680', '01012345681', '12', None],
+        })
+        users, errors = parse_member_frame(df, 'S')
+        self.assertEqual(users, [
+            {'학년': '1', '반': '1', '번호': '1', '이름': '홍길동', '전화번호': '01012345678'},
+            {'학년': '2', '반': '1', '번호': '2', '이름': '김철수', '전화번호': '01012345679'},
+            {'학년': '3', '반': '1', '번호': '3', '이름': '이영희', '전화번호': '01012345680'},
+        ])
+        # 빈 행(7행)은 무시
+        self.assertEqual(errors, [
+            {'row': 5, 'errors': ['학년 누락']},
+            {'row': 6, 'errors': ['반은(는) 숫자여야 합니다', '이름 누락', '전화번호 형식 오류']},
+        ])
+        with self.assertRaises(ValueError):
+            parse_member_frame(df, 'O')
+
+    @override_settings(MEMBER_IMPORT_SYNC_MAX_ROWS=2, MEMBER_IMPORT_CHUNK_SIZE=2)
+    def test_large_upload_imports_in_resumable_chunks(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir)
+        rows = [[1, 1, i, f'학생{i}', f'0100003{i:04d}'] for i in range(5)]
+        with override_settings(MEMBER_IMPORT_SPOOL_DIR=spool_dir):
+            result, _ = self.upload(rows)
+        job = MemberImportJob.objects.get(id=result['job_id'])
+        self.assertEqual((job.status, job.total_rows), ('pending', 5))
+        self.assertFalse(UserInfo.objects.exclude(id=self.admin.id).exists())  # 요청에서는 저장하지 않음
+
+        # 두 번째 chunk 에서 실패하면 롤백 후 커밋된 chunk 다음(3행)부터 재시도
+        chunks = []
+
+        def flaky_import(admin, users, **kwargs):
+            chunks.append([user['번호'] for user in users])
+            if len(chunks) == 2:
+                raise RuntimeError('connection lost')
+            return import_members(admin, users, **kwargs)
+
+        with mock.patch('analysis.custom.import_jobs.import_members', side_effect=flaky_import):
+            self.assertEqual(run_import_worker(once=True), 2)
+        self.assertEqual(chunks, [['0', '1'], ['2', '3'], ['2', '3'], ['4']])
+
+        status = self.client.get(result['status_url']).json()
+        self.assertEqual((status['status'], status['processed_rows'], status['progress']), ('done', 5, 100))
+        self.assertEqual((status['existing_member'], status['new_member']), (0, 5))
+        self.assertEqual(UserInfo.objects.filter(school=self.school, year=self.year).count(), 5)
+        self.assertEqual(os.listdir(spool_dir), [])
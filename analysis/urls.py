@@ -39,10 +39,12 @@ urlpatterns = [
     path('main/', views.main, name='main'),
     path('org_register/', views.org_register, name='org_register'),
     path('member_register/' , views.member_register, name='member_register'),
+    path('member_register/<int:id>/', views.member_import_status, name='member_import_status'),
     path('report/', views.report, name='report'),
     path('report/protected/', views.report_detail_protected, name='report_detail_protected'),
     path('report/<int:id>/', views.report_detail, name='report_detail'),
     path('report_download/', views.report_download, name='report_download'),
+    path('report_download/<int:id>/', views.report_export_status, name='report_export_status'),
     path('no-result/', views.no_result, name='no_result'),
     path('policy/', views.policy, name='policy'),
     path('logout/', auth_views.LogoutView.as_view(next_page='login'), name='logout'),
@@ -68,6 +70,8 @@ urlpatterns = [
     path('api/analysis/gait/create_result/', views.create_gait_result, name='create_gait_result'),
     path('api/analysis/gait/get_result/', views.get_gait_result, name='get_gait_result'),
     path('api/analysis/body/create_result/', views.create_body_result, name='create_body_result'),
+    path('api/analysis/body/create_result_multipart/', views.create_body_result_multipart,
+         name='create_body_result_multipart'),
     path('api/analysis/body/get_result/', views.get_body_result, name='get_body_result'),
     path('api/analysis/get_info/', views.get_info, name='get_info'),
 
@@ -93,6 +97,9 @@ urlpatterns = [
     path('api/mobile/gait/delete_gait_result/', views_mobile.delete_gait_result, name='mobile-body-delete_gait_result'), # 보행 결과 삭제
     path('api/mobile/body/delete_body_result/', views_mobile.delete_body_result, name='mobile-body-delete_body_result'), # 체형 결과 삭제
     path('api/mobile/body/create_body_result/', views_mobile.create_body_result, name='mobile-body-create_body_result'), # 체형 결과 생성
+    path('api/mobile/body/create_body_result_multipart/',
+                                                views_mobile.create_body_result_multipart,
+                                                name='mobile-body-create_body_result_multipart'),                        # 체형 결과 생성 (multipart 이미지 파일)
     path('api/mobile/body/sync_body_result/',   views_mobile.mobile_body_sync,   name='mobile-body-mobile_body_sync'),   # 체형 결과 동기화(bodyresults의 ID값만 반환함)
     # path('api/mobile/gait/sync_gait_result/',   views_mobile.mobile_gait_sync,   name='mobile-gait-mobile_gait_sync'),   # 보행 결과 동기화(gaitresults의 ID값만 반환함)
     path('api/mobile/login-mobile-id/',         views_mobile.login_mobile_id,    name='mobile-auth-request_auth_id'),     # ID 로그인 요청 (ID를 사용하여 로그인)
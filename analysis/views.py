@@ -7,7 +7,6 @@ import uuid
 import pandas as pd
 from django.shortcuts import get_object_or_404, render, redirect
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.hashers import make_password, check_password
 import requests
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -15,22 +14,38 @@ from django.contrib.auth.views import PasswordChangeView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from datetime import datetime, timedelta
-from .helpers import extract_digits, generate_presigned_url, parse_userinfo, upload_image_to_s3, verify_image, \
-    calculate_normal_ratio, create_excel_report
-from .models import BodyResult, CodeInfo, GaitResult, OrganizationInfo, SchoolInfo, UserInfo, SessionInfo, UserHist
+from .helpers import extract_digits, parse_userinfo, upload_image_to_s3, verify_image, \
+    generate_body_image_key, get_body_image_variant_urls
+from .models import BODY_RESULT_COMPLETED, BodyResult, GaitResult, MemberImportJob, OrganizationInfo, ReportExportJob, \
+    SchoolInfo, UserInfo, SessionInfo, UserHist
+from .custom.code_info import code_info_registry
+from .custom.credentials import password_hasher
+from .custom.dashboard import get_dashboard_stats
+from .custom.image_jobs import enqueue_image_jobs
+from .custom.import_jobs import enqueue_member_import
+from .custom.member_import import ORGANIZATION_MEMBER_COLUMNS, SCHOOL_MEMBER_COLUMNS, import_members, \
+    parse_member_frame
+from .custom.export_jobs import XLSX_CONTENT_TYPE, enqueue_report_export, get_export_download_url
+from .custom.report_export import build_report_file, get_code_columns, get_report_rosters, get_report_version, \
+    iter_report_members, report_file_name
+from .custom.report_groups import get_year_group_map
+from .custom.scoring import BODY_NORMAL_FIELDS, LOW_NORMAL_COUNT
+from .custom.upload_handlers import SpooledFileUploadHandler
 from .forms import UploadFileForm, CustomPasswordChangeForm, CustomUserCreationForm, CustomPasswordResetForm
 from .serializers import BodyResultSerializer, GaitResponseSerializer, GaitResultSerializer
 
-from django.db.models import Min, Max, Exists, OuterRef, Count
+from django.core.paginator import Paginator
+from django.db.models import Min, Max, Exists, F, OuterRef, Count, Q, Subquery
 from django.db.models.functions import ExtractYear
 from django.db import transaction
+from django.conf import settings
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from datetime import datetime as dt
 from collections import defaultdict
-from django.http import JsonResponse, HttpResponse
-from urllib.parse import quote
+from django.http import FileResponse, JsonResponse, HttpResponse
 
 # 응답코드 관련
 from rest_framework.status import HTTP_200_OK, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND, \
@@ -47,11 +62,11 @@ def home(request):
 from django.shortcuts import render, redirect
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 
 
 @login_required
-def main(request):  # 추후 캐싱 기법 적용
+def main(request):
     user = request.user
     context = {}
 
@@ -60,130 +75,23 @@ def main(request):  # 추후 캐싱 기법 적용
 
     # 기관이 등록된 경우
     if has_affiliation:
-        # 학교
-        if user.user_type == 'S':
-            # 유저 소속
-            user_affil = user.school.school_name
-
-            # 총 회원 수
-            members = UserInfo.objects.filter(
-                school__school_name=user.school.school_name
-            ).count()
-
-            # 총 검사 수
-            total_results = BodyResult.objects.filter(
-                user__school__school_name=user.school.school_name,
-                image_front_url__isnull=False,
-                image_side_url__isnull=False
-            ).count()
-
-            # 이번달 검사 수
-            current_month_results = BodyResult.objects.filter(
-                user__school__school_name=user.school.school_name,
-                image_front_url__isnull=False,
-                image_side_url__isnull=False,
-                created_dt__month=dt.now().month
-            ).count()
-
-            # 미완료 검사 수
-            # 소속된 학교의 모든 사용자 중 검사를 받지 않은 사용자 수
-            pending_tests = UserInfo.objects.filter(
-                school__id=user.school.id,
-                year=dt.now().year
-            ).exclude(
-                id__in=BodyResult.objects.filter(
-                    user__school__id=user.school.id,
-                    image_front_url__isnull=False,
-                    image_side_url__isnull=False,
-                    created_dt__year=dt.now().year
-                ).values('user_id')
-            ).count()
-
-            # 학교의 그룹 정보 가져오기
-            groups = UserInfo.objects.filter(
-                school__school_name=user.school.school_name,
-                year=dt.now().year
-            ).values('student_grade', 'student_class').annotate(student_count=Count('id')).order_by('student_grade',
-                                                                                                    'student_class')
-
-            # 학년-반 별 구성원 수를 포함하는 딕셔너리 초기화
-            group_structure = {}
-
-            # 학년별로 반 정보 구조화 및 구성원 수 추가
-            for group in groups:
-                if group['student_grade'] and group['student_class']:  # None 값 제외
-                    grade = str(group['student_grade'])
-                    class_num = str(group['student_class'])
-
-                    # 학년이 group_structure에 없으면 초기화
-                    if grade not in group_structure:
-                        group_structure[grade] = {}
-
-                    # 반이 학년의 딕셔너리에 없으면 초기화
-                    if class_num not in group_structure[grade]:
-                        group_structure[grade][class_num] = 0  # 초기화
-
-                    # 구성원 수 증가
-                    group_structure[grade][class_num] = group['student_count']  # 쿼리에서 가져온 학생 수로 설정
+        # 유저 소속 (학교 / 기관)
+        user_affil = user.school.school_name if user.user_type == 'S' else user.organization.organization_name
 
-        else:
-            # 유저 소속 - 기관
-            user_affil = user.organization.organization_name
-
-            # 총 회원 수
-            members = UserInfo.objects.filter(
-                organization__id=user.organization.id
-            ).count()
-
-            # 총 검사 수
-            total_results = BodyResult.objects.filter(
-                user__organization__id=user.organization.id,
-                image_front_url__isnull=False,
-                image_side_url__isnull=False
-            ).count()
-
-            # 이번달 검사 수
-            current_month_results = BodyResult.objects.filter(
-                user__organization__organization_name=user.organization.organization_name,
-                image_front_url__isnull=False,
-                image_side_url__isnull=False,
-                created_dt__month=dt.now().month
-            ).count()
-
-            # 미완료 검사 수
-            # 소속된 기관의 모든 사용자 중 검사를 받지 않은 사용자 수(문제점 : 작년도 유저까지 포함될 수 있음 - 2023년 가입인데 2024년에 갱신이 안된 경우)
-            # userInfo에서 organization__id=user.organization.id인 것 들 중에 BodyResult에 있는 user_id와 일치하지 않는 것들을 제외하고 count
-            pending_tests = UserInfo.objects.filter(
-                organization__id=user.organization.id
-            ).exclude(
-                id__in=BodyResult.objects.filter(
-                    user_id=OuterRef('id'),
-                    image_front_url__isnull=False,
-                    image_side_url__isnull=False
-                ).values('user_id')
-            ).count()
-
-            # 부서 : 구성원 수 구조화
-            group_structure = UserInfo.objects.filter(
-                organization__organization_name=user.organization.organization_name
-            ).values('department').annotate(count=Count('id')).order_by('department')
-
-            # None 결과(부서에 속해있지 않은) 제외한 딕셔너리로 변환
-            group_structure = {item['department']: item['count'] for item in group_structure if
-                               item['department'] is not None}
-
-            # 검사 완료율 계산 (퍼센트)
-            # test_completion_rate = ((members - pending_tests) / members * 100) if members > 0 else 0
+        # 총 회원 수, 총 검사 수, 이번달 검사 수, 주의 대상 검사 수, 미완료 검사 수, 학년-반(부서) 별 구성원 수
+        # -> 기관 단위 집계 쿼리로 계산 후 캐시 (analysis/custom/dashboard.py)
+        stats = get_dashboard_stats(user)
 
         year = dt.now().year
         context.update({
             'user_affil': user_affil,
-            'total_members': members,
-            'total_results': total_results,
-            'current_month_results': current_month_results,
+            'total_members': stats['total_members'],
+            'total_results': stats['total_results'],
+            'current_month_results': stats['current_month_results'],
+            'low_normal_results': stats['low_normal_results'],
             'user_type': user.user_type,
-            'pending_tests': pending_tests,
-            'group_structure': group_structure,
+            'pending_tests': stats['pending_tests'],
+            'group_structure': stats['group_structure'],
             'year': year,
         })
 
@@ -197,9 +105,6 @@ def org_register(request):
 
 @login_required
 def member_register(request):
-    existing_member = 0  # 기존 회원 카운팅
-    new_member = 0  # 신규 회원 카운팅
-
     user_id = request.user.id
 
     user = UserInfo.objects.get(id=user_id)
@@ -219,116 +124,27 @@ def member_register(request):
                 df = pd.read_excel(excel_file,
                                    dtype={'전화번호': str})  # 전화번호를 문자열로 읽음( 01000010001, 010-0001-0001) 다중 처리 위해서
 
-                # 컬럼 검증
-                expected_columns = ['학년', '반', '번호', '이름', '전화번호'] if type == 'S' else ['부서명', '이름', '전화번호']
-                if not all(col in df.columns for col in expected_columns):
-                    user_type_str = '교직원용' if type == 'S' else '일반 기관용'
-                    raise ValueError(f"올바른 템플릿이 아닙니다. {user_type_str} 템플릿을 다운로드 받아서 다시 시도해주세요.")
-
-                # NaN 값을 가진 행 제거
-                df = df.dropna(subset=['이름', '전화번호'])  # 이름과 전화번호는 필수값으로 처리
-
-                # 데이터 전처리
-                users = []
-                for _, row in df.iterrows():
-                    user_data = {}
-                    for col in expected_columns:
-                        if pd.notna(row[col]):
-                            # 숫자형 컬럼 처리
-                            if col in ['학년', '반', '번호'] and pd.notna(row[col]):
-                                user_data[col] = str(int(row[col]))  # float를 int로 변환 후 문자열로
-                            else:
-                                user_data[col] = str(row[col]).strip()
-
-                    if len(user_data) == len(expected_columns):  # 모든 필수 컬럼이 있는 경우만 추가
-                        users.append(user_data)
+                # 컬럼 검증 및 열 단위 전처리 (오류가 있는 행은 제외하고 행 번호와 함께 반환)
+                users, errors = parse_member_frame(df, type)
 
                 # 저장 요청인 경우
                 if request.POST.get('save') == 'true':
-                    with transaction.atomic():  # 트랜잭션 시작
-                        for user_data in users:
-                            phone_number = extract_digits(str(user_data['전화번호']).replace('-', ''))
-                            if phone_number.startswith('10'):  # 10 으로 시작하는 경우 0 추가(int로 입력이 들어오면 맨 앞에 0이 빠지기 때문)
-                                phone_number = '0' + phone_number
-
-                            if type == 'S':  # 학생인 경우
-                                school_info = SchoolInfo.objects.get(school_name=user.school.school_name)
-
-                                # 기존 사용자 확인 및 이력 저장
-                                existing_user = UserInfo.objects.filter(phone_number=phone_number).first()
-                                if existing_user:  # 기존 사용자가 있는 경우
-                                    if existing_user.created_dt.year != dt.now().year or existing_user.year != dt.now().year:  # 작년도 사용자인 경우
-                                        UserHist.objects.update_or_create(
-                                            user=existing_user,
-                                            school=existing_user.school,
-                                            student_grade=existing_user.student_grade,
-                                            student_class=existing_user.student_class,
-                                            student_number=existing_user.student_number,
-                                            student_name=existing_user.student_name,
-                                            year=existing_user.year
-                                        )
-                                    existing_member += 1
-
-                                new_member += 1
-                                # 사용자 정보 업데이트 또는 생성
-                                UserInfo.objects.update_or_create(
-                                    phone_number=phone_number,
-                                    defaults={
-                                        'school': school_info,
-                                        'student_grade': user_data['학년'],
-                                        'student_class': user_data['반'],
-                                        'student_number': user_data['번호'],
-                                        'student_name': user_data['이름'],
-                                        'username': phone_number,
-                                        'password': make_password(os.environ['DEFAULT_PASSWORD']),
-                                        'user_type': type,
-                                        'user_display_name': f"{school_info.school_name} {user_data['학년']}학년 {user_data['반']}반 {user_data['번호']}번 {user_data['이름']}",
-                                        'organization': None,
-                                        'department': None,
-                                        'year': dt.now().year
-                                    }
-                                )
-                            else:  # user_type == 'O' (기관인 경우)
-                                organization_info = OrganizationInfo.objects.get(
-                                    organization_name=user.organization.organization_name)  # 기관 정보 가져오기
-
-                                # 기존 사용자 확인 및 이력 저장
-                                existing_user = UserInfo.objects.filter(phone_number=phone_number).first()
-                                if existing_user:  # 기존 유저
-                                    if existing_user.created_dt.year != dt.now().year or existing_user.year != dt.now().year:  # 작년도 사용자인 경우
-                                        UserHist.objects.update_or_create(
-                                            user=existing_user,
-                                            organization=existing_user.organization,
-                                            department=existing_user.department,
-                                            student_name=existing_user.student_name,  # 기관회원의 이름도 student_name에 저장
-                                            year=existing_user.year
-                                        )
-                                    existing_member += 1
-
-                                new_member += 1
-                                UserInfo.objects.update_or_create(  # 기존 사용자가 없는 경우 -> 신규 생성 및 갱신
-                                    phone_number=phone_number,
-                                    defaults={
-                                        'organization': organization_info,
-                                        'department': user_data['부서명'],
-                                        'student_name': user_data['이름'],
-                                        'username': phone_number,
-                                        'password': make_password(os.environ['DEFAULT_PASSWORD']),
-                                        'user_type': type,
-                                        'user_display_name': f"{organization_info.organization_name} {user_data['이름']}",
-                                        'school': None,
-                                        'year': dt.now().year
-                                    }
-                                )
-
-                        new_member = new_member - existing_member
-                        return JsonResponse(
-                            {'message': '성공적으로 저장되었습니다.', 'existing_member': existing_member, 'new_member': new_member})
+                    # 행 수가 많으면 백그라운드 작업으로 chunk 단위 저장, 페이지에서 진행 상태 조회
+                    if len(users) > settings.MEMBER_IMPORT_SYNC_MAX_ROWS:
+                        job = enqueue_member_import(user, users)
+                        return JsonResponse({'job_id': job.id, 'total_rows': job.total_rows,
+                                             'status_url': reverse('member_import_status', args=[job.id])})
+
+                    # 기존 회원 일괄 조회 후 신규/기존 회원을 나누어 bulk 저장 (초기 비밀번호 해시는 1회)
+                    existing_member, new_member = import_members(user, users)
+                    return JsonResponse(
+                        {'message': '성공적으로 저장되었습니다.', 'existing_member': existing_member, 'new_member': new_member})
 
                 # 미리보기 요청인 경우
                 return JsonResponse({
                     'users': users,
-                    'columns': expected_columns
+                    'columns': SCHOOL_MEMBER_COLUMNS if type == 'S' else ORGANIZATION_MEMBER_COLUMNS,
+                    'errors': errors,
                 })
 
             except Exception as e:
@@ -343,6 +159,26 @@ def member_register(request):
     })
 
 
+@login_required
+def member_import_status(request, id):
+    """회원 등록 작업 진행 상태 (member_register 페이지에서 주기적으로 조회)"""
+    user = request.user
+    if user.user_type == 'S':
+        job = get_object_or_404(MemberImportJob, id=id, school_id=user.school_id)
+    else:
+        job = get_object_or_404(MemberImportJob, id=id, organization_id=user.organization_id)
+
+    return JsonResponse({
+        'status': job.status,
+        'processed_rows': job.processed_rows,
+        'total_rows': job.total_rows,
+        'progress': job.processed_rows * 100 // job.total_rows if job.total_rows else 100,
+        'existing_member': job.existing_member,
+        'new_member': job.new_member,
+        'error': job.error_message if job.status == 'failed' else None,
+    })
+
+
 def signup(request):
     if request.method == 'POST':
         form = CustomUserCreationForm(request.POST)
@@ -376,7 +212,7 @@ def password_reset(request):
         if form.is_valid():
             # 3. 비밀번호 변경
             new_password = form.cleaned_data.get('new_password1')
-            user.password = make_password(new_password)
+            user.password = password_hasher.hash_password(new_password)
             user.save()
 
             return redirect('password_reset_done')
@@ -413,6 +249,7 @@ def register(request):
                 # Read the Excel file
                 df = pd.read_excel(excel_file)
                 user_type = user.user_type
+                default_password = password_hasher.new_default_password_hash()  # 업로드마다 한 번만 해시
 
                 # Define columns based on user type
                 if user_type == 'S':
@@ -457,7 +294,7 @@ def register(request):
                                 student_number=row['번호'],
                                 student_name=row['이름'].strip().replace(' ', ''),
                                 username=phone_number,
-                                password=make_password(os.environ['DEFAULT_PASSWORD']),
+                                password=default_password,
                                 user_type=user_type,
                                 user_display_name=f"{school_info.school_name} {row['학년']}학년 {row['반']}반 {row['번호']}번 {row['이름']}",
                                 organization=None,
@@ -495,7 +332,7 @@ def register(request):
                                 department=row['부서명'].strip(),
                                 student_name=row['이름'].strip().replace(' ', ''),
                                 username=phone_number,
-                                password=make_password(os.environ['DEFAULT_PASSWORD']),
+                                password=default_password,
                                 user_type=user_type,
                                 user_display_name=f"{organization_info.organization_name} {row['이름']}",
                                 school=None,
@@ -626,6 +463,14 @@ from django.contrib.auth.decorators import login_required
 import re
 
 
+# 기관 결과 조회 정렬 기준 (?sort=) - 검사일/정상범위는 결과가 없는 회원을 마지막에 표시
+ORG_REPORT_SORTS = {
+    'name': ('student_name', 'id'),
+    'latest': (F('latest_created_dt').desc(nulls_last=True), 'student_name', 'id'),
+    'normal_count': (F('normal_count').asc(nulls_last=True), 'student_name', 'id'),
+}
+
+
 @login_required
 def report(request):
     user = request.user  # 현재 유저
@@ -636,6 +481,9 @@ def report(request):
     groups = []  # 해당 School의 현재 연도 그룹 정보 저장
     years = []  # 해당 School의 BodyResult에 있는 최소 연도, 최대 연도 저장
     year_group_map = defaultdict(list)  # 연도별 그룹 정보 저장 ('연도': ['그룹1', '그룹2', ...])
+    report_stats = None  # 페이지로 나누어 조회하는 경우(기관) 전체 인원 기준 분석 현황
+    page_obj = None
+    sort = None
 
     if request.method == 'POST':
         selected_group = request.POST.get('group')
@@ -658,47 +506,8 @@ def report(request):
             'student_grade', 'student_class', 'year', named=True
         ).distinct().order_by('year', 'student_grade', 'student_class')
 
-        # 연도별 그룹 정보 생성
-        user_hists = UserHist.objects.filter(school__id=user.school.id)
-        for hist in user_hists:
-            year = str(hist.year)  # UserHist의 연도 정보
-            year_group = f"{hist.student_grade}학년 {hist.student_class}반"
-
-            # 해당 연도가 year_group_map에 없으면 초기화
-            if year not in year_group_map:
-                year_group_map[year] = []
-
-            # 중복되지 않게 추가
-            if year_group not in year_group_map[year]:
-                year_group_map[year].append(year_group)
-
-        # UserInfo의 연도 데이터 추가
-        for group in groups:
-            year = str(group.year)  # UserInfo의 연도 정보
-            year_group = f"{group.student_grade}학년 {group.student_class}반"
-
-            if year not in year_group_map:
-                year_group_map[year] = []
-
-            if year_group not in year_group_map[year]:
-                year_group_map[year].append(year_group)
-
-        """ 현재 연도의 데이터가 실제로 존재하는지 확인하는 과정 """
-        current_year = str(dt.now().year)
-
-        existing_years_in_db = set(UserHist.objects.values_list('year', flat=True))
-
-        # 현재 연도가 DB에 있는 연도에 포함될 경우만 처리
-        if current_year in existing_years_in_db:
-            # year_group_map에 현재 연도가 없으면 초기화
-            if current_year not in year_group_map:
-                year_group_map[current_year] = []
-
-            for group in groups:
-                current_group = f"{group.student_grade}학년 {group.student_class}반"
-                # 현재 연도에 해당 반 정보가 없으면 추가
-                if current_group not in year_group_map[current_year]:
-                    year_group_map[current_year].append(current_group)
+        # 연도별 그룹 정보 (UserHist + UserInfo, 학교별 캐시)
+        year_group_map = get_year_group_map(user.school_id)
 
         # 학교별 년도 정보 가져오기 -> select 태그에 들어가는 값
         # school_id에 해당하는 BodyResult 데이터에서 created_dt의 최소/최대 연도를 가져오기
@@ -716,9 +525,8 @@ def report(request):
                 user_results.clear()  # 기존 결과 초기화
 
                 body_result_subquery = BodyResult.objects.filter(
+                    BODY_RESULT_COMPLETED,
                     user_id=OuterRef('id'),
-                    image_front_url__isnull=False,
-                    image_side_url__isnull=False,
                     created_dt__year=selected_year
                 )
 
@@ -728,49 +536,57 @@ def report(request):
                     student_class=match.group(2),
                     year=selected_year
                 ).annotate(
-                    analysis_valid=Exists(body_result_subquery)
+                    analysis_valid=Exists(body_result_subquery),
+                    # 최근 검사 결과의 정상범위 항목 수
+                    normal_count=Subquery(body_result_subquery.order_by('-created_dt').values('normal_count')[:1])
                 ).order_by('student_number')
 
                 user_results = [{
                     'user': user,
-                    'analysis_valid': user.analysis_valid
+                    'analysis_valid': user.analysis_valid,
+                    'normal_count': user.normal_count
                 } for user in users]
 
             elif selected_year != str(dt.now().year) and match:
                 user_results.clear()  # 기존 결과 초기화
 
+                def completed_results(user_ref):
+                    # 해당 연도의 완료된(이미지가 있는) 검사 결과, 최근 결과부터
+                    return BodyResult.objects.filter(
+                        BODY_RESULT_COMPLETED,
+                        user_id=user_ref,
+                        created_dt__year=selected_year
+                    ).order_by('-created_dt')
+
+                def with_latest_result(queryset, user_ref):
+                    # 검사 여부 / 최근 검사 일시 / 최근 검사 결과의 정상범위 항목 수를 회원 조회 쿼리 1회로 함께 조회
+                    body_result_subquery = completed_results(OuterRef(user_ref))
+                    return queryset.annotate(
+                        analysis_valid=Exists(body_result_subquery),
+                        latest_created_dt=Subquery(body_result_subquery.values('created_dt')[:1]),
+                        normal_count=Subquery(body_result_subquery.values('normal_count')[:1])
+                    )
+
                 # UserHist에서 데이터 조회
-                user_hists = UserHist.objects.filter(
+                user_hists = with_latest_result(UserHist.objects.filter(
                     school__id=user.school.id,
                     student_grade=match.group(1),
                     student_class=match.group(2),
                     year=selected_year
-                ).order_by('student_number')
+                ).select_related('user'), 'user_id').order_by('student_number')
 
-                # UserInfo에서 데이터 조회
-                user_infos = UserInfo.objects.filter(
+                # UserInfo에서 UserHist에 없는 데이터만 조회
+                unique_user_infos = with_latest_result(UserInfo.objects.filter(
                     school__id=user.school.id,
                     student_grade=match.group(1),
                     student_class=match.group(2),
                     year=selected_year
-                ).order_by('student_number')
-
-                # UserHist에서 조회된 user_id 목록
-                hist_user_ids = set(user_hists.values_list('user_id', flat=True))
-
-                # UserInfo에서 UserHist에 없는 데이터만 필터링
-                unique_user_infos = user_infos.exclude(id__in=hist_user_ids)
+                ).exclude(
+                    id__in=user_hists.values('user_id')
+                ), 'id').order_by('student_number')
 
                 # UserHist 데이터 처리
                 for user_hist in user_hists:
-                    body_result_queryset = BodyResult.objects.filter(
-                        user_id=user_hist.user.id,
-                        created_dt__year=selected_year,
-                        image_front_url__isnull=False,
-                        image_side_url__isnull=False,
-                    )
-                    analysis_valid = len(body_result_queryset) > 0
-
                     user_results.append({
                         'user': {
                             'id': user_hist.user.id,
@@ -779,21 +595,14 @@ def report(request):
                             'student_number': user_hist.student_number,
                             'student_name': user_hist.user.student_name
                         },
-                        'analysis_valid': analysis_valid,
-                        'created_dt': body_result_queryset[0].created_dt.strftime(
-                            '%Y-%m-%d %H:%M:%S') if analysis_valid else None
+                        'analysis_valid': user_hist.analysis_valid,
+                        'created_dt': user_hist.latest_created_dt.strftime(
+                            '%Y-%m-%d %H:%M:%S') if user_hist.analysis_valid else None,
+                        'normal_count': user_hist.normal_count
                     })
 
                 # UserInfo 데이터 처리 (UserHist에 없는 데이터만)
                 for user_info in unique_user_infos:
-                    body_result_queryset = BodyResult.objects.filter(
-                        user_id=user_info.id,
-                        created_dt__year=selected_year,
-                        image_front_url__isnull=False,
-                        image_side_url__isnull=False,
-                    )
-                    analysis_valid = len(body_result_queryset) > 0
-
                     user_results.append({
                         'user': {
                             'id': user_info.id,
@@ -802,9 +611,10 @@ def report(request):
                             'student_number': user_info.student_number,
                             'student_name': user_info.student_name
                         },
-                        'analysis_valid': analysis_valid,
-                        'created_dt': body_result_queryset[0].created_dt.strftime(
-                            '%Y-%m-%d %H:%M:%S') if analysis_valid else None
+                        'analysis_valid': user_info.analysis_valid,
+                        'created_dt': user_info.latest_created_dt.strftime(
+                            '%Y-%m-%d %H:%M:%S') if user_info.analysis_valid else None,
+                        'normal_count': user_info.normal_count
                     })
 
 
@@ -816,23 +626,42 @@ def report(request):
         groups = [g.department for g in groups if ((g.department is not None))]
 
         if selected_group:
-            users = UserInfo.objects.filter(organization__organization_name=user.organization.organization_name,
-                                            department=selected_group).order_by('student_name')
-
-            # 각 user에 대한 검사 결과 여부를 확인하여 user_results에 추가
-            for user in users:
-                body_result_queryset = BodyResult.objects.filter(
-                    user_id=user.id,
-                    image_front_url__isnull=False,
-                    image_side_url__isnull=False,
-                )
+            body_result_subquery = BodyResult.objects.filter(
+                BODY_RESULT_COMPLETED,
+                user_id=OuterRef('id'),
+            ).order_by('-created_dt')
 
-                analysis_valid = (len(body_result_queryset) > 0)
+            # 검사 여부 / 최근 검사 일시 / 최근 검사 결과의 정상범위 항목 수를 회원 조회 쿼리에서 함께 계산
+            users = UserInfo.objects.filter(
+                organization_id=user.organization_id,
+                department=selected_group
+            ).annotate(
+                analysis_valid=Exists(body_result_subquery),
+                latest_created_dt=Subquery(body_result_subquery.values('created_dt')[:1]),
+                normal_count=Subquery(body_result_subquery.values('normal_count')[:1])
+            )
 
-                user_results.append({
-                    'user': user,
-                    'analysis_valid': analysis_valid
-                })
+            # 분석 현황(전체 인원 / 검사 완료 / 주의 대상)은 페이지와 관계없이 부서 전체 기준으로 집계 1회
+            report_stats = users.aggregate(
+                total_users=Count('id'),
+                valid_count=Count('id', filter=Q(analysis_valid=True)),
+                low_normal_count=Count('id', filter=Q(normal_count__lte=LOW_NORMAL_COUNT)),
+            )
+
+            sort = request.GET.get('sort')
+            if sort not in ORG_REPORT_SORTS:
+                sort = 'name'
+            paginator = Paginator(users.order_by(*ORG_REPORT_SORTS[sort]), settings.ORG_REPORT_PAGE_SIZE)
+            paginator.count = report_stats['total_users']  # 전체 인원은 위에서 집계했으므로 COUNT 쿼리 생략
+            page_obj = paginator.get_page(request.GET.get('page'))
+
+            user_results = [{
+                'user': user,
+                'analysis_valid': user.analysis_valid,
+                'created_dt': user.latest_created_dt.strftime(
+                    '%Y-%m-%d %H:%M:%S') if user.analysis_valid else None,
+                'normal_count': user.normal_count
+            } for user in page_obj]
 
     if user.user_type == '' or len(user_results) == 0:  # 초기 렌더링
         return render(request, 'report.html', {
@@ -846,12 +675,21 @@ def report(request):
             'valid_count': 0,
             'total_users': 0,
             'progress_percentage': 0,
+            'low_normal_count': 0,
             'is_registered': len(groups) > 0,
         })
 
     # 분석 진행률 계산
-    total_users = len(user_results)
-    valid_count = sum(1 for result in user_results if result['analysis_valid'])
+    if report_stats is not None:  # 페이지로 나누어 조회한 경우 (기관) 전체 인원 기준 집계 사용
+        total_users = report_stats['total_users']
+        valid_count = report_stats['valid_count']
+        low_normal_count = report_stats['low_normal_count']
+    else:
+        total_users = len(user_results)
+        valid_count = sum(1 for result in user_results if result['analysis_valid'])
+        # 최근 검사 결과가 주의 대상(정상범위 7/11 이하)인 인원
+        low_normal_count = sum(1 for result in user_results
+                               if result['normal_count'] is not None and result['normal_count'] <= LOW_NORMAL_COUNT)
 
     if total_users > 0:
         progress_percentage = (valid_count / total_users) * 100
@@ -865,6 +703,7 @@ def report(request):
         valid_count = 0
         total_users = 0
         progress_percentage = 0
+        low_normal_count = 0
         error_message = '그룹이 선택되지 않았습니다. 그룹 선택 후 조회 해주세요!'
 
     return render(request, 'report.html', {
@@ -878,6 +717,11 @@ def report(request):
         'valid_count': valid_count,
         'total_users': total_users,
         'progress_percentage': progress_percentage,
+        'low_normal_count': low_normal_count,
+        'low_normal_threshold': LOW_NORMAL_COUNT,
+        'normal_total': len(BODY_NORMAL_FIELDS),
+        'page_obj': page_obj,
+        'sort': sort,
         'is_registered': True,
     })
 
@@ -889,155 +733,52 @@ def report_download(request):
     selected_year = request.GET.get('year', None)
 
     user = UserInfo.objects.get(id=user_request.id)
-    user_type = user.user_type
 
     if not selected_group or not selected_year or not user.is_authenticated or user is None:
         return redirect('report')
 
-    # 사용자 목록 조회
-    if user_type == 'S':  # 학교 사용자
-        match = re.search(r"(\d+)학년 (\d+)반", selected_group)
-        if selected_year == str(dt.now().year) and match:  # 현재 년도 조회
-            users = UserInfo.objects.filter(
-                school__school_name=user.school.school_name,
-                student_grade=match.group(1),
-                student_class=match.group(2),
-                year=selected_year
-            ).order_by('student_number')
-        else:  # 이전 년도 조회
-            # UserHist에서 데이터 조회
-            user_hists = UserHist.objects.filter(
-                school__id=user.school.id,
-                student_grade=match.group(1),
-                student_class=match.group(2),
-                year=selected_year
-            ).order_by('student_number')
-
-            # UserInfo에서 데이터 조회
-            user_infos = UserInfo.objects.filter(
-                school__id=user.school.id,
-                student_grade=match.group(1),
-                student_class=match.group(2),
-                year=selected_year
-            ).order_by('student_number')
-
-            # UserHist에서 조회된 user_id 목록
-            hist_user_ids = set(user_hists.values_list('user_id', flat=True))
-
-            # UserInfo에서 UserHist에 없는 데이터만 필터링
-            unique_user_infos = user_infos.exclude(id__in=hist_user_ids)
-
-            # 최종 사용자 목록 생성
-            users = list(user_hists) + list(unique_user_infos)
-
-    elif user_type == 'O':  # 기관 사용자
-        users = UserInfo.objects.filter(
-            organization__organization_name=user.organization.organization_name,
-            department=selected_group
-        ).order_by('student_name')
-
-    # 한 번에 모든 사용자의 ID 리스트 생성
-    if user_type == 'S':  # 학교 사용자의 경우 (이전 년도가 포함될 수 있음 (UserHist))
-        user_ids = [user.user_id for user in user_hists] + [user.id for user in
-                                                            unique_user_infos] if selected_year != str(
-            dt.now().year) else [user.id for user in users]
-    else:  # 기관 사용자의 경우
-        user_ids = [user.id for user in users]
-
-    if user_type == 'S':
-        # 한 번의 쿼리로 모든 BodyResult 데이터 조회
-        body_results = BodyResult.objects.filter(  # user_id로 필터링 (선택된 년도에 생성된 bodyResult)
-            user_id__in=user_ids,
-            created_dt__year=selected_year,
-            image_front_url__isnull=False,
-            image_side_url__isnull=False,
-        ).select_related('user')
-    else:  # 기관은 모든 년도의 데이터를 사용
-        body_results = BodyResult.objects.filter(  # user_id로 필터링 (선택된 년도에 생성된 bodyResult)
-            user_id__in=user_ids,
-            image_front_url__isnull=False,
-            image_side_url__isnull=False,
-        ).select_related('user')
-
-    # {user_id : <BodyResult:QuerySet> }
-    body_results_dict = {}
-    for br in body_results:
-        if br.user_id not in body_results_dict:
-            body_results_dict[br.user_id] = br
-
-    # code_name 목록 가져오기
-    code_names = []
-    if body_results:
-        first_result = next(iter(body_results))
-        _, status_results = calculate_normal_ratio(first_result)
-        code_names = list(status_results.keys())
-
-    # 엑셀 데이터 생성
-    excel_data = []
-    for user in users:
-        # UserHist에서 가져온 경우 user_id를 user.user_id로 설정
-        if hasattr(user, 'user_id'):
-            user_id = user.user_id
-        else:  # UserInfo에서 가져온 경우
-            user_id = user.id
-
-        body_result = body_results_dict.get(user_id)
-
-        if user_type == 'S':
-            row_data = {
-                '학년': user.student_grade,
-                '반': user.student_class,
-                '번호': user.student_number,
-                '이름': user.student_name,
-                '검사일': body_result.created_dt.strftime('%Y-%m-%d %H:%M:%S') if body_result else None,
-                '검사결과': 'O' if body_result else 'X',
-            }
-        else:
-            row_data = {
-                '부서명': user.department,
-                '이름': user.student_name,
-                '검사일': body_result.created_dt.strftime('%Y-%m-%d %H:%M:%S') if body_result else None,
-                '검사결과': 'O' if body_result else 'X',
-            }
-
-        if body_result:
-            ratio, status_results = calculate_normal_ratio(body_result)
-            row_data['정상범위'] = ratio
-            # 각 측정 항목의 상태(양호/주의)를 추가
-            for code_name, status in status_results.items():
-                row_data[code_name] = status
-        else:
-            row_data['정상범위'] = None
-            for code_name in code_names:
-                row_data[code_name] = None
+    member_columns, fields, rosters = get_report_rosters(user, selected_year, selected_group)
+    file_name = report_file_name(user, selected_year, selected_group)
+    code_columns = get_code_columns()
 
-        excel_data.append(row_data)
+    # 행 수가 많으면 백그라운드 작업으로 생성 (같은 내용의 작업이 있으면 재사용) 후 진행 화면으로 이동
+    total_rows, data_version = get_report_version(rosters, code_columns)
+    if total_rows > settings.REPORT_EXPORT_SYNC_MAX_ROWS:
+        job = enqueue_report_export(user, selected_year, selected_group, file_name, total_rows, data_version)
+        return redirect('report_export_status', id=job.id)
 
-    # 데이터프레임 생성 (기본 컬럼 + code_name 컬럼들)
-    df = pd.DataFrame(excel_data)
+    # 엑셀 생성 (write-only 모드로 임시 파일에 기록, 열 폭 / 정상범위 강조 / 통계 시트 포함)
+    report_file = build_report_file(member_columns, iter_report_members(rosters, fields), code_columns=code_columns)
 
-    # 컬럼 순서 설정
-    if user_type == 'S':
-        columns = ['학년', '반', '번호', '이름', '검사일', '검사결과', '정상범위'] + code_names
-    else:
-        columns = ['부서명', '이름', '검사일', '검사결과', '정상범위'] + code_names
-    df = df[columns]
+    # 임시 파일을 나누어 전송 (전송 후 닫히면서 삭제)
+    return FileResponse(report_file, as_attachment=True, filename=file_name, content_type=XLSX_CONTENT_TYPE)
 
-    # 엑셀 커스텀마이징(열 폭, 색상)
-    workbook = create_excel_report(df, user_type, code_names)
 
-    # 파일명 생성 및 응답 반환
-    if user_type == 'S':
-        file_name = f"{selected_year}_{user.school.school_name}_{selected_group}.xlsx"
+@login_required
+def report_export_status(request, id):
+    """엑셀 다운로드 작업 진행 화면 (?format=json 이면 진행 상태 JSON)"""
+    user = request.user
+    if user.user_type == 'S':
+        job = get_object_or_404(ReportExportJob, id=id, school_id=user.school_id)
     else:
-        file_name = f"{selected_year}_{user.organization.organization_name}_{selected_group}.xlsx"
-    encoded_file_name = quote(file_name)
-
-    response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-    response['Content-Disposition'] = f"attachment; filename*=UTF-8''{encoded_file_name}"
-    workbook.save(response)
+        job = get_object_or_404(ReportExportJob, id=id, organization_id=user.organization_id)
+
+    download_url = get_export_download_url(job) if job.status == 'done' else None
+    progress = min(100, job.processed_rows * 100 // job.total_rows) if job.total_rows else 0
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'status': job.status,
+            'processed_rows': job.processed_rows,
+            'total_rows': job.total_rows,
+            'progress': progress,
+            'download_url': download_url,
+        })
 
-    return response
+    return render(request, 'report_export.html', {
+        'job': job,
+        'progress': progress,
+        'download_url': download_url,
+    })
 
 
 # Example report items
@@ -1070,13 +811,12 @@ def report_detail_report_id(request, id, report_id):
 
 def generate_report(request, id, report_id=None):
     max_count = 20
-    body_info_queryset = CodeInfo.objects.filter(group_id='01').order_by('seq_no')
+    body_info_queryset = code_info_registry.get_group('01', order_by_seq_no=True)
 
     # 해당 유저의 모든 검사 결과를 가져옴
     body_result_queryset = BodyResult.objects.filter(
+        BODY_RESULT_COMPLETED,
         user_id=id,
-        image_front_url__isnull=False,
-        image_side_url__isnull=False,
     )
 
     # body result 최신 순 정렬 후 날짜만 뽑아오기
@@ -1327,10 +1067,9 @@ def generate_report(request, id, report_id=None):
                 'dates': [value[1] for value in trend_data]
             }
 
-    created_dt = body_result_latest.created_dt.strftime('%Y%m%dT%H%M%S%f')
-
-    front_img_url = generate_presigned_url(file_keys=['front', created_dt])
-    side_img_url = generate_presigned_url(file_keys=['side', created_dt])
+    # 리포트 본문은 medium, 플로팅 미리보기(120px, 고해상도 화면 2배 고려)는 thumb 파생 이미지 사용 (없으면 원본)
+    front_img_url, side_img_url = get_body_image_variant_urls(body_result_latest, settings.BODY_IMAGE_DEFAULT_WIDTH)
+    front_thumb_url, side_thumb_url = get_body_image_variant_urls(body_result_latest, 240)
 
     context = {
         'user': user,
@@ -1338,6 +1077,8 @@ def generate_report(request, id, report_id=None):
         'trend_data_dict': trend_data_dict,
         'image_front_url': front_img_url,
         'image_side_url': side_img_url,
+        'image_front_thumb_url': front_thumb_url,
+        'image_side_thumb_url': side_thumb_url,
         'sorted_dates': sorted_dates,  # 날짜 리스트
         'selected_date': selected_date,  # 선택한 날짜
     }
@@ -1546,33 +1287,32 @@ def get_info(requests):
         group_id = '02'
     else:
         return Response({'data': {'message': 'Bad Request. Invalid name!', 'status': 400}})
-    codeinfo = CodeInfo.objects.filter(group_id=group_id)
     info = {}
-    for item in codeinfo.values():
-        info[item['code_id']] = {
-            'value_range_min': codeinfo.get(code_id=item['code_id']).min_value,
-            'value_range_max': codeinfo.get(code_id=item['code_id']).max_value,
-            'normal_range_min': codeinfo.get(code_id=item['code_id']).normal_min_value,
-            'normal_range_max': codeinfo.get(code_id=item['code_id']).normal_max_value,
-            'caution_range_min': codeinfo.get(code_id=item['code_id']).caution_min_value,
-            'caution_range_max': codeinfo.get(code_id=item['code_id']).caution_max_value,
-            'unit_name': item['unit_name'],
+    for item in code_info_registry.get_group(group_id):
+        info[item.code_id] = {
+            'value_range_min': item.min_value,
+            'value_range_max': item.max_value,
+            'normal_range_min': item.normal_min_value,
+            'normal_range_max': item.normal_max_value,
+            'caution_range_min': item.caution_min_value,
+            'caution_range_max': item.caution_max_value,
+            'unit_name': item.unit_name,
         }
         if name == 'body':
-            info[item['code_id']].update({
-                'outline': item['outline'],
-                'risk': item['risk'],
-                'improve': item['improve'],
-                'recommended': item['recommended'],
-                'title': item['title'],
-                'title_outline': item['title_outline'],
-                'title_risk': item['title_risk'],
-                'title_improve': item['title_improve'],
-                'title_recommended': item['title_recommended'],
+            info[item.code_id].update({
+                'outline': item.outline,
+                'risk': item.risk,
+                'improve': item.improve,
+                'recommended': item.recommended,
+                'title': item.title,
+                'title_outline': item.title_outline,
+                'title_risk': item.title_risk,
+                'title_improve': item.title_improve,
+                'title_recommended': item.title_recommended,
             })
         if name == 'gait':
-            info[item['code_id']].update({
-                'display_ticks': codeinfo.get(code_id=item['code_id']).display_ticks
+            info[item.code_id].update({
+                'display_ticks': item.display_ticks
             })
 
     return Response({'data': info, 'message': 'OK', 'status': 200})
@@ -1665,6 +1405,41 @@ def get_info(requests):
 )
 @api_view(['POST'])
 def create_body_result(request):
+    return _create_body_result(request)
+
+
+@swagger_auto_schema(
+    method='post',
+    operation_description="Create body analysis result with multipart/form-data image files "
+                          "(image files are streamed to a spooled temp file instead of base64 in JSON)",
+    manual_parameters=[
+        openapi.Parameter('session_key', openapi.IN_FORM, description="Session key", type=openapi.TYPE_STRING,
+                          required=True),
+        openapi.Parameter('body_data', openapi.IN_FORM, description="JSON encoded body analysis data",
+                          type=openapi.TYPE_STRING, required=True),
+        openapi.Parameter('image_front', openapi.IN_FORM, description="Front image file", type=openapi.TYPE_FILE,
+                          required=True),
+        openapi.Parameter('image_side', openapi.IN_FORM, description="Side image file", type=openapi.TYPE_FILE,
+                          required=True),
+    ],
+    responses={
+        200: 'OK; created_body_result successfully',
+        400: 'Bad Request; session_key or body_data or image is missing, or image format is invalid',
+        401: 'Unauthorized; user not found',
+        404: 'Not Found; session_key is not found',
+        500: 'Internal Server Error; unexpected error occurred',
+    },
+    tags=['analysis results']
+)
+@api_view(['POST'])
+@parser_classes([MultiPartParser])
+def create_body_result_multipart(request):
+    # 이미지 파트를 메모리에 모두 올리지 않고 SpooledTemporaryFile 로 수신
+    request._request.upload_handlers = [SpooledFileUploadHandler(request._request)]
+    return _create_body_result(request)
+
+
+def _create_body_result(request):
     session_key = request.data.get('session_key')
     # session_key가 없는 경우
     if not session_key:
@@ -1677,6 +1452,13 @@ def create_body_result(request):
         return Response({'data': {'message': 'body_data_required', 'status': HTTP_400_BAD_REQUEST}},
                         status=HTTP_400_BAD_REQUEST)
 
+    if isinstance(body_data, str):  # multipart 요청은 body_data 를 JSON 문자열로 전달
+        try:
+            body_data = json.loads(body_data)
+        except json.JSONDecodeError:
+            return Response({'data': {'message': 'body_data_invalid', 'status': HTTP_400_BAD_REQUEST}},
+                            status=HTTP_400_BAD_REQUEST)
+
     try:
         # session_key를 기반으로 세션 정보 조회
         session_info = SessionInfo.objects.get(session_key=session_key)
@@ -1711,31 +1493,34 @@ def create_body_result(request):
         data['student_grade'] = user_info.student_grade
         data['student_class'] = user_info.student_class
         data['student_number'] = user_info.student_number
-        data['image_front_url'] = 'Not_yet_queried'
-        data['image_side_url'] = 'Not yet queried'
 
     data['user'] = user_info.id
     serializer = BodyResultSerializer(data=data)
 
     if serializer.is_valid():
         # 데이터 저장
-        serializer.save()
-        # 저장된 데이터의 생성 시간으로 파일 이름 생성
-        created_dt = dt.strptime(serializer.data['created_dt'], '%Y-%m-%dT%H:%M:%S.%f').strftime('%Y%m%dT%H%M%S%f')
+        body_result = serializer.save()
         image_front_bytes = request.data.get('image_front', None)
         image_side_bytes = request.data.get('image_side', None)
 
         try:
             # 이미지 검증 및 업로드
-            if image_front_bytes and image_side_bytes:
+            if image_front_bytes and image_side_bytes and settings.IMAGE_UPLOAD_ASYNC:
+                # 스풀 파일 기록 + 작업 등록만 하고 바로 응답 (검증/변환/업로드는 run_image_worker 에서 처리)
+                with transaction.atomic():
+                    enqueue_image_jobs(body_result, {'front': image_front_bytes, 'side': image_side_bytes})
+            elif image_front_bytes and image_side_bytes:
                 try:
                     # 이미지 검증
                     verified_front = verify_image(image_front_bytes)
                     verified_side = verify_image(image_side_bytes)
 
-                    # 검증된 이미지만 업로드
-                    upload_image_to_s3(verified_front, file_keys=['front', created_dt])
-                    upload_image_to_s3(verified_side, file_keys=['side', created_dt])
+                    # 검증된 이미지만 업로드 후 S3 객체 key 저장
+                    body_result.image_front_key = upload_image_to_s3(
+                        verified_front, file_keys=generate_body_image_key(body_result, 'front'))
+                    body_result.image_side_key = upload_image_to_s3(
+                        verified_side, file_keys=generate_body_image_key(body_result, 'side'))
+                    body_result.save(update_fields=['image_front_key', 'image_side_key'])
                 except ValueError as ve:
                     # 이미지 형식이 잘못된 경우
                     return Response(
@@ -1756,8 +1541,9 @@ def create_body_result(request):
             return Response({'data': {'message': str(e), 'status': HTTP_500_INTERNAL_SERVER_ERROR}},
                             status=HTTP_500_INTERNAL_SERVER_ERROR)
 
-        # 성공 응답
-        return Response({'data': {'message': 'created_body_result', 'status': HTTP_200_OK}}, status=HTTP_200_OK)
+        # 성공 응답 (image_status 가 pending 이면 get_body_result 로 업로드 완료 여부 조회)
+        return Response({'data': {'message': 'created_body_result', 'image_status': body_result.image_status,
+                                  'status': HTTP_200_OK}}, status=HTTP_200_OK)
     else:
         # Serializer 유효성 검사 실패
         return Response({'data': {'message': serializer.errors, 'status': HTTP_500_INTERNAL_SERVER_ERROR}},
@@ -1832,28 +1618,7 @@ def get_body_result(request):
     if count is not None:
         body_results = body_results.all()[:int(count)]
 
-    # 수정된 body_results를 리스트로 저장
-    updated_body_results = []
-
-    for body_result in body_results:
-        created_dt = body_result.created_dt.strftime('%Y%m%dT%H%M%S%f')
-        # Presigned URL 생성 (일정 시간 동안)
-        body_result.image_front_url = generate_presigned_url(file_keys=['front', created_dt])
-        body_result.image_side_url = generate_presigned_url(file_keys=['side', created_dt])
-
-        if body_result.image_front_url is not None and requests.get(body_result.image_front_url).status_code in [400,
-                                                                                                                 404]:
-            body_result.image_front_url = None
-        if body_result.image_side_url is not None and requests.get(body_result.image_side_url).status_code in [400,
-                                                                                                               404]:
-            body_result.image_side_url = None
-
-        updated_body_results.append(body_result)
-
-    # 모든 객체를 한 번에 업데이트
-    BodyResult.objects.bulk_update(updated_body_results, ['image_front_url', 'image_side_url'])
-
-    # Serialize the BodyResult objects
+    # Serialize the BodyResult objects (이미지 URL은 직렬화 시점에 생성, DB에 저장하지 않음)
     serializer = BodyResultSerializer(body_results, many=True)
 
     return Response({'data': serializer.data, 'message': 'OK', 'status': 200})
@@ -1941,7 +1706,7 @@ def login_kiosk_id(request):
     except UserInfo.DoesNotExist:
         return Response({'data': {"message": "user_not_found", 'status': 401}})
 
-    if not check_password(password, user_info.password) and (phone_number == user_info.phone_number):
+    if not password_hasher.verify_password(password, user_info.password) and (phone_number == user_info.phone_number):
         return Response(
             {'data': {'message': 'incorrect_password', 'status': 401}, 'message': 'incorrect_password', 'status': 401})
     else:
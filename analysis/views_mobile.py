@@ -1,27 +1,32 @@
-import os
+import json
+from concurrent.futures import wait
 
-from django.contrib.auth.hashers import make_password
 from django.utils import timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-import requests
 from rest_framework import viewsets, permissions, status
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from analysis.custom.metrics import calculate_active_users
-from analysis.helpers import generate_presigned_url, measure_time, parse_userinfo, upload_image_to_s3, verify_image
-from analysis.models import GaitResult, AuthInfo, UserInfo, CodeInfo, BodyResult, SessionInfo, SchoolInfo
+from analysis.helpers import generate_body_image_key, get_body_image_variant_urls, measure_time, parse_userinfo, \
+    upload_image_to_s3, verify_image
+from analysis.custom.code_info import code_info_registry
+from analysis.custom.credentials import password_hasher
+from analysis.custom.image_jobs import enqueue_image_jobs
+from analysis.custom.s3_io import s3_io
+from analysis.custom.upload_handlers import SpooledFileUploadHandler
+from analysis.models import GaitResult, AuthInfo, UserInfo, BodyResult, SessionInfo, SchoolInfo
 from analysis.serializers import GaitResultSerializer, CodeInfoSerializer, BodyResultSerializer, KeypointSerializer
 
 import pytz
 from django.core.paginator import Paginator  # 페이지네이션
-from concurrent.futures import ThreadPoolExecutor  # 병렬 처리
 from django.db.models import Subquery
 from datetime import datetime as dt
 from django.db import transaction  # DB 트랜잭션
-from django.contrib.auth.hashers import make_password, check_password
+from django.conf import settings
 from django.db.models import Q
 
 kst = pytz.timezone('Asia/Seoul')
@@ -82,7 +87,7 @@ def login_mobile(request):
         phone_number=auth_info.phone_number,
         defaults=dict(
             username=auth_info.phone_number,
-            password=make_password(os.environ['DEFAULT_PASSWORD']),
+            password=password_hasher.default_password_hash,  # 새로 만드는 경우만 호출 (TTL 동안 공용 해시)
         ))
 
     if authorized_user_info.school is not None:
@@ -196,15 +201,15 @@ def login_mobile_id(request):
 
     try:
         req_user_info = UserInfo.objects.get(Q(phone_number=id))
-        if not check_password(password, req_user_info.password):
+        if not password_hasher.verify_password(password, req_user_info.password):
             return Response({'message': 'user_not_found'}, status=status.HTTP_200_OK)
 
         # 마지막 로그인 시간 갱신
         req_user_info.last_login = dt.now()
         req_user_info.save()
 
-        # 초기 비밀번호 상태 확인
-        init_passwd_status = check_password(os.environ['DEFAULT_PASSWORD'], req_user_info.password)
+        # 초기 비밀번호 상태 확인 (검증된 입력값과 비교하므로 해시를 다시 계산하지 않음)
+        init_passwd_status = password_hasher.is_default_password(password)
 
         # JWT 토큰 생성
         token = TokenObtainPairSerializer.get_token(req_user_info)
@@ -279,7 +284,7 @@ def login_mobile_uuid(request):
         phone_number=auth_info.uuid,
         defaults=dict(
             username=auth_info.uuid,
-            password=make_password(os.environ['DEFAULT_PASSWORD']),
+            password=password_hasher.default_password_hash,  # 새로 만드는 경우만 호출 (TTL 동안 공용 해시)
         ))
 
     if authorized_user_info.school is not None:
@@ -507,9 +512,9 @@ def get_code(request):
     if not group_id_list:
         return Response({'status': 'FAILURE', 'message': 'group_id_list_required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    results = CodeInfo.objects.filter(group_id__in=group_id_list)
+    results = code_info_registry.get_groups(group_id_list)
 
-    if not results.exists():
+    if not results:
         return Response({"" "message": "code_not_found"}, status=status.HTTP_404_NOT_FOUND)
 
     # Serialize the CodeInfo objects
@@ -652,6 +657,8 @@ def get_gait_result(request):
                                 "scoliosis_hip_ratio": openapi.Schema(type=openapi.TYPE_NUMBER),
                                 "image_front_url": openapi.Schema(type=openapi.TYPE_STRING),
                                 "image_side_url": openapi.Schema(type=openapi.TYPE_STRING),
+                                "image_status": openapi.Schema(type=openapi.TYPE_STRING,
+                                                               description="pending / done / failed"),
                                 "mobile_yn": openapi.Schema(type=openapi.TYPE_STRING, description="y: mobile, n: kiosk",
                                                             default="n"),
                                 "created_dt": openapi.Schema(type=openapi.TYPE_STRING, format="date-time"),
@@ -712,34 +719,7 @@ def get_body_result(request):
 
     minimal_body_results = currnet_page.object_list  # 현재 페이지의 객체의 정보를 대입
 
-    # 수정된 body_results를 리스트로 저장
-    """ body_result -> 페이지네이션 처리 후 페이지 사이즈만큼의 쿼리셋 -> 
-        minimal_body_results -> S3 이미지 객체를 S3 미리 서명된 URL로 변환 ->  
-        updated_body_results """
-    updated_body_results = []
-
-    # body_result 객체를 받아서 이미지 URL을 생성하고, 상태를 확인
-    def process_body_result(body_result):
-        # Presigned URL 생성 및 상태 확인.
-        created_dt = body_result.created_dt.strftime('%Y%m%dT%H%M%S%f')
-        body_result.image_front_url = generate_presigned_url(file_keys=['front', created_dt])
-        body_result.image_side_url = generate_presigned_url(file_keys=['side', created_dt])
-
-        # URL 검증
-        if requests.get(body_result.image_front_url).status_code in [400, 404]:
-            body_result.image_front_url = None
-        if requests.get(body_result.image_side_url).status_code in [400, 404]:
-            body_result.image_side_url = None
-
-        return body_result
-
-    # 병렬 처리로 minimal_body_results 순회
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        updated_body_results = list(executor.map(process_body_result, minimal_body_results))
-    # 모든 객체를 한 번에 업데이트
-    BodyResult.objects.bulk_update(updated_body_results, ['image_front_url', 'image_side_url'])
-
-    # Serialize the BodyResult objects
+    # Serialize the BodyResult objects (이미지 URL은 직렬화 시점에 생성, DB에 저장하지 않음)
     serializer = BodyResultSerializer(minimal_body_results, many=True)
 
     # 페이지네이션 INFO 및 정보 가공
@@ -761,7 +741,13 @@ def get_body_result(request):
     - mobile only
     - header: Bearer token required
     - returns front and side data with keypoints
+    - width: display width(px) of the images. the smallest WebP variant covering the width is returned
+      (original PNG when no variant fits or it is not generated yet). default 1024
     """,
+    manual_parameters=[
+        openapi.Parameter('width', openapi.IN_QUERY, description="image display width(px), 0: original image",
+                          type=openapi.TYPE_INTEGER, default=1024),
+    ],
     responses={
         200: openapi.Response(
             description='Success',
@@ -854,15 +840,13 @@ def get_body_result_id(request, id):
         return Response({'data': {'message': 'body_result_not_found'}}, status=status.HTTP_404_NOT_FOUND)
 
     try:
-        # 이미지 URL 생성
-        created_dt = body_result.created_dt.strftime('%Y%m%dT%H%M%S%f')
-        image_front_url = generate_presigned_url(file_keys=['front', created_dt])
-        image_side_url = generate_presigned_url(file_keys=['side', created_dt])
+        width = int(request.query_params.get('width', settings.BODY_IMAGE_DEFAULT_WIDTH))
+    except ValueError:
+        return Response({'data': {'message': 'invalid_width'}}, status=status.HTTP_400_BAD_REQUEST)
 
-        # image_front_url, image_side_url 1시간 접근 가능 URL 업데이트
-        body_result.image_front_url = image_front_url
-        body_result.image_side_url = image_side_url
-        body_result.save()
+    try:
+        # 이미지 URL 생성 (1시간 접근 가능 URL, DB에 저장하지 않음) - 표시 너비에 맞는 가장 작은 파생 이미지 사용
+        image_front_url, image_side_url = get_body_image_variant_urls(body_result, width)
 
         # Front data 구성
         front_data = {
@@ -918,7 +902,8 @@ def get_body_result_id(request, id):
             'front_data': front_data,
             'side_data': side_data,
             'image_front': image_front_url,
-            'image_side': image_side_url
+            'image_side': image_side_url,
+            'image_status': body_result.image_status
         }
 
         return Response(response_data, status=status.HTTP_200_OK)
@@ -1074,6 +1059,8 @@ def delete_body_result(request):
                         properties={
                             'message': openapi.Schema(type=openapi.TYPE_STRING),
                             'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                            'image_status': openapi.Schema(type=openapi.TYPE_STRING,
+                                                           description='pending / done / failed'),
                         }
                     )
                 }
@@ -1088,6 +1075,63 @@ def delete_body_result(request):
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def create_body_result(request) -> Response:
+    return _create_body_result(request)
+
+
+@swagger_auto_schema(
+    method='post',
+    operation_summary="체형 결과 생성 (multipart 이미지 파일)",
+    operation_description="""Create a new body result record with multipart/form-data image files
+    - mobile only
+    - same as create_body_result, but images are sent as file parts instead of base64 strings
+    - front_data / side_data: JSON encoded string (same structure as create_body_result)
+    - image parts are streamed to a spooled temp file (not loaded into memory at once)
+    """,
+    manual_parameters=[
+        openapi.Parameter('front_data', openapi.IN_FORM, type=openapi.TYPE_STRING, required=True,
+                          description='JSON encoded front_data'),
+        openapi.Parameter('side_data', openapi.IN_FORM, type=openapi.TYPE_STRING, required=True,
+                          description='JSON encoded side_data'),
+        openapi.Parameter('image_front', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True),
+        openapi.Parameter('image_side', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True),
+    ],
+    responses={
+        200: 'Success',
+        400: 'Bad Request',
+        401: 'Unauthorized',
+        500: 'Internal Server Error',
+    },
+    tags=['mobile']
+)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+@parser_classes([MultiPartParser])
+def create_body_result_multipart(request) -> Response:
+    # 이미지 파트를 메모리에 모두 올리지 않고 SpooledTemporaryFile 로 수신
+    request._request.upload_handlers = [SpooledFileUploadHandler(request._request)]
+    return _create_body_result(request)
+
+
+def _upload_body_images(body_result, verified_front, verified_side):
+    """커밋된 BodyResult 의 앞/옆 이미지를 S3 에 업로드 후 key 저장 (실패하면 BodyResult 를 삭제하고 예외 전달)"""
+    file_keys = [generate_body_image_key(body_result, 'front'), generate_body_image_key(body_result, 'side')]
+    # 병렬로 이미지 업로드 (요청마다 스레드를 만들지 않고 프로세스 공용 S3 I/O executor 사용)
+    futures = [
+        s3_io.submit(upload_image_to_s3, verified_front, file_keys[0]),
+        s3_io.submit(upload_image_to_s3, verified_side, file_keys[1])
+    ]
+    wait(futures)  # 한쪽이 실패해도 나머지 업로드가 끝난 뒤 정리
+    try:
+        body_result.image_front_key, body_result.image_side_key = [f.result() for f in futures]
+    except Exception:
+        # 먼저 업로드된 이미지도 S3 삭제 대기열에 기록되도록 key 를 채운 뒤 삭제 (keypoints 는 CASCADE)
+        body_result.image_front_key, body_result.image_side_key = file_keys
+        body_result.delete()
+        raise
+    body_result.save(update_fields=['image_front_key', 'image_side_key'])
+
+
+def _create_body_result(request) -> Response:
     user_id = request.user.id
     if not user_id:
         return Response({'data': {'message': 'token_required'}}, status=status.HTTP_400_BAD_REQUEST)
@@ -1097,6 +1141,12 @@ def create_body_result(request) -> Response:
         front_data = request.data.get('front_data', {})
         side_data = request.data.get('side_data', {})
 
+        # multipart 요청은 front_data / side_data 를 JSON 문자열로 전달
+        if isinstance(front_data, str):
+            front_data = json.loads(front_data)
+        if isinstance(side_data, str):
+            side_data = json.loads(side_data)
+
         # results 데이터 병합
         body_data = {
             **front_data.get('results', {}),
@@ -1126,49 +1176,30 @@ def create_body_result(request) -> Response:
             body_data['student_class'] = user_info.student_number
             body_data['student_number'] = user_info.student_number
 
-        body_data['image_front_url'] = 'Not_yet_queried'  # 임시 데이터
-        body_data['image_side_url'] = 'Not_yet_queried'  # 추후 체형 분석 결과 쿼리 시 Image URL로 변경됨
-
         # BodyResult 생성
         serializer = BodyResultSerializer(data=body_data)
         if not serializer.is_valid():
             return Response({'data': {'message': serializer.errors}}, status=status.HTTP_400_BAD_REQUEST)
 
+        image_front = request.data.get('image_front')
+        image_side = request.data.get('image_side')
+        if not (image_front and image_side):  # 이미지 누락 처리
+            missing_images = []
+            if not image_front: missing_images.append("image_front")
+            if not image_side: missing_images.append("image_side")
+            raise ValueError(f"Missing images: {', '.join(missing_images)}")
+
+        if not settings.IMAGE_UPLOAD_ASYNC:
+            # 동기 업로드: 트랜잭션 밖에서 검증 / 업로드 (S3 I/O 동안 트랜잭션과 DB 커넥션을 잡고 있지 않도록)
+            try:
+                verified_front = verify_image(image_front)
+                verified_side = verify_image(image_side)
+            except ValueError as ve:
+                raise ValueError(f"Invalid image format: {str(ve)}")
+
         with transaction.atomic():
             body_result = serializer.save()  # BodyResult 저장
 
-            # 이미지 처리
-            # created_dt = dt.now().strftime('%Y%m%dT%H%M%S%f')
-            # String -> datetime 변환 후 날짜포맷 설정
-            _db_created_dt = dt.strptime(serializer.data['created_dt'], '%Y-%m-%dT%H:%M:%S.%f')
-
-            created_dt = _db_created_dt.strftime('%Y%m%dT%H%M%S%f')
-
-            image_front = request.data.get('image_front')
-            image_side = request.data.get('image_side')
-
-            if image_front and image_side:
-                try:
-                    verified_front = verify_image(image_front)
-                    verified_side = verify_image(image_side)
-
-                    # 병렬로 이미지 업로드
-                    with ThreadPoolExecutor(max_workers=2) as executor:
-                        futures = [
-                            executor.submit(upload_image_to_s3, verified_front, ['front', created_dt]),
-                            executor.submit(upload_image_to_s3, verified_side, ['side', created_dt])
-                        ]
-                        for future in futures:
-                            future.result()  # 모든 업로드가 완료될 때까지 대기
-
-                except ValueError as ve:
-                    raise ValueError(f"Invalid image format: {str(ve)}")
-            else:  # 이미지 누락 처리
-                missing_images = []
-                if not image_front: missing_images.append("image_front")
-                if not image_side: missing_images.append("image_side")
-                raise ValueError(f"Missing images: {', '.join(missing_images)}")
-
             # Front Keypoints 저장
             front_keypoints = front_data.get('keypoints', [])
             if len(front_keypoints) == 33:  # keypoints는 총 33개의 데이터여야 함
@@ -1207,10 +1238,18 @@ def create_body_result(request) -> Response:
             else:
                 raise ValueError(f"Invalid side keypoints: {side_keypoints}")
 
+            if settings.IMAGE_UPLOAD_ASYNC:
+                # 스풀 파일 기록 + 작업 등록만 하고 커밋 (검증/변환/업로드는 run_image_worker 에서 처리)
+                enqueue_image_jobs(body_result, {'front': image_front, 'side': image_side})
+
+        if not settings.IMAGE_UPLOAD_ASYNC:
+            _upload_body_images(body_result, verified_front, verified_side)
+
         calculate_active_users()  # 활성 사용자 갱신
 
-        return Response(  # 200(생성) 응답
-            {'data': {'message': 'created_body_result', 'id': serializer.data['id']}},
+        return Response(  # 200(생성) 응답, image_status 가 pending 이면 업로드 완료 여부를 조회해야 함
+            {'data': {'message': 'created_body_result', 'id': body_result.id,
+                      'image_status': body_result.image_status}},
             status=status.HTTP_200_OK
         )
 
@@ -0,0 +1,74 @@
+"""
+체형 결과 리스트 API(모바일 get_body_result) 지연시간 p50/p99 측정
+
+- read-only      : 현재 동작 (이미지 URL은 직렬화 시점에 생성, DB 쓰기 없음)
+- legacy-persist : 변경 전 동작의 DB 쓰기 재현 (조회 시마다 페이지 전체 image_*_url bulk_update)
+                   ※ 변경 전 presigned URL HTTP 다운로드 확인은 외부 네트워크가 필요하므로 제외
+
+실행: python benchmarks/bench_body_result_list.py --rows 200 --requests 300
+"""
+import argparse
+import time
+
+from common import benchmark_database, print_latency
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=200, help='사용자당 BodyResult 수')
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from analysis.helpers import get_body_image_keys, get_body_image_urls, mark_s3_objects
+    from analysis.models import BodyResult, SchoolInfo, UserInfo
+
+    with benchmark_database():
+        school = SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        user = UserInfo.objects.create(username='01000000000', phone_number='01000000000', user_type='G')
+        for i in range(args.rows):
+            body_result = BodyResult.objects.create(user=user, school=school, mobile_yn='n', face_level_angle=i)
+            body_result.image_front_key, body_result.image_side_key = get_body_image_keys(body_result)
+            body_result.save(update_fields=['image_front_key', 'image_side_key'])
+
+        # 업로드 시점과 동일하게 존재 여부 인덱스 채움 (S3 호출 없이 측정)
+        mark_s3_objects([key for br in BodyResult.objects.all() for key in get_body_image_keys(br)])
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = f'/api/mobile/body/get_body_result/?page_size={args.page_size}'
+
+        def request_read_only(page):
+            return client.get(f'{url}&page={page}')
+
+        def request_legacy_persist(page):
+            response = client.get(f'{url}&page={page}')
+            # 변경 전: 조회한 페이지의 URL을 매번 DB에 다시 기록
+            page_results = list(BodyResult.objects.filter(user=user).order_by('-created_dt')[
+                                (page - 1) * args.page_size:page * args.page_size])
+            image_urls = get_body_image_urls(page_results)
+            for body_result in page_results:
+                body_result.image_front_url, body_result.image_side_url = image_urls[body_result.id]
+            BodyResult.objects.bulk_update(page_results, ['image_front_url', 'image_side_url'])
+            return response
+
+        num_pages = max(1, args.rows // args.page_size)
+        for label, request in [('read-only', request_read_only), ('legacy-persist', request_legacy_persist)]:
+            request(1)  # warm-up (presigned URL 캐시)
+            samples = []
+            with CaptureQueriesContext(connection) as queries:
+                for i in range(args.requests):
+                    start = time.perf_counter()
+                    response = request(i % num_pages + 1)
+                    samples.append((time.perf_counter() - start) * 1000)
+                    assert response.status_code == 200, response.content
+            print_latency(label, samples)
+            print(f'{"":<40} queries/request={len(queries) / args.requests:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+메인 화면(대시보드) 학교 집계 지연시간 / 쿼리 수 비교 (기본 회원 5,000명, 검사 결과 50,000건)
+
+- legacy : 변경 전 views.main 의 집계 쿼리 재현 (회원 수, 총 검사 수, 이번달 검사 수, 미완료 NOT IN, 학년/반 구성)
+- cold   : get_dashboard_stats 캐시 miss (회원 집계 1회 + 기관 통계(BodyResultRollup) 합산 1회)
+- cached : get_dashboard_stats 캐시 hit
+
+실행: python benchmarks/bench_dashboard.py --members 5000 --results 50000 --repeat 20
+"""
+import argparse
+import random
+import time
+from datetime import datetime as dt
+
+from common import benchmark_database, print_latency
+
+
+def legacy_school_stats(user):
+    """변경 전 views.main (학교) 의 집계"""
+    from django.db.models import Count
+
+    from analysis.models import BodyResult, UserInfo
+
+    members = UserInfo.objects.filter(school__school_name=user.school.school_name).count()
+    total_results = BodyResult.objects.filter(
+        user__school__school_name=user.school.school_name,
+        image_front_key__isnull=False,
+        image_side_key__isnull=False
+    ).count()
+    current_month_results = BodyResult.objects.filter(
+        user__school__school_name=user.school.school_name,
+        image_front_key__isnull=False,
+        image_side_key__isnull=False,
+        created_dt__month=dt.now().month
+    ).count()
+    pending_tests = UserInfo.objects.filter(school__id=user.school.id, year=dt.now().year).exclude(
+        id__in=BodyResult.objects.filter(
+            user__school__id=user.school.id,
+            image_front_key__isnull=False,
+            image_side_key__isnull=False,
+            created_dt__year=dt.now().year
+        ).values('user_id')
+    ).count()
+    groups = list(UserInfo.objects.filter(
+        school__school_name=user.school.school_name,
+        year=dt.now().year
+    ).values('student_grade', 'student_class').annotate(student_count=Count('id')).order_by('student_grade',
+                                                                                            'student_class'))
+    return members, total_results, current_month_results, pending_tests, groups
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=5000)
+    parser.add_argument('--results', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from django.core.cache import cache
+    from django.db import connection
+    from django.db.models import F
+    from django.test.utils import CaptureQueriesContext
+
+    from analysis.custom.dashboard import get_dashboard_stats
+    from analysis.custom.rollup import rebuild_rollups
+    from analysis.models import BodyResult, SchoolInfo, UserInfo
+
+    rng = random.Random(0)
+    year = dt.now().year
+
+    with benchmark_database():
+        other_school = SchoolInfo.objects.create(school_name='다른학교', contact_number='N/A')
+        school = SchoolInfo.objects.create(school_name='벤치초등학교', contact_number='N/A')
+        admin = UserInfo.objects.create(username='admin', phone_number='admin', user_type='S', school=school)
+        for target_school, count in [(school, args.members), (other_school, args.members)]:
+            UserInfo.objects.bulk_create([
+                UserInfo(username=f'{target_school.id}-{i}', phone_number=f'{target_school.id}-{i}', user_type='S',
+                         school=target_school, student_grade=i % 6 + 1, student_class=i % 10 + 1,
+                         student_number=i % 30 + 1, year=year if i % 5 else year - 1)
+                for i in range(count)
+            ], batch_size=2000)
+        member_ids = list(UserInfo.objects.filter(school=school).exclude(id=admin.id).values_list('id', flat=True))
+        BodyResult.objects.bulk_create([
+            BodyResult(user_id=rng.choice(member_ids), school=school, normal_count=rng.randint(0, 11),
+                       student_grade=rng.randint(1, 6), student_class=rng.randint(1, 10),
+                       image_front_key=f'front-{i}.png', image_side_key=f'side-{i}.png')
+            for i in range(args.results)
+        ], batch_size=5000)
+        # 절반은 작년 검사 결과로 변경 (created_dt 는 auto_now_add)
+        BodyResult.objects.alias(parity=F('id') % 2).filter(parity=0).update(created_dt=dt(year - 1, 6, 1))
+        # bulk_create 는 시그널이 없으므로 기관 통계는 재계산으로 생성
+        start = time.perf_counter()
+        rollup_count = rebuild_rollups()
+        print(f'members={args.members} results={args.results} rollups={rollup_count} '
+              f'(rebuild {(time.perf_counter() - start) * 1000:.0f}ms)')
+
+        def run(label, fn, before=None):
+            samples = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(args.repeat):
+                    if before:
+                        before()
+                    start = time.perf_counter()
+                    fn()
+                    samples.append((time.perf_counter() - start) * 1000)
+            print_latency(f'{label} (queries/call={len(queries) / args.repeat:.1f})', samples)
+
+        run('legacy', lambda: legacy_school_stats(admin))
+        run('cold', lambda: get_dashboard_stats(admin), before=cache.clear)
+        run('cached', lambda: get_dashboard_stats(admin))
+
+
+if __name__ == '__main__':
+    main()
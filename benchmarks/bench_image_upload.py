@@ -0,0 +1,93 @@
+"""
+체형 결과 이미지 업로드(verify_image + upload_image_to_s3) 1건당 CPU 시간 / 최대 메모리 측정
+
+- png-fast-path : PNG 원본 바이트 그대로 업로드 (현재 동작)
+- png-reencode  : 변경 전 동작 재현 (PNG 도 PIL 디코딩 후 PNG 재인코딩)
+- jpeg-transcode: PNG 가 아닌 입력 (JPEG -> PNG 변환)
+
+S3 대신 로컬 파일시스템(LocalS3Client)에 업로드하므로 네트워크 시간은 포함되지 않음
+각 방식은 별도 프로세스(fork)에서 실행하여 최대 RSS 증가량을 분리 측정
+
+실행: python benchmarks/bench_image_upload.py --uploads 20 --width 1080 --height 1920
+"""
+import argparse
+import base64
+import multiprocessing
+import os
+import resource
+import tempfile
+from contextlib import nullcontext
+from io import BytesIO
+from unittest import mock
+
+from common import measure, percentile
+
+
+def make_photo(width, height, image_format):
+    """키오스크 촬영 이미지와 비슷한 압축률의 RGB 이미지 생성 (그라데이션 + 노이즈)"""
+    from PIL import Image
+
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 24)
+    image = Image.merge('RGB', (gradient, noise, Image.blend(gradient, noise, 0.5)))
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format)
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+
+def run_variant(payload, uploads, force_reencode, queue):
+    from analysis import helpers
+
+    base_rss = current_rss_mb()
+    cpu_samples = []
+    with mock.patch.object(helpers, 'sniff_png', return_value=None) if force_reencode else nullcontext():
+        for i in range(uploads):
+            with measure() as m:
+                verified = helpers.verify_image(payload)
+                helpers.upload_image_to_s3(verified, file_keys=['front', f'bench{i}'])
+            cpu_samples.append(m['cpu'] * 1000)
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((cpu_samples, peak_rss - base_rss))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--uploads', type=int, default=20)
+    parser.add_argument('--width', type=int, default=1080)
+    parser.add_argument('--height', type=int, default=1920)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    from analysis.custom.s3_io import s3_io
+
+    with tempfile.TemporaryDirectory() as s3_root:
+        settings.AWS_S3_LOCAL_ROOT = s3_root
+        s3_io.reset()
+
+        png_payload = make_photo(args.width, args.height, 'PNG')
+        jpeg_payload = make_photo(args.width, args.height, 'JPEG')
+        print(f'image {args.width}x{args.height}: png={len(png_payload) * 3 / 4 / 1024 / 1024:.2f}MB '
+              f'jpeg={len(jpeg_payload) * 3 / 4 / 1024 / 1024:.2f}MB')
+
+        context = multiprocessing.get_context('fork')
+        for label, payload, force_reencode in [('png-fast-path', png_payload, False),
+                                               ('png-reencode', png_payload, True),
+                                               ('jpeg-transcode', jpeg_payload, False)]:
+            queue = context.Queue()
+            process = context.Process(target=run_variant, args=(payload, args.uploads, force_reencode, queue))
+            process.start()
+            cpu_samples, rss_delta = queue.get()
+            process.join()
+            print(f'{label:<20} cpu p50={percentile(cpu_samples, 50):8.2f}ms p99={percentile(cpu_samples, 99):8.2f}ms '
+                  f'peak_rss_delta={rss_delta:7.1f}MB')
+
+
+if __name__ == '__main__':
+    main()
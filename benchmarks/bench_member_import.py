@@ -0,0 +1,111 @@
+"""
+회원 등록(엑셀 업로드) 저장 시간 / 쿼리 수 비교 (학교, 기본 1,000행 / 10,000행 - 절반은 작년도 기존 회원, 절반은 신규)
+
+- legacy : 변경 전 member_register 저장 루프 재현 (행마다 SchoolInfo 조회, 기존 회원 조회, UserHist / UserInfo
+           update_or_create, make_password)
+           ※ 행마다 PBKDF2 를 계산하므로 --legacy-max-rows 보다 행 수가 많으면 생략
+- bulk   : 현재 import_members (기존 회원 일괄 조회 + bulk_create / bulk_update, 비밀번호 해시 1회)
+
+실행: python benchmarks/bench_member_import.py --rows 1000,10000 [--legacy-max-rows 1000]
+"""
+import argparse
+import os
+import time
+from datetime import datetime as dt
+
+from common import benchmark_database
+
+
+def legacy_import(admin, users):
+    """변경 전 member_register (학교) 의 저장"""
+    from django.contrib.auth.hashers import make_password
+    from django.db import transaction
+
+    from analysis.helpers import extract_digits
+    from analysis.models import SchoolInfo, UserHist, UserInfo
+
+    with transaction.atomic():
+        for user_data in users:
+            phone_number = extract_digits(str(user_data['전화번호']).replace('-', ''))
+            if phone_number.startswith('10'):
+                phone_number = '0' + phone_number
+            school_info = SchoolInfo.objects.get(school_name=admin.school.school_name)
+            existing_user = UserInfo.objects.filter(phone_number=phone_number).first()
+            if existing_user:
+                if existing_user.created_dt.year != dt.now().year or existing_user.year != dt.now().year:
+                    UserHist.objects.update_or_create(
+                        user=existing_user,
+                        school=existing_user.school,
+                        student_grade=existing_user.student_grade,
+                        student_class=existing_user.student_class,
+                        student_number=existing_user.student_number,
+                        student_name=existing_user.student_name,
+                        year=existing_user.year
+                    )
+            UserInfo.objects.update_or_create(
+                phone_number=phone_number,
+                defaults={
+                    'school': school_info,
+                    'student_grade': user_data['학년'],
+                    'student_class': user_data['반'],
+                    'student_number': user_data['번호'],
+                    'student_name': user_data['이름'],
+                    'username': phone_number,
+                    'password': make_password(os.environ['DEFAULT_PASSWORD']),
+                    'user_type': 'S',
+                    'user_display_name': f"{school_info.school_name} {user_data['학년']}학년 {user_data['반']}반 "
+                                         f"{user_data['번호']}번 {user_data['이름']}",
+                    'organization': None,
+                    'department': None,
+                    'year': dt.now().year
+                }
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', default='1000,10000', help='엑셀 행 수 (쉼표로 여러 개)')
+    parser.add_argument('--legacy-max-rows', type=int, default=1000, help='legacy 를 측정할 최대 행 수')
+    args = parser.parse_args()
+
+    from django.db import connection
+
+    from analysis.custom.member_import import import_members
+    from analysis.models import SchoolInfo, UserHist, UserInfo
+
+    year = dt.now().year
+
+    with benchmark_database():
+        school = SchoolInfo.objects.create(school_name='벤치초등학교', contact_number='N/A')
+        admin = UserInfo.objects.create(username='admin', phone_number='admin', user_type='S', school=school)
+
+        def reset(rows):
+            # 절반은 작년도 기존 회원으로 등록된 상태에서 시작
+            UserHist.objects.all().delete()
+            UserInfo.objects.exclude(id=admin.id).delete()
+            UserInfo.objects.bulk_create([
+                UserInfo(username=f'010{i:08d}', phone_number=f'010{i:08d}', user_type='S', school=school,
+                         student_grade=i % 6 + 1, student_class=i % 10 + 1, student_number=i % 30 + 1,
+                         student_name=f'학생{i}', year=year - 1)
+                for i in range(0, rows, 2)
+            ], batch_size=2000)
+
+        for rows in map(int, args.rows.split(',')):
+            users = [{'학년': str(i % 6 + 1), '반': str(i % 10 + 1), '번호': str(i % 30 + 1), '이름': f'학생{i}',
+                      '전화번호': f'010-{i // 10000:04d}-{i % 10000:04d}'} for i in range(rows)]
+            for label, run in [('legacy', legacy_import), ('bulk', import_members)]:
+                if label == 'legacy' and rows > args.legacy_max_rows:
+                    print(f'{label:<7} rows={rows:<6} skipped (--legacy-max-rows={args.legacy_max_rows})')
+                    continue
+                reset(rows)
+                queries = []  # CaptureQueriesContext 는 최근 9,000개까지만 기록하므로 직접 셈
+                with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                    start = time.perf_counter()
+                    run(admin, users)
+                    elapsed = time.perf_counter() - start
+                print(f'{label:<7} rows={rows:<6} wall={elapsed:8.2f}s queries={len(queries)} '
+                      f'users={UserInfo.objects.count() - 1} hists={UserHist.objects.count()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+회원 등록(엑셀 업로드) 전처리 CPU 시간 비교 (학교 템플릿, 기본 50,000행 - 1% 는 오류 행)
+
+- legacy     : 변경 전 member_register 전처리 (iterrows + 셀마다 pd.notna / 문자열 변환) + 저장 시 행마다 전화번호 정규화
+- vectorized : 현재 parse_member_frame (열 단위 pandas 문자열/숫자 연산 + 행별 오류 목록)
+
+엑셀 읽기(read_excel)는 두 방식이 같으므로 DataFrame 을 만든 뒤부터 측정 (process_time)
+
+실행: python benchmarks/bench_member_parse.py --rows 50000 --repeat 5
+"""
+import argparse
+import random
+import time
+
+from common import print_latency
+
+
+def legacy_parse(df):
+    """변경 전 member_register (학교) 의 전처리 + 전화번호 정규화"""
+    import pandas as pd
+
+    from analysis.helpers import extract_digits
+
+    expected_columns = ['학년', '반', '번호', '이름', '전화번호']
+    df = df.dropna(subset=['이름', '전화번호'])
+    users = []
+    for _, row in df.iterrows():
+        user_data = {}
+        for col in expected_columns:
+            if pd.notna(row[col]):
+                if col in ['학년', '반', '번호'] and pd.notna(row[col]):
+                    try:
+                        user_data[col] = str(int(row[col]))
+                    except ValueError:  # 변경 전에는 업로드 전체가 실패
+                        continue
+                else:
+                    user_data[col] = str(row[col]).strip()
+        if len(user_data) == len(expected_columns):
+            users.append(user_data)
+    for user_data in users:
+        phone_number = extract_digits(str(user_data['전화번호']).replace('-', ''))
+        if phone_number.startswith('10'):
+            phone_number = '0' + phone_number
+        user_data['전화번호'] = phone_number
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    from analysis.custom.member_import import parse_member_frame
+
+    rng = random.Random(0)
+    rows = []
+    for i in range(args.rows):
+        row = [i % 6 + 1, i % 10 + 1, i % 30 + 1, f' 학생{i} ', f'010-{i // 10000:04d}-{i % 10000:04d}']
+        if rng.random() < 0.01:  # 오류 행 (숫자가 아닌 반 / 전화번호 누락)
+            column = rng.choice([1, 4])
+            row[column] = '가' if column == 1 else None
+        rows.append(row)
+    # read_excel 과 같이 숫자 열은 float(누락 포함) / object, 전화번호는 문자열
+    df = pd.DataFrame(rows, columns=['학년', '반', '번호', '이름', '전화번호'])
+
+    for label, parse in [('legacy', legacy_parse), ('vectorized', lambda frame: parse_member_frame(frame, 'S'))]:
+        samples = []
+        for _ in range(args.repeat):
+            start = time.process_time()
+            parse(df)
+            samples.append((time.process_time() - start) * 1000)
+        print_latency(f'{label} rows={args.rows}', samples)
+
+
+if __name__ == '__main__':
+    main()
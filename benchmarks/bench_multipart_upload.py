@@ -0,0 +1,109 @@
+"""
+모바일 체형 결과 생성 API 동시 요청 시 요청당 메모리 사용량 비교
+
+- json-base64 : create_body_result (이미지를 base64 문자열로 JSON 본문에 포함)
+- multipart   : create_body_result_multipart (이미지 파일 파트를 SpooledTemporaryFile 로 수신)
+
+--concurrency 개 요청을 동시에 보내는 라운드를 --rounds 번 반복하고,
+라운드별 파이썬 힙 최대 사용량(tracemalloc)을 동시 요청 수로 나누어 요청당 최대 메모리로 출력
+(테스트 클라이언트가 요청 본문을 만드는 메모리도 포함되므로 두 방식의 상대 비교용)
+S3 는 로컬 파일시스템(LocalS3Client) 사용, --sync 옵션 시 요청 안에서 S3 업로드까지 수행 (IMAGE_UPLOAD_ASYNC=False)
+
+실행: python benchmarks/bench_multipart_upload.py --concurrency 8 --rounds 3
+"""
+import argparse
+import base64
+import json
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_image_upload import make_photo
+from common import benchmark_database, peak_rss_mb
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--width', type=int, default=1080)
+    parser.add_argument('--height', type=int, default=1920)
+    parser.add_argument('--sync', action='store_true', help='요청 안에서 이미지 검증/업로드까지 수행')
+    args = parser.parse_args()
+
+    from django.conf import settings
+    from django.core.files.uploadedfile import SimpleUploadedFile
+    from django.db import connections
+    from rest_framework.test import APIClient
+
+    from analysis.custom.s3_io import s3_io
+    from analysis.models import SchoolInfo, UserInfo
+
+    work_dir = tempfile.TemporaryDirectory()
+    settings.AWS_S3_LOCAL_ROOT = f'{work_dir.name}/s3'
+    settings.IMAGE_SPOOL_DIR = f'{work_dir.name}/spool'
+    settings.IMAGE_UPLOAD_ASYNC = not args.sync
+    # JSON(base64) 본문은 기본 DATA_UPLOAD_MAX_MEMORY_SIZE(2.5MB)를 넘으면 거부되므로 비교를 위해 제한 해제
+    # (multipart 파일 파트는 이 제한에 포함되지 않음)
+    settings.DATA_UPLOAD_MAX_MEMORY_SIZE = None
+    s3_io.reset()
+
+    image_base64 = make_photo(args.width, args.height, 'PNG')
+    image_bytes = base64.b64decode(image_base64)
+    print(f'image {args.width}x{args.height}: {len(image_bytes) / 1024 / 1024:.2f}MB, '
+          f'concurrency={args.concurrency}, async={settings.IMAGE_UPLOAD_ASYNC}')
+
+    keypoints = [{'x': 0.5, 'y': 0.5, 'z': 0.0, 'visibility': 1.0, 'presence': 1.0}] * 33
+    front_data = {'results': {'face_level_angle': 1.0, 'shoulder_level_angle': 2.0}, 'keypoints': keypoints}
+    side_data = {'results': {'forward_head_angle': 3.0}, 'keypoints': keypoints}
+
+    with benchmark_database():
+        SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        user = UserInfo.objects.create(username='01000000000', phone_number='01000000000', user_type='G')
+
+        def request_json():
+            client = APIClient()
+            client.force_authenticate(user=user)
+            return client.post('/api/mobile/body/create_body_result/', {
+                'front_data': front_data, 'side_data': side_data,
+                'image_front': image_base64, 'image_side': image_base64,
+            }, format='json')
+
+        def request_multipart():
+            client = APIClient()
+            client.force_authenticate(user=user)
+            return client.post('/api/mobile/body/create_body_result_multipart/', {
+                'front_data': json.dumps(front_data), 'side_data': json.dumps(side_data),
+                'image_front': SimpleUploadedFile('front.png', image_bytes, content_type='image/png'),
+                'image_side': SimpleUploadedFile('side.png', image_bytes, content_type='image/png'),
+            }, format='multipart')
+
+        def run_request(request):
+            try:
+                response = request()
+                assert response.status_code == 200, response.data
+            finally:
+                connections.close_all()  # 스레드별 DB 커넥션 정리
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            for label, request in [('multipart', request_multipart), ('json-base64', request_json)]:
+                run_request(request)  # warm-up (미들웨어/메트릭 초기화는 동시에 실행되지 않도록 먼저 1회 수행)
+                per_request_peaks = []
+                start = time.perf_counter()
+                for _ in range(args.rounds):
+                    tracemalloc.start()
+                    list(executor.map(lambda _: run_request(request), range(args.concurrency)))
+                    per_request_peaks.append(tracemalloc.get_traced_memory()[1] / 1024 / 1024 / args.concurrency)
+                    tracemalloc.stop()
+                elapsed = time.perf_counter() - start
+                print(f'{label:<14} peak/request max={max(per_request_peaks):7.1f}MB '
+                      f'avg={sum(per_request_peaks) / len(per_request_peaks):7.1f}MB '
+                      f'throughput={args.rounds * args.concurrency / elapsed:6.1f} req/s '
+                      f'process_rss_peak={peak_rss_mb():7.1f}MB')
+
+    work_dir.cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+비밀번호 해시(PBKDF2) 비용 비교 (DB 사용 안 함)
+
+- auto_signup : login_mobile / login_mobile_uuid 의 get_or_create defaults
+                legacy = 호출마다 make_password (기존 회원도 계산), current = 공용 해시를 새 계정 생성 시에만 사용
+- id_login    : login_mobile_id 의 비밀번호 확인
+                legacy = check_password 2회 (입력값 + 초기 비밀번호), current = verify_password 1회 + 문자열 비교
+- concurrent  : --threads 개 요청 스레드가 동시에 해시할 때 요청당 지연시간 (inline = 요청 스레드, pool = 프로세스 풀)
+
+실행: python benchmarks/bench_password_hash.py [--requests 50] [--threads 8] [--workers 2,4]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import print_latency
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50, help='측정할 요청 수')
+    parser.add_argument('--threads', type=int, default=8, help='concurrent 의 요청 스레드 수')
+    parser.add_argument('--workers', default='2,4', help='PASSWORD_HASH_WORKERS (쉼표로 여러 개)')
+    args = parser.parse_args()
+
+    from django.contrib.auth.hashers import check_password, make_password
+    from django.test import override_settings
+
+    from analysis.custom.credentials import password_hasher
+
+    default_password = os.environ['DEFAULT_PASSWORD']
+    encoded = make_password(default_password)
+
+    with override_settings(PASSWORD_HASH_WORKERS=0):
+        password_hasher.reset()
+        print_latency('auto_signup legacy', [timed(make_password, default_password) for _ in range(args.requests)])
+        print_latency('auto_signup current', [timed(password_hasher.default_password_hash)
+                                              for _ in range(args.requests)])
+
+        def legacy_id_login():
+            check_password(default_password, encoded)
+            check_password(default_password, encoded)
+
+        def current_id_login():
+            password_hasher.verify_password(default_password, encoded)
+            password_hasher.is_default_password(default_password)
+
+        print_latency('id_login legacy', [timed(legacy_id_login) for _ in range(args.requests)])
+        print_latency('id_login current', [timed(current_id_login) for _ in range(args.requests)])
+
+    for workers in [0, *map(int, args.workers.split(','))]:
+        with override_settings(PASSWORD_HASH_WORKERS=workers):
+            password_hasher.reset()
+            password_hasher.hash_password(default_password)  # 풀 프로세스 시작 시간 제외
+            with ThreadPoolExecutor(max_workers=args.threads) as executor:
+                start = time.perf_counter()
+                samples = list(executor.map(lambda _: timed(password_hasher.hash_password, default_password),
+                                            range(args.requests)))
+                elapsed = time.perf_counter() - start
+            label = 'inline' if workers == 0 else f'pool workers={workers}'
+            print_latency(f'concurrent {label}', samples)
+            print(f'{"":<40} throughput={args.requests / elapsed:8.2f} hashes/s')
+    password_hasher.reset()
+
+
+if __name__ == '__main__':
+    main()
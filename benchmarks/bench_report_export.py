@@ -0,0 +1,152 @@
+"""
+결과 조회 엑셀 다운로드(report_download) 시간 / 메모리 비교 (기관 부서 회원 10,000명, 100,000명 - 회원당 검사 결과 1건)
+
+- legacy    : 변경 전 방식 재현 (dict 목록 -> DataFrame -> to_excel(BytesIO) -> load_workbook -> 셀 단위 스타일 -> save)
+              ※ 회원 id 가 많으면 SQLite 변수 개수 제한을 넘으므로 BodyResult 조회 조건은 id 목록 대신 서브쿼리 사용
+- streaming : 현재 report_download (회원 iterator + chunk 단위 결과 조회 + openpyxl write-only -> 임시 파일 전송)
+              ※ 행 수와 관계없이 요청에서 바로 생성하도록 REPORT_EXPORT_SYNC_MAX_ROWS 를 올려서 측정 (백그라운드 작업도 같은 함수 사용)
+
+wall 은 tracemalloc 없이 측정, --memory 옵션을 주면 한 번 더 실행하여 파이썬 힙 최대 사용량(py_peak) 측정
+(tracemalloc 으로 측정하므로 lxml 등 C 확장 메모리는 포함되지 않으며, 측정 중에는 수 배 느려짐)
+
+실행: python benchmarks/bench_report_export.py --rows 10000,100000 [--memory]
+"""
+import argparse
+import random
+import time
+
+from common import benchmark_database, measure
+
+
+def legacy_export(admin, department):
+    """변경 전 report_download (기관) 의 엑셀 생성"""
+    import io
+
+    import pandas as pd
+    from openpyxl import load_workbook
+    from openpyxl.styles import PatternFill
+    from openpyxl.utils import get_column_letter
+
+    from analysis.custom.scoring import BODY_NORMAL_FIELDS, LOW_NORMAL_COUNT
+    from analysis.helpers import calculate_normal_ratio
+    from analysis.models import BodyResult, UserInfo
+
+    users = UserInfo.objects.filter(organization_id=admin.organization_id, department=department).order_by(
+        'student_name')
+    body_results = BodyResult.objects.filter(
+        user_id__in=users.values('id'), image_front_key__isnull=False, image_side_key__isnull=False
+    ).select_related('user')
+    body_results_dict = {}
+    for br in body_results:
+        body_results_dict.setdefault(br.user_id, br)
+    code_names = list(calculate_normal_ratio(next(iter(body_results)))[1].keys()) if body_results else []
+
+    excel_data = []
+    for user in users:
+        body_result = body_results_dict.get(user.id)
+        row_data = {
+            '부서명': user.department,
+            '이름': user.student_name,
+            '검사일': body_result.created_dt.strftime('%Y-%m-%d %H:%M:%S') if body_result else None,
+            '검사결과': 'O' if body_result else 'X',
+        }
+        if body_result:
+            row_data['정상범위'], status_results = calculate_normal_ratio(body_result)
+            row_data.update(status_results)
+        excel_data.append(row_data)
+    df = pd.DataFrame(excel_data)[['부서명', '이름', '검사일', '검사결과', '정상범위'] + code_names]
+
+    excel_buffer = io.BytesIO()
+    df.to_excel(excel_buffer, index=False, sheet_name='데이터')
+    workbook = load_workbook(excel_buffer)
+    worksheet = workbook['데이터']
+    for column in worksheet.columns:
+        column_letter = get_column_letter(column[0].column)
+        if worksheet[f"{column_letter}1"].value == "검사일":
+            worksheet.column_dimensions[column_letter].width = max(len(str(cell.value or "")) for cell in column) + 2
+    worksheet.auto_filter.ref = worksheet.dimensions
+    highlight_fill = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
+    for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row):
+        for cell in row:
+            if '정상범위' in str(worksheet.cell(row=1, column=cell.column).value):  # 셀마다 헤더 조회
+                numerator, denominator = map(int, str(cell.value).split("/"))
+                if numerator / denominator <= LOW_NORMAL_COUNT / len(BODY_NORMAL_FIELDS):
+                    cell.fill = highlight_fill
+    summary_sheet = workbook.create_sheet("통계", 0)
+    summary_sheet['A1'], summary_sheet['B1'] = '총 인원수', len(df)
+    for idx, code in enumerate(code_names, start=2):
+        summary_sheet[f'A{idx}'], summary_sheet[f'B{idx}'] = f'{code} 주의 인원수', len(df[df[code] == '주의'])
+
+    output = io.BytesIO()
+    workbook.save(output)
+    return len(output.getvalue())
+
+
+def streaming_export(admin, department):
+    import sys
+
+    from django.test import RequestFactory, override_settings
+
+    from analysis import views
+
+    request = RequestFactory().get('/report_download/', {'year': '2025', 'group': department})
+    request.user = admin
+    with override_settings(REPORT_EXPORT_SYNC_MAX_ROWS=sys.maxsize):
+        response = views.report_download(request)
+    return sum(len(chunk) for chunk in response.streaming_content)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', default='10000,100000', help='부서 회원 수 (쉼표로 여러 개)')
+    parser.add_argument('--memory', action='store_true', help='파이썬 힙 최대 사용량도 측정')
+    args = parser.parse_args()
+
+    from analysis.custom.code_info import code_info_registry
+    from analysis.custom.scoring import BODY_NORMAL_FIELDS
+    from analysis.models import BodyResult, CodeInfo, OrganizationInfo, SchoolInfo, UserInfo
+
+    rng = random.Random(0)
+
+    with benchmark_database():
+        CodeInfo.objects.bulk_create([
+            CodeInfo(group_id='01', code_id=code_id, code_name=code_id, normal_min_value=20, normal_max_value=80)
+            for code_id in BODY_NORMAL_FIELDS
+        ])
+        code_info_registry.invalidate()
+        null_school = SchoolInfo.objects.create(id=-1, school_name='N/A', contact_number='N/A')
+        organization = OrganizationInfo.objects.create(organization_name='벤치기관')
+        admin = UserInfo.objects.create(username='admin', phone_number='admin', user_type='O',
+                                        organization=organization)
+
+        for rows in map(int, args.rows.split(',')):
+            department = f'부서{rows}'
+            members = UserInfo.objects.bulk_create([
+                UserInfo(username=f'{department}-{i}', phone_number=f'{department}-{i}', user_type='O',
+                         organization=organization, department=department, student_name=f'회원{i}')
+                for i in range(rows)
+            ], batch_size=5000)
+            body_results = []
+            for member in members:
+                values = {field: rng.uniform(0, 100) for field in BODY_NORMAL_FIELDS}
+                body_results.append(BodyResult(user_id=member.id, school=null_school, image_front_key='front.png',
+                                               image_side_key='side.png', **values))
+            # 정상범위 요약(normal_count, caution_mask)은 save() 에서 계산되므로 bulk_create 전에 직접 계산
+            for body_result in body_results:
+                body_result.update_normal_summary()
+            BodyResult.objects.bulk_create(body_results, batch_size=5000)
+
+            for label, export in [('legacy', legacy_export), ('streaming', streaming_export)]:
+                start = time.perf_counter()
+                size = export(admin, department)
+                result = f'{label:<10} rows={rows:<7} wall={time.perf_counter() - start:7.2f}s ' \
+                         f'size={size / 1024 / 1024:6.2f}MB'
+                if args.memory:
+                    with measure() as m:
+                        export(admin, department)
+                    result += f' py_peak={m["py_peak_mb"]:8.1f}MB'
+                print(result)
+
+
+if __name__ == '__main__':
+    main()
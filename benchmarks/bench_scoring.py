@@ -0,0 +1,133 @@
+"""
+GaitResult 점수 / BodyResult 정상범위 판정 처리량 비교 (기본 100,000건)
+
+- per-field : 변경 전 동작 재현 (1건씩, 필드마다 CodeInfo 조회 + 파이썬 구간별 계산)
+              ※ CodeInfo 는 레지스트리에서 읽으므로 DB 쿼리 시간은 포함되지 않음
+- batch     : analysis.custom.scoring 일괄 계산 (NumPy)
+
+두 방식의 결과가 동일한지(점수 완전 일치, 정상 항목 수 일치) 함께 확인
+
+실행: python benchmarks/bench_scoring.py --rows 100000
+"""
+import argparse
+import random
+import time
+
+from common import benchmark_database
+
+
+def legacy_normalized_score(value, code_info):
+    """변경 전 GaitResult.calculate_normalized_score"""
+    if code_info is None:
+        return None
+    normal_min, normal_max = code_info.normal_min_value, code_info.normal_max_value
+    caution_min, caution_max = code_info.caution_min_value, code_info.caution_max_value
+    min_value, max_value, direction = code_info.min_value, code_info.max_value, code_info.direction
+    if value is None or normal_min is None or normal_max is None or caution_min is None or caution_max is None or direction is None:
+        return None
+
+    if value < min_value:
+        value = min_value
+    elif value > max_value:
+        value = max_value
+
+    if direction == 'positive':
+        if min_value <= value <= caution_max:
+            score = 0.4 * (value - min_value) / (caution_min - min_value)
+        elif caution_min <= value <= normal_min:
+            score = 0.3 * (value - caution_min) / (normal_min - caution_min) + 0.4
+        elif normal_min <= value <= max_value:
+            score = 0.3 * (value - normal_min) / (max_value - normal_min) + 0.7
+    elif direction == 'negative':
+        if min_value <= value <= normal_max:
+            score = -0.3 * (value - min_value) / (normal_max - min_value) + 1.0
+        elif normal_max <= value <= caution_max:
+            score = -0.3 * (value - normal_max) / (caution_max - normal_max) + 0.7
+        elif caution_max <= value <= max_value:
+            score = -0.4 * (value - caution_max) / (max_value - caution_max) + 0.4
+
+    return max(0, min(score, 1))
+
+
+def legacy_gait_score(row, registry, fields):
+    """변경 전 GaitResult.calculate_score"""
+    total_sum = 0
+    total_weight = 0
+    for value, code_id in zip(row, fields):
+        field_score = legacy_normalized_score(value, registry.get(code_id))
+        if field_score is not None:
+            total_sum += field_score
+            total_weight += 1
+    if total_weight > 0:
+        return total_sum / total_weight * registry.get('score').max_value
+    return None
+
+
+def legacy_normal_count(row, registry, fields):
+    """변경 전 calculate_normal_ratio 의 정상 항목 수"""
+    true_count = 0
+    for value, field in zip(row, fields):
+        code_info = registry.get(field)
+        if value is not None and code_info is not None:
+            if code_info.normal_min_value <= value <= code_info.normal_max_value:
+                true_count += 1
+    return true_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--null-ratio', type=float, default=0.05, help='측정값이 없는(None) 항목 비율')
+    args = parser.parse_args()
+
+    from analysis.custom.code_info import code_info_registry
+    from analysis.custom.scoring import BODY_NORMAL_FIELDS, GAIT_SCORE_FIELDS, check_body_normal_batch, \
+        score_gait_batch
+    from analysis.models import CodeInfo
+
+    rng = random.Random(0)
+
+    def random_rows(fields):
+        return [tuple(None if rng.random() < args.null_ratio else rng.uniform(-10, 110) for _ in fields)
+                for _ in range(args.rows)]
+
+    with benchmark_database():
+        CodeInfo.objects.bulk_create([
+            CodeInfo(group_id='02', code_id=code_id, code_name=code_id, min_value=0, max_value=100,
+                     normal_min_value=60, normal_max_value=100 if i % 2 == 0 else 30,
+                     caution_min_value=30, caution_max_value=30 if i % 2 == 0 else 60,
+                     direction='positive' if i % 2 == 0 else 'negative')
+            for i, code_id in enumerate(GAIT_SCORE_FIELDS)
+        ] + [
+            CodeInfo(group_id='01', code_id=code_id, code_name=code_id, normal_min_value=20, normal_max_value=80)
+            for code_id in BODY_NORMAL_FIELDS
+        ] + [CodeInfo(group_id='02', code_id='score', code_name='score', min_value=0, max_value=100)])
+        code_info_registry.invalidate()
+
+        for label, fields, legacy, batch in [
+            ('gait-score', GAIT_SCORE_FIELDS, legacy_gait_score, lambda columns: score_gait_batch(columns)),
+            ('body-normal', BODY_NORMAL_FIELDS, legacy_normal_count,
+             lambda columns: check_body_normal_batch(columns)[1].sum(axis=1)),
+        ]:
+            rows = random_rows(fields)
+
+            start = time.perf_counter()
+            legacy_results = [legacy(row, code_info_registry, fields) for row in rows]
+            legacy_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            columns = {field: column for field, column in zip(fields, zip(*rows))}
+            batch_results = batch(columns)
+            batch_elapsed = time.perf_counter() - start
+
+            mismatches = sum(
+                1 for expected, actual in zip(legacy_results, batch_results)
+                if (expected is None) != (actual != actual) or (expected is not None and expected != actual)
+            )
+            print(f'{label:<12} rows={args.rows} per-field={args.rows / legacy_elapsed:>12,.0f} rows/s '
+                  f'batch={args.rows / batch_elapsed:>12,.0f} rows/s '
+                  f'speedup={legacy_elapsed / batch_elapsed:6.1f}x mismatches={mismatches}')
+
+
+if __name__ == '__main__':
+    main()
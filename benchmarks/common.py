@@ -0,0 +1,71 @@
+"""
+벤치마크 공통 유틸
+- 저장소 루트에서 `python benchmarks/<스크립트>.py` 로 실행
+- 운영 DB를 건드리지 않도록 Django 테스트 DB(test_<DB명>)를 생성 후 종료 시 삭제
+"""
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# Django 설정 파일 경로 설정
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mysite.settings')
+
+import django
+
+# Django 환경 초기화
+django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """벤치마크용 테스트 DB 생성 -> 종료 시 삭제"""
+    from django.test.utils import setup_databases, setup_test_environment, teardown_databases, \
+        teardown_test_environment
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def print_latency(label, samples_ms):
+    print(f'{label:<40} n={len(samples_ms):<6} p50={percentile(samples_ms, 50):8.2f}ms '
+          f'p99={percentile(samples_ms, 99):8.2f}ms max={max(samples_ms):8.2f}ms')
+
+
+def peak_rss_mb():
+    # Linux: ru_maxrss 단위 KB (프로세스 전체 최대 RSS)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextmanager
+def measure():
+    """wall/cpu 시간(초)과 파이썬 힙 최대 사용량(MB)을 측정하여 dict 로 반환"""
+    result = {}
+    tracemalloc.start()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield result
+    finally:
+        result['wall'] = time.perf_counter() - wall_start
+        result['cpu'] = time.process_time() - cpu_start
+        result['py_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+        tracemalloc.stop()
+        result['rss_peak_mb'] = peak_rss_mb()
@@ -190,11 +190,82 @@ AWS_STORAGE_BUCKET_NAME = os.environ['AWS_STORAGE_BUCKET_NAME']
 AWS_S3_REGION_NAME = os.environ['AWS_S3_REGION_NAME']
 AWS_S3_CUSTOM_DOMAIN = f'{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com'
 AWS_PRESIGNED_EXPIRATION = 3600 # 단위: 초
+AWS_PRESIGNED_REUSE_FRACTION = 0.5  # 만료 시간 중 이 비율만큼은 캐시된 presigned URL 재사용 (남은 유효시간이 절반 이하가 되면 재서명)
+AWS_S3_LOCAL_ROOT = os.getenv('AWS_S3_LOCAL_ROOT')  # 설정 시 로컬 파일시스템을 S3 대신 사용 (오프라인 테스트용)
+
+# 체형 결과 이미지 비동기 업로드 (run_image_worker 워커가 검증/변환/S3 업로드 처리)
+IMAGE_UPLOAD_ASYNC = os.getenv('IMAGE_UPLOAD_ASYNC', 'true') == 'true'
+IMAGE_SPOOL_DIR = os.getenv('IMAGE_SPOOL_DIR', os.path.join(BASE_DIR, 'spool', 'images'))
+IMAGE_JOB_MAX_ATTEMPTS = 5  # S3 업로드 실패 시 최대 시도 횟수
+IMAGE_JOB_RETRY_DELAY = 60  # 단위: 초, 첫 재시도까지 대기 시간 (이후 재시도마다 2배)
+IMAGE_JOB_RETRY_MAX_DELAY = 60 * 60  # 단위: 초, 재시도 대기 시간 상한
+IMAGE_JOB_LOCK_TIMEOUT = 300  # 단위: 초, processing 상태로 이 시간이 지나면 다른 워커가 재처리
+
+# 체형 결과 이미지 파생 이미지(WebP) - {이름: 긴 변 최대 px}, 원본 key 기준 <key>.<이름>.webp 로 저장
+BODY_IMAGE_VARIANTS = {'thumb': 256, 'medium': 1024}
+BODY_IMAGE_VARIANT_QUALITY = 80
+BODY_IMAGE_VARIANTS_ON_UPLOAD = True  # 업로드 워커에서 파생 이미지 생성 (False 면 generate_image_variants 명령으로 생성)
+BODY_IMAGE_DEFAULT_WIDTH = 1024  # 표시 너비를 지정하지 않은 경우 사용할 너비 (px)
+
+# S3 객체 삭제 대기열 (BodyResult 삭제 시 이미지 삭제)
+S3_DELETION_INTERVAL_MINUTES = 10  # 스케줄러 실행 주기
+S3_DELETION_MAX_ATTEMPTS = 5  # 삭제 실패 시 최대 시도 횟수
+
+# 프로세스 공용 S3 I/O (analysis/custom/s3_io.py)
+S3_TRANSFER_MAX_CONCURRENCY = int(os.getenv('S3_TRANSFER_MAX_CONCURRENCY', 20))  # 프로세스 전체 최대 동시 전송 수
+S3_IO_MAX_WORKERS = int(os.getenv('S3_IO_MAX_WORKERS', 4))  # 공용 executor 스레드 수
+
+# S3 객체 존재 여부 인덱스(S3ObjectIndex 테이블, 모든 프로세스 공용) TTL
+S3_OBJECT_INDEX_TTL = 60 * 60 * 24  # 존재하는 객체, 단위: 초
+S3_OBJECT_INDEX_MISS_TTL = 60  # 존재하지 않는 객체 (비동기 업로드 등으로 곧 생길 수 있으므로 짧게 유지)
 
 # boto3와 django-storages를 사용할 수 있도록 설정
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 
 
+# Cache (presigned URL 등) - 프로세스 로컬 캐시, MAX_ENTRIES 초과 시 오래된 항목부터 제거
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000,
+        },
+    }
+}
+
+# CodeInfo 레지스트리 (analysis/custom/code_info.py)
+# 버전 key 는 CACHES 에 저장 - 프로세스 로컬 캐시인 경우 다른 프로세스의 변경은 이 시간(초) 이내에 반영
+CODE_INFO_REGISTRY_MAX_AGE = 300
+
+# 메인 화면(대시보드) 기관별 집계 캐시 시간(초) - BodyResult / UserInfo 변경 시 해당 기관 캐시 삭제
+DASHBOARD_CACHE_TTL = 60
+
+# 결과 조회(report) 화면 학교별 연도/그룹 선택 목록 캐시 시간(초) - UserInfo / UserHist 변경 시 해당 학교 캐시 삭제
+REPORT_GROUP_CACHE_TTL = 300
+
+# 기관 결과 조회(report) 화면 한 페이지에 표시할 회원 수 (부서 인원이 많은 경우 서버에서 나누어 조회)
+ORG_REPORT_PAGE_SIZE = 200
+
+# 결과 조회 엑셀 다운로드 백그라운드 작업 (run_export_worker 워커가 엑셀 생성 후 S3 저장)
+REPORT_EXPORT_SYNC_MAX_ROWS = 5000  # 행 수가 이 값 이하이면 요청에서 바로 생성, 초과하면 작업 등록
+REPORT_EXPORT_MAX_ATTEMPTS = 3  # 생성/업로드 실패 시 최대 시도 횟수
+REPORT_EXPORT_LOCK_TIMEOUT = 600  # 단위: 초, 진행률 갱신 없이 이 시간이 지나면 다른 워커가 재처리
+REPORT_EXPORT_RETENTION_HOURS = 24  # 완료된 파일 보관 시간 (이후 S3 객체 삭제, 같은 요청은 새로 생성)
+REPORT_EXPORT_PROGRESS_INTERVAL = 1.0  # 단위: 초, 진행률(processed_rows) 저장 최소 간격
+
+# 회원 등록(엑셀 업로드) 백그라운드 작업 (run_import_worker 워커가 chunk 단위 트랜잭션으로 저장)
+MEMBER_IMPORT_SYNC_MAX_ROWS = 1000  # 행 수가 이 값 이하이면 요청에서 바로 저장, 초과하면 작업 등록
+MEMBER_IMPORT_CHUNK_SIZE = 1000  # 트랜잭션 1회에 저장할 행 수
+MEMBER_IMPORT_SPOOL_DIR = os.getenv('MEMBER_IMPORT_SPOOL_DIR', os.path.join(BASE_DIR, 'spool', 'imports'))
+MEMBER_IMPORT_MAX_ATTEMPTS = 3  # 저장 실패 시 최대 시도 횟수 (커밋된 chunk 이후부터 재시도)
+MEMBER_IMPORT_LOCK_TIMEOUT = 300  # 단위: 초, chunk 커밋 없이 이 시간이 지나면 다른 워커가 이어서 처리
+
+# 비밀번호 해시(PBKDF2) 프로세스 풀 크기 (기본값 0: 요청 스레드에서 직접 계산, 코어 여유가 있는 서버에서만 설정)
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0))
+# 모바일 자동 가입 계정이 공유하는 초기 비밀번호 해시 재사용 시간 (단위: 초, 지나면 새 salt 로 다시 계산)
+DEFAULT_PASSWORD_HASH_TTL = 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -250,8 +321,9 @@ LOGOUT_REDIRECT_URL = 'login'
 ### django-apscheduler settings
 APSCHEDULER_DATETIME_FORMAT = "N j, Y, f:s a"
 
-# 자동으로 스케쥴러 실행
-SCHEDULER_DEFAULT = True
+# 자동으로 스케쥴러 실행 (세션 정리 / S3 삭제 대기열 / 엑셀 파일 만료 / S3 인덱스 정리)
+# 작업 큐 워커 프로세스(run_*_worker)는 SCHEDULER_DEFAULT=false 로 실행하여 정리 작업은 웹 서버에서만 실행
+SCHEDULER_DEFAULT = os.getenv('SCHEDULER_DEFAULT', 'true').lower() == 'true'
 
 # Prometheus Exporter 설정
 PROMETHEUS_EXPORT_MIGRATIONS = False  # 기본 설정 유지
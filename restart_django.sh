@@ -22,6 +22,33 @@ else
     echo "Skipping collectstatic because ENVIRONMENT is not 'prod'."
 fi
 
+# Build the institution rollups on first deploy (dashboard/report totals are read only from BodyResultRollup)
+echo "Building body result rollups if empty..."
+python manage.py rebuild_body_result_rollup --if-empty
+
+# Start a queue worker in a respawn loop (restarted 5 seconds after it exits or crashes)
+# pkill -f also matches the previous respawn loop, so both the loop and its worker are stopped
+start_worker() {
+    local command=$1 log_file=$2
+    shift 2
+    pkill -f "manage.py $command"
+    # Workers do not run the maintenance scheduler (session cleanup, S3 deletion reaper, ...), only the web server does
+    SCHEDULER_DEFAULT=false nohup bash -c "while true; do python manage.py $command $*; echo \"$command exited (\$?), restarting\"; sleep 5; done" \
+        > "$log_file" 2>&1 &
+}
+
+# Restart the image upload worker (processes ImageUploadJob queue)
+echo "Starting image upload worker..."
+start_worker run_image_worker /tmp/image_worker.log --processes 2
+
+# Restart the report export worker (processes ReportExportJob queue)
+echo "Starting report export worker..."
+start_worker run_export_worker /tmp/export_worker.log
+
+# Restart the member import worker (processes MemberImportJob queue)
+echo "Starting member import worker..."
+start_worker run_import_worker /tmp/import_worker.log
+
 # Restart the Django server
 echo "Starting Django server..."
 nohup python manage.py runserver 0.0.0.0:8000 > /tmp/nohup.log 2>&1 &
\ No newline at end of file